@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+import gerador_instancias
+
+
+# Benchmark de escala: gera instâncias sintéticas (ou usa arquivos de entrada), resolve cada uma
+# em um processo separado e grava as métricas em JSON. Com `--baseline` compara com um arquivo de
+# resultados anterior, para saber se uma mudança em `model.py` ajuda ou atrapalha.
+#
+# Métricas por instância: tempo de pré-processamento, de montagem e de resolução, número de
+# variáveis, linhas e não-nulos, status, objetivo, gap final e pico de memória do processo.
+
+DIAS_PADRAO = (1, 3, 7)
+# Métricas comparadas com o baseline (menor é melhor em todas)
+METRICAS_COMPARADAS = ("preprocessamento_s", "montagem_s", "resolucao_s", "linhas", "nao_nulos",
+                       "memoria_pico_mb", "gap")
+# Diferenças de tempo abaixo disso (s) são ruído de medição, não regressão
+RUIDO_TEMPO_S = 0.05
+
+def _memoria_pico_mb():
+    """
+    (Função interna) Pico de memória residente do processo atual em MB (None se não der para medir).
+    """
+    try:
+        import resource
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB, macOS em bytes
+        return pico / (1024 * 1024) if platform.system() == "Darwin" else pico / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+    except ImportError:
+        return None
+
+def medir_instancia(caminho_arquivo, backend="highs", time_limit=60):
+    """
+    Resolve uma instância medindo cada fase. Roda no processo atual; use `executar_benchmark`
+    para isolar o pico de memória de cada instância.
+    Retorna um dicionário com as métricas.
+    """
+    import preprocessamento as pp
+    from model import preparar_parametros, montar_modelo
+    import modelo_highs
+
+    medidas = {"arquivo": caminho_arquivo, "backend": backend, "time_limit": time_limit}
+    inicio = time.perf_counter()
+    data = pp.carregar_dados(caminho_arquivo)
+    if data is None:
+        medidas["status"] = "Erro"
+        return medidas
+    param = preparar_parametros(data)
+    medidas["preprocessamento_s"] = time.perf_counter() - inicio
+    medidas["dias"] = data["dias"]
+    medidas["pessoas"] = len(param["pessoas"])
+    medidas["tarefas"] = len(param["tarefas"])
+    medidas["ocorrencias"] = sum(len(param["ocorrencias"][j]) for j in param["tarefas"])
+
+    inicio = time.perf_counter()
+    if backend == "highs":
+        matrizes = modelo_highs.montar_matrizes(param)
+        h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=False)
+        medidas["variaveis"] = len(matrizes["custo"])
+        medidas["linhas"] = len(matrizes["row_lower"])
+        medidas["nao_nulos"] = len(matrizes["indice"])
+    else:
+        import pulp
+        model, _, _ = montar_modelo(param)
+        medidas["variaveis"] = len(model.variables())
+        medidas["linhas"] = len(model.constraints)
+        medidas["nao_nulos"] = sum(len(restricao) for restricao in model.constraints.values())
+    medidas["montagem_s"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    if backend == "highs":
+        h.run()
+        medidas["status"] = modelo_highs.status_highs(h)
+        info = h.getInfo()
+        tem_solucao = medidas["status"] in ("Optimal", "Feasible")
+        medidas["objetivo"] = info.objective_function_value if tem_solucao else None
+        medidas["gap"] = info.mip_gap if tem_solucao and np.isfinite(info.mip_gap) else None
+    else:
+        model.solve(pulp.getSolver("HiGHS", timeLimit=time_limit, msg=False))
+        medidas["status"] = pulp.LpStatus[model.status]
+        medidas["objetivo"] = pulp.value(model.objective) if medidas["status"] in ("Optimal", "Feasible") else None
+        medidas["gap"] = None
+    medidas["resolucao_s"] = time.perf_counter() - inicio
+    medidas["memoria_pico_mb"] = _memoria_pico_mb()
+    return medidas
+
+def _medir_em_processo(nome, caminho_arquivo, backend, time_limit):
+    """
+    (Função interna) Ponto de entrada do processo de cada instância.
+    """
+    medidas = medir_instancia(caminho_arquivo, backend=backend, time_limit=time_limit)
+    medidas["cenario"] = nome
+    return medidas
+
+def gerar_cenarios(dias=DIAS_PADRAO, pasta=None, **opcoes_gerador):
+    """
+    Gera uma instância sintética por número de dias (demais parâmetros iguais) e grava em `pasta`;
+    instâncias recusadas pelo diagnóstico (`gerar_instancia_viavel`) ficam de fora.
+    Retorna a lista de (nome do cenário, caminho do JSON).
+    """
+    pasta = pasta or tempfile.mkdtemp(prefix="benchmark_")
+    os.makedirs(pasta, exist_ok=True)
+    cenarios = []
+    for d in dias:
+        instancia = gerador_instancias.gerar_instancia_viavel(dias=d, **opcoes_gerador)
+        if instancia is None:
+            print(f"Aviso: cenário de {d} dia(s) descartado (instância inviável).")
+            continue
+        nome = (f"d{d}_p{len(instancia['pessoas'])}_t{len(instancia['tarefas'])}"
+                f"_s{instancia['slot_duracao_min']}_a{opcoes_gerador.get('aperto', 0.5)}"
+                f"_o{opcoes_gerador.get('ocorrencias', 1.0)}_seed{opcoes_gerador.get('semente', 0)}")
+        caminho = os.path.join(pasta, nome + ".json")
+        gerador_instancias.salvar_instancia(instancia, caminho)
+        cenarios.append((nome, caminho))
+    return cenarios
+
+def executar_benchmark(cenarios, backend="highs", time_limit=60, saida=None):
+    """
+    Mede cada cenário (nome, caminho) em um processo novo, para que o pico de memória seja
+    só daquela instância. Grava os resultados em JSON (`saida`) e retorna um DataFrame.
+    """
+    resultados = []
+    for nome, caminho in cenarios:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            medidas = executor.submit(_medir_em_processo, nome, caminho, backend, time_limit).result()
+        resultados.append(medidas)
+        print(f"[{nome}] {medidas.get('status')}: montagem {medidas.get('montagem_s', 0):.2f}s, "
+              f"resolução {medidas.get('resolucao_s', 0):.2f}s, {medidas.get('linhas')} linhas, "
+              f"{medidas.get('nao_nulos')} não-nulos")
+
+    if saida:
+        with open(saida, "w", encoding="utf-8") as f:
+            json.dump({"plataforma": platform.platform(), "python": platform.python_version(),
+                       "data": time.strftime("%Y-%m-%d %H:%M:%S"), "resultados": resultados},
+                      f, ensure_ascii=False, indent=2)
+        print(f"Resultados salvos em '{saida}'.")
+    return pd.DataFrame(resultados)
+
+def comparar_com_baseline(resultados, caminho_baseline, tolerancia=0.10):
+    """
+    Compara os resultados (DataFrame de `executar_benchmark`) com um arquivo de resultados anterior,
+    cenário a cenário. Razão = atual / baseline; acima de 1 + tolerância é "pior", abaixo de
+    1 - tolerância é "melhor". Retorna o DataFrame da comparação.
+    """
+    with open(caminho_baseline, "r", encoding="utf-8") as f:
+        baseline = {r["cenario"]: r for r in json.load(f)["resultados"]}
+
+    linhas = []
+    for _, atual in resultados.iterrows():
+        anterior = baseline.get(atual["cenario"])
+        if anterior is None:
+            print(f"Aviso: cenário '{atual['cenario']}' não está no baseline.")
+            continue
+        if anterior.get("status") != atual.get("status"):
+            linhas.append({"cenario": atual["cenario"], "metrica": "status", "baseline": anterior.get("status"),
+                           "atual": atual.get("status"), "razao": None, "veredito": "mudou"})
+        for metrica in METRICAS_COMPARADAS:
+            valor_antes, valor_agora = anterior.get(metrica), atual.get(metrica)
+            if valor_antes is None or valor_agora is None or pd.isna(valor_agora):
+                continue
+            razao = valor_agora / valor_antes if valor_antes else (1.0 if valor_agora == 0 else float("inf"))
+            veredito = "pior" if razao > 1 + tolerancia else "melhor" if razao < 1 - tolerancia else "igual"
+            if metrica.endswith("_s") and abs(valor_agora - valor_antes) < RUIDO_TEMPO_S:
+                veredito = "igual"
+            linhas.append({"cenario": atual["cenario"], "metrica": metrica, "baseline": valor_antes,
+                           "atual": valor_agora, "razao": razao, "veredito": veredito})
+    comparacao = pd.DataFrame(linhas)
+    if not comparacao.empty:
+        print(tabulate(comparacao, headers="keys", tablefmt="psql", showindex=False, floatfmt=".4g"))
+        piores = comparacao[comparacao["veredito"] == "pior"]
+        print(f"{len(piores)} métricas piores que o baseline (tolerância {100 * tolerancia:.0f}%).")
+    return comparacao
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escala com instâncias sintéticas.")
+    parser.add_argument("arquivos", nargs="*", help="JSONs de entrada extras (ex.: input_semanal.json)")
+    parser.add_argument("--dias", type=int, nargs="*", default=list(DIAS_PADRAO),
+                        help="dias das instâncias sintéticas (vazio = nenhuma)")
+    parser.add_argument("--pessoas", type=int, default=6)
+    parser.add_argument("--tarefas", type=int, default=19)
+    parser.add_argument("--ocorrencias", type=float, default=1.0)
+    parser.add_argument("--slot", type=int, default=30, help="duração do slot (min)")
+    parser.add_argument("--aperto", type=float, default=0.5)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--backend", choices=("pulp", "highs"), default="highs")
+    parser.add_argument("--time-limit", type=float, default=60, help="limite de tempo por instância (s)")
+    parser.add_argument("--pasta", help="onde gravar as instâncias geradas (padrão: pasta temporária)")
+    parser.add_argument("--saida", default="benchmark_resultados.json", help="arquivo JSON de resultados")
+    parser.add_argument("--baseline", help="arquivo de resultados anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="variação aceita na comparação")
+    args = parser.parse_args()
+
+    cenarios = gerar_cenarios(args.dias, pasta=args.pasta, pessoas=args.pessoas, tarefas=args.tarefas,
+                              ocorrencias=args.ocorrencias, slot_min=args.slot, aperto=args.aperto,
+                              semente=args.semente)
+    cenarios += [(os.path.splitext(os.path.basename(a))[0], a) for a in args.arquivos]
+
+    resultados = executar_benchmark(cenarios, backend=args.backend, time_limit=args.time_limit, saida=args.saida)
+    colunas = ["cenario", "status", "variaveis", "linhas", "nao_nulos", "preprocessamento_s", "montagem_s",
+               "resolucao_s", "gap", "memoria_pico_mb"]
+    print(tabulate(resultados[[c for c in colunas if c in resultados]], headers="keys", tablefmt="psql",
+                   showindex=False, floatfmt=".3f"))
+    if args.baseline:
+        comparar_com_baseline(resultados, args.baseline, tolerancia=args.tolerancia)
+
+
+if __name__ == "__main__":
+    main()
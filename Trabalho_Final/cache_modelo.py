@@ -0,0 +1,144 @@
+import hashlib
+import json
+import os
+import pickle
+
+import preprocessamento as pp
+from model import preparar_parametros, simetria_ocorrencias
+import modelo_highs
+
+
+# Cache em disco do pré-processamento e do modelo montado.
+# Rodar `model.py` de novo com a mesma entrada refazia tudo: leitura do JSON, matrizes de
+# disponibilidade, índice de viabilidade e matriz de restrições. Aqui cada entrada do cache guarda
+# os parâmetros de `preparar_parametros(...)` e as matrizes do backend highs, indexadas por um hash
+# da parte estrutural da entrada. α e aptidão só mexem no objetivo, então têm uma chave própria:
+# se só elas mudaram, as matrizes são reaproveitadas e apenas o vetor de custos é recalculado.
+#
+# A chave estrutural também inclui as opções que mudam a matriz (simetria e formulação de 4.9)
+# e o conteúdo dos arquivos que montam o modelo, para que uma mudança no código invalide o cache.
+
+DIRETORIO_PADRAO = ".cache_modelo"
+LIMITE_MB_PADRAO = 512
+CHAVES_OBJETIVO = ("alpha", "aptidao")
+ARQUIVOS_MODELO = ("preprocessamento.py", "model.py", "modelo_highs.py")
+
+def _hash(objeto):
+    """
+    (Função interna) SHA-256 de um objeto JSON (chaves ordenadas, então a ordem no arquivo não importa).
+    """
+    texto = json.dumps(objeto, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(texto.encode("utf-8")).hexdigest()
+
+def _versao_codigo():
+    """
+    (Função interna) Hash do código que monta o modelo.
+    """
+    h = hashlib.sha256()
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    for nome in ARQUIVOS_MODELO:
+        with open(os.path.join(pasta, nome), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+def chaves(dados, simetria="nenhuma", balanceamento="extremos"):
+    """
+    Retorna (chave_estrutura, chave_objetivo) para o JSON bruto `dados`.
+    """
+    estrutura = {k: v for k, v in dados.items() if k not in CHAVES_OBJETIVO}
+    estrutura["_opcoes"] = {"simetria": simetria, "balanceamento": balanceamento, "codigo": _versao_codigo()}
+    objetivo = {k: dados.get(k) for k in CHAVES_OBJETIVO}
+    return _hash(estrutura), _hash(objetivo)
+
+def _despejar(diretorio, limite_mb):
+    """
+    (Função interna) Apaga as entradas usadas há mais tempo até o cache caber em `limite_mb`.
+    """
+    entradas = []
+    for nome in os.listdir(diretorio):
+        if nome.endswith(".pkl"):
+            caminho = os.path.join(diretorio, nome)
+            info = os.stat(caminho)
+            entradas.append((info.st_mtime, info.st_size, caminho))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= limite_mb * 1024 * 1024:
+            break
+        os.remove(caminho)
+        total -= tamanho
+        print(f"Cache: entrada '{os.path.basename(caminho)}' removida (limite de {limite_mb} MB).")
+
+def carregar_modelo(caminho_arquivo, backend="highs", simetria="nenhuma", balanceamento="extremos",
+                    diretorio=DIRETORIO_PADRAO, limite_mb=LIMITE_MB_PADRAO):
+    """
+    Devolve (param, matrizes) para a entrada, do cache se a estrutura não mudou.
+    `param` é o dicionário de `preparar_parametros(...)` (com α e aptidão do arquivo atual);
+    `matrizes` são as de `modelo_highs.montar_matrizes(...)` para a simetria e o balanceamento
+    pedidos, com os custos já atualizados (None no backend pulp, que monta o próprio modelo).
+    As matrizes sempre têm as linhas de balanceamento, para que mudar α seja só trocar custos.
+    Retorna None se o arquivo não puder ser lido.
+    """
+    try:
+        with open(caminho_arquivo, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+    except FileNotFoundError:
+        print(f"Erro: Arquivo '{caminho_arquivo}' não encontrado.")
+        return None
+    except json.JSONDecodeError:
+        print(f"Erro: Arquivo '{caminho_arquivo}' não é um JSON válido.")
+        return None
+
+    chave_estrutura, chave_objetivo = chaves(dados, simetria, balanceamento)
+    os.makedirs(diretorio, exist_ok=True)
+    arquivo_cache = os.path.join(diretorio, chave_estrutura + ".pkl")
+
+    entrada = None
+    if os.path.exists(arquivo_cache):
+        try:
+            with open(arquivo_cache, "rb") as f:
+                entrada = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            print("Cache: entrada corrompida; montando de novo.")
+
+    salvar = entrada is None
+    if entrada is not None:
+        os.utime(arquivo_cache)  # marca como usada recentemente
+        param = entrada["param"]
+        param["alpha"] = dados.get("alpha", 0)
+        param["capacidade"] = dados["aptidao"]
+        objetivo_mudou = entrada["chave_objetivo"] != chave_objetivo
+        if objetivo_mudou:
+            print(f"Cache: estrutura igual, só α/aptidão mudaram; custos atualizados ('{chave_estrutura[:12]}').")
+        else:
+            print(f"Cache: modelo reaproveitado ('{chave_estrutura[:12]}').")
+    else:
+        data = pp.carregar_dados(caminho_arquivo)
+        if data is None:
+            return None
+        param = preparar_parametros(data)
+        entrada = {"param": param, "matrizes": None, "chave_objetivo": chave_objetivo}
+        objetivo_mudou = False
+
+    matrizes = None
+    if backend == "highs":
+        param_modelo = simetria_ocorrencias(param, simetria)
+        param_modelo["modo_balanceamento"] = balanceamento
+        matrizes = entrada["matrizes"]
+        if matrizes is None:
+            matrizes = modelo_highs.montar_matrizes(param_modelo, balanceamento=True)
+            entrada["matrizes"] = matrizes
+            entrada["chave_objetivo"] = chave_objetivo
+            salvar = True
+        elif objetivo_mudou:
+            # Só o objetivo muda: a matriz de restrições é a mesma
+            matrizes["custo"] = modelo_highs.custos_objetivo(param_modelo, matrizes["variaveis"],
+                                                             len(matrizes["custo"]))
+            entrada["chave_objetivo"] = chave_objetivo
+            salvar = True
+
+    if salvar:
+        with open(arquivo_cache + ".tmp", "wb") as f:
+            pickle.dump(entrada, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(arquivo_cache + ".tmp", arquivo_cache)
+    _despejar(diretorio, limite_mb)
+    return param, matrizes
@@ -0,0 +1,313 @@
+import argparse
+import math
+import time
+import numpy as np
+import pulp
+from tabulate import tabulate
+
+import preprocessamento as pp
+from model import preparar_parametros, enumerar_variaveis, imprimir_cronograma, formatar_solucao, exportar_solucao
+import modelo_highs
+from heuristica import objetivo_alocacoes, verificar_alocacoes
+from diagnostico import disponibilidade_pessoas
+
+
+# Decomposição em duas etapas: primeiro os horários, depois as pessoas.
+#   1. Horários: modelo sem pessoas, y[j][o][t] = 1 se a ocorrência o de j começa no slot t.
+#      Mantém 4.1, 4.3 (bebê), 4.5 (janelas), 4.6 (precedência) e 4.7 (periodicidade); das pessoas
+#      fica só a capacidade agregada (tarefas em andamento no slot t <= pessoas disponíveis em t).
+#      O custo de cada início é a menor falta de aptidão entre as pessoas que podem fazê-lo ali.
+#   2. Pessoas: com os inícios fixados, o modelo completo (`modelo_highs.montar_matrizes`) só
+#      tem uma variável por (pessoa, ocorrência): é um problema de atribuição com 4.2, 4.8 e 4.9.
+# Se a etapa 2 não tem solução, cortes voltam para a etapa 1 e os horários são refeitos:
+#   - capacidade: num slot em que as tarefas em andamento não podem receber pessoas distintas
+#     (emparelhamento), aquela combinação de inícios é proibida;
+#   - sem conflito por slot (ex.: limite de carga), a combinação inteira de inícios é proibida.
+# O ótimo da etapa 1 é um limitante inferior da falta de aptidão (e do objetivo) do modelo completo.
+
+def _custo_minimo(param):
+    """
+    (Função interna) Para cada tarefa, menor falta de aptidão (1 - capacidade) entre as pessoas que
+    podem iniciá-la em cada slot (infinito onde ninguém pode). Retorna {j: array}.
+    """
+    custo = {}
+    for idx_j, j in enumerate(param["tarefas"]):
+        falta = np.array([1 - param["capacidade"][i][j] for i in param["pessoas"]], dtype=np.float64)
+        por_pessoa = np.where(param["mascara_inicio"][:, idx_j, :], falta[:, None], np.inf)
+        custo[j] = por_pessoa.min(axis=0)
+    return custo
+
+def montar_etapa_horarios(param, cortes=()):
+    """
+    Monta o modelo PuLP da etapa 1 (só horários). `cortes` é uma lista de combinações proibidas,
+    cada uma uma lista de inícios (j, o, t) que não podem acontecer todos juntos.
+    Retorna (model, y), com y[j][o] = {t: LpVariable}.
+    """
+    tarefas = param["tarefas"]
+    ocorrencias = param["ocorrencias"]
+    duracao_slot = param["duracao_slot"]
+    duracao_tarefas = param["duracao_tarefas"]
+    viavel_ocorrencia = param["viavel_ocorrencia"]
+    custo = _custo_minimo(param)
+    disponiveis = disponibilidade_pessoas(param).sum(axis=0)
+
+    model = pulp.LpProblem("Horarios_Cuidados_Bebe", pulp.LpMinimize)
+
+    # y[j][o][t] só existe se algum x[i][j][o][t] existe no modelo completo
+    y = {j: {o: {} for o in ocorrencias[j]} for j in tarefas}
+    for idx_j, j in enumerate(tarefas):
+        alguem_pode = param["mascara_inicio"][:, idx_j, :].any(axis=0)
+        for o in ocorrencias[j]:
+            for t in np.flatnonzero(viavel_ocorrencia[j][o] & alguem_pode).tolist():
+                y[j][o][t] = pulp.LpVariable(f"y_{j}_{o}_{t}", cat="Binary")
+
+    # Objetivo: falta de aptidão da pessoa mais apta disponível em cada início
+    model += pulp.lpSum(custo[j][t] * var for j in tarefas for o in ocorrencias[j] for t, var in y[j][o].items())
+
+    # 4.1 Cada ocorrência começa exatamente uma vez
+    for j in tarefas:
+        for o in ocorrencias[j]:
+            model += pulp.lpSum(y[j][o].values()) == 1
+
+    # Cobertura por slot (todas as tarefas e só as do bebê)
+    cobertura, cobertura_bebe = {}, {}
+    for j in tarefas:
+        for o in ocorrencias[j]:
+            for t_start, var in y[j][o].items():
+                for t in range(t_start, t_start + duracao_tarefas[j]):
+                    cobertura.setdefault(t, []).append(var)
+                    if j in param["tarefas_bebe"]:
+                        cobertura_bebe.setdefault(t, []).append(var)
+
+    # Capacidade agregada: no máximo uma tarefa em andamento por pessoa disponível
+    for t in sorted(cobertura):
+        if len(cobertura[t]) > disponiveis[t]:
+            model += pulp.lpSum(cobertura[t]) <= int(disponiveis[t])
+
+    # 4.3 Não sobreposição de tarefas do bebê
+    for t in sorted(cobertura_bebe):
+        if len(cobertura_bebe[t]) > 1:
+            model += pulp.lpSum(cobertura_bebe[t]) <= 1
+
+    # 4.6 Precedência: (j2, o) em t2 exige (j1, o) terminando até W slots antes
+    for j1, dep in param["dependencias"].items():
+        j2 = dep["proxima_tarefa"]
+        W = math.ceil(dep["janela_de_espera"] / duracao_slot)
+        d_j1 = duracao_tarefas[j1]
+        for o in ocorrencias[j1]:
+            if o not in ocorrencias[j2]:
+                continue
+            for t2, var in y[j2][o].items():
+                janela = [y[j1][o][t1] for t1 in range(max(0, t2 - d_j1 - W), t2 - d_j1 + 1) if t1 in y[j1][o]]
+                model += pulp.lpSum(janela) >= var
+
+    # 4.7 Periodicidade
+    for j, P_j in param["periodicidade"].items():
+        P_j_slots = math.ceil(P_j / duracao_slot)
+        for o in ocorrencias[j]:
+            if o + 1 not in ocorrencias[j]:
+                continue
+            for t1 in sorted(set(y[j][o]) | {t - P_j_slots for t in y[j][o + 1]}):
+                lhs = [y[j][o][t1]] if t1 in y[j][o] else []
+                rhs = [y[j][o + 1][t1 + P_j_slots]] if t1 + P_j_slots in y[j][o + 1] else []
+                model += pulp.lpSum(lhs) == pulp.lpSum(rhs)
+
+    # Cortes vindos da etapa 2
+    for corte in cortes:
+        model += pulp.lpSum(y[j][o][t] for j, o, t in corte) <= len(corte) - 1
+
+    return model, y
+
+def _emparelhar(elegiveis):
+    """
+    (Função interna) Emparelhamento bipartido (caminhos aumentantes): True se cada item de
+    `elegiveis` (conjunto de pessoas possíveis) recebe uma pessoa diferente.
+    """
+    dono = {}
+
+    def aumentar(k, visitadas):
+        for idx_i in elegiveis[k]:
+            if idx_i in visitadas:
+                continue
+            visitadas.add(idx_i)
+            if idx_i not in dono or aumentar(dono[idx_i], visitadas):
+                dono[idx_i] = k
+                return True
+        return False
+
+    return all(aumentar(k, set()) for k in range(len(elegiveis)))
+
+def cortes_de_capacidade(param, inicios):
+    """
+    Confere, slot a slot, se as tarefas em andamento podem receber pessoas distintas que podem
+    iniciá-las naqueles horários. Retorna a lista de cortes (um por combinação sem emparelhamento).
+    """
+    tarefas = param["tarefas"]
+    idx_tarefa = {j: idx for idx, j in enumerate(tarefas)}
+    em_andamento = {}
+    for (j, o), t_start in inicios.items():
+        for t in range(t_start, t_start + param["duracao_tarefas"][j]):
+            em_andamento.setdefault(t, []).append((j, o, t_start))
+
+    cortes = []
+    for t in sorted(em_andamento):
+        ativos = sorted(em_andamento[t])
+        if len(ativos) < 2 or ativos in cortes:
+            continue
+        elegiveis = [set(np.flatnonzero(param["mascara_inicio"][:, idx_tarefa[j], s]).tolist()) for j, _, s in ativos]
+        if not _emparelhar(elegiveis):
+            cortes.append(ativos)
+    return cortes
+
+def atribuir_pessoas(param, inicios, time_limit=60, msg=False):
+    """
+    Etapa 2: com os inícios {(j, o): t} fixados, escolhe as pessoas pelo modelo completo restrito
+    a esses inícios (4.2, 4.8, 4.9 e o objetivo original).
+    Retorna (status, alocações, número de variáveis x do modelo).
+    """
+    viavel = {}
+    for j in param["tarefas"]:
+        viavel[j] = {}
+        for o in param["ocorrencias"][j]:
+            viavel[j][o] = np.zeros(param["total_slots"], dtype=bool)
+            viavel[j][o][inicios[(j, o)]] = True
+    sub = dict(param)
+    sub["viavel_ocorrencia"] = viavel
+    matrizes = modelo_highs.montar_matrizes(sub)
+    h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=msg)
+    h.run()
+    status_string = modelo_highs.status_highs(h)
+    n_variaveis = len(matrizes["variaveis"]["slot"])
+    if status_string != "Optimal" and status_string != "Feasible":
+        return status_string, [], n_variaveis
+    return status_string, modelo_highs.extrair_alocacoes(h, matrizes), n_variaveis
+
+def resolver_decomposicao(param, time_limit=60, max_rodadas=10, msg=False):
+    """
+    Resolve pela decomposição horários -> pessoas, com até `max_rodadas` rodadas de cortes.
+    `time_limit` vale para cada resolução de cada etapa.
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)` com "rodadas" (status, objetivo, cortes e
+    tempo de cada etapa) e "limitante" (ótimo da etapa 1 na última rodada, se provado; senão None).
+    """
+    tarefas = param["tarefas"]
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": 0.0,
+                 "tempo_resolucao": 0.0, "rodadas": [], "limitante": None}
+    cortes = []
+    for rodada in range(1, max_rodadas + 1):
+        # Etapa 1: horários
+        inicio = time.perf_counter()
+        model, y = montar_etapa_horarios(param, cortes)
+        t_montagem = time.perf_counter()
+        model.solve(pulp.getSolver("HiGHS", timeLimit=time_limit, msg=msg))
+        t_horarios = time.perf_counter()
+        resultado["tempo_montagem"] += t_montagem - inicio
+        resultado["tempo_resolucao"] += t_horarios - t_montagem
+        linha = {"rodada": rodada, "variaveis_horarios": len(model.variables()),
+                 "status_horarios": pulp.LpStatus[model.status], "custo_horarios": None,
+                 "status_pessoas": None, "variaveis_pessoas": None, "cortes": 0, "tempo_s": None}
+        resultado["rodadas"].append(linha)
+        if linha["status_horarios"] != "Optimal" and linha["status_horarios"] != "Feasible":
+            print(f"Decomposição: a etapa de horários não tem solução ({linha['status_horarios']}).")
+            resultado["status"] = linha["status_horarios"]
+            linha["tempo_s"] = t_horarios - inicio
+            return resultado
+        linha["custo_horarios"] = pulp.value(model.objective)
+        if model.sol_status == pulp.LpSolutionOptimal:
+            resultado["limitante"] = linha["custo_horarios"]
+        inicios = {(j, o): t for j in tarefas for o, inicios_o in y[j].items()
+                   for t, var in inicios_o.items() if var.varValue is not None and var.varValue > 0.5}
+
+        # Slots em que as tarefas não cabem nas pessoas: corta sem chamar a etapa 2
+        novos = cortes_de_capacidade(param, inicios)
+        if not novos:
+            status_pessoas, alocacoes, n_variaveis = atribuir_pessoas(param, inicios, time_limit=time_limit, msg=msg)
+            linha["status_pessoas"] = status_pessoas
+            linha["variaveis_pessoas"] = n_variaveis
+            resultado["tempo_resolucao"] += time.perf_counter() - t_horarios
+            if alocacoes:
+                linha["tempo_s"] = time.perf_counter() - inicio
+                violacoes = verificar_alocacoes(param, alocacoes)
+                if violacoes:
+                    print(f"Decomposição: {len(violacoes)} violações na agenda final: {violacoes[:5]}")
+                    resultado["status"] = "Infeasible"
+                    return resultado
+                resultado["status"] = "Feasible"
+                resultado["objetivo"] = objetivo_alocacoes(param, alocacoes)
+                resultado["alocacoes"] = alocacoes
+                return resultado
+            if status_pessoas != "Infeasible":
+                # Sem prova de inviabilidade (ex.: limite de tempo): cortar poderia eliminar agendas
+                # viáveis e o custo da etapa 1 deixaria de ser limitante
+                linha["tempo_s"] = time.perf_counter() - inicio
+                print(f"Decomposição: a etapa de pessoas terminou sem solução ({status_pessoas}).")
+                resultado["status"] = status_pessoas
+                return resultado
+            # Etapa 2 inviável sem conflito por slot: proíbe a combinação inteira de inícios
+            novos = [sorted((j, o, t) for (j, o), t in inicios.items())]
+        cortes.extend(novos)
+        linha["cortes"] = len(novos)
+        linha["tempo_s"] = time.perf_counter() - inicio
+        print(f"Decomposição, rodada {rodada}: {len(novos)} cortes devolvidos à etapa de horários.")
+
+    print(f"Decomposição: sem agenda viável em {max_rodadas} rodadas.")
+    return resultado
+
+def comparar_monolitico(param, time_limit=60, max_rodadas=10):
+    """
+    Resolve a instância pelo modelo completo (backend highs) e pela decomposição e imprime
+    objetivo, tempo e tamanho de cada um. Retorna (resultado_monolitico, resultado_decomposicao).
+    """
+    inicio = time.perf_counter()
+    monolitico = modelo_highs.resolver_highs(param, time_limit=time_limit, msg=False)
+    tempo_monolitico = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    decomposicao = resolver_decomposicao(param, time_limit=time_limit, max_rodadas=max_rodadas)
+    tempo_decomposicao = time.perf_counter() - inicio
+
+    rodadas = decomposicao["rodadas"]
+    linhas = [
+        ["monolítico", monolitico["status"], monolitico["objetivo"], monolitico.get("gap"), tempo_monolitico,
+         len(enumerar_variaveis(param)["slot"])],
+        ["decomposição", decomposicao["status"], decomposicao["objetivo"], None, tempo_decomposicao,
+         f"{rodadas[-1]['variaveis_horarios']} + {rodadas[-1]['variaveis_pessoas']}" if rodadas else None],
+    ]
+    print(tabulate(linhas, headers=["modelo", "status", "objetivo", "gap", "tempo (s)", "variáveis"],
+                   tablefmt="psql", floatfmt=".4f"))
+    if decomposicao["limitante"] is not None:
+        print(f"Limitante inferior da etapa de horários: {decomposicao['limitante']:.4f}")
+    return monolitico, decomposicao
+
+def main():
+    parser = argparse.ArgumentParser(description="Decomposição: horários primeiro, pessoas depois.")
+    parser.add_argument("arquivo", nargs="?", default="input_semanal.json", help="JSON de entrada")
+    parser.add_argument("--time-limit", type=float, default=60, help="limite de tempo de cada etapa (s)")
+    parser.add_argument("--max-rodadas", type=int, default=10, help="rodadas de cortes entre as etapas")
+    parser.add_argument("--comparar", action="store_true", help="resolve também o modelo completo e compara")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="grava a agenda (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true", help="não imprime o cronograma no terminal")
+    args = parser.parse_args()
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+
+    param = preparar_parametros(data)
+    if args.comparar:
+        _, resultado = comparar_monolitico(param, time_limit=args.time_limit, max_rodadas=args.max_rodadas)
+    else:
+        resultado = resolver_decomposicao(param, time_limit=args.time_limit, max_rodadas=args.max_rodadas)
+        print(tabulate(resultado["rodadas"], headers="keys", tablefmt="psql", floatfmt=".3f"))
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nA decomposição NÃO ENCONTROU uma solução viável.")
+        return
+    print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+    if not args.sem_cronograma:
+        imprimir_cronograma(formatar_solucao(param, resultado["alocacoes"]))
+    if args.exportar:
+        exportar_solucao(param, resultado, args.exportar)
+
+
+if __name__ == "__main__":
+    main()
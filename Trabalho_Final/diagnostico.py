@@ -0,0 +1,169 @@
+import argparse
+import math
+import sys
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import ARQUIVO_PADRAO, preparar_parametros
+
+
+# Diagnóstico rápido de inviabilidade, antes de montar o modelo.
+# Confere nos arrays pré-processados (máscara de início e índice de viabilidade) condições
+# necessárias para existir agenda, e aponta a tarefa, pessoa ou dia responsável:
+#   - demanda de slots x capacidade das pessoas (limite de carga e disponibilidade), no total e
+#     por tarefa (só com as pessoas que podem fazê-la);
+#   - inícios possíveis por tarefa e por ocorrência (janela menor que a duração, ninguém disponível,
+#     precedência sem espaço);
+#   - demanda das tarefas do bebê que só podem acontecer em um dia x slots desse dia com alguém disponível;
+#   - cadeias periódicas que não cabem no horizonte (ou nas janelas).
+# Lista vazia não prova que o modelo é viável: só que nenhuma dessas contas falhou.
+
+def _cobertura(mascara, duracao):
+    """
+    (Função interna) Slots cobertos por algum início permitido de `mascara` (pessoas x slots)
+    com a duração dada.
+    """
+    total_slots = mascara.shape[1]
+    coberto = mascara.copy()
+    for k in range(1, duracao):
+        coberto[:, k:] |= mascara[:, : total_slots - k]
+    return coberto
+
+def disponibilidade_pessoas(param):
+    """
+    Matriz (pessoas x slots): a pessoa pode estar fazendo alguma tarefa no slot
+    (algum início permitido cuja duração cobre o slot).
+    """
+    disponivel = np.zeros((len(param["pessoas"]), param["total_slots"]), dtype=bool)
+    for idx_j, j in enumerate(param["tarefas"]):
+        disponivel |= _cobertura(param["mascara_inicio"][:, idx_j, :], param["duracao_tarefas"][j])
+    return disponivel
+
+def _problema(verificacao, alvo, mensagem):
+    return {"verificacao": verificacao, "alvo": alvo, "mensagem": mensagem}
+
+def diagnosticar(param):
+    """
+    Executa todas as verificações sobre os parâmetros de `preparar_parametros(...)`.
+    Retorna a lista de problemas encontrados, cada um um dicionário com "verificacao",
+    "alvo" (tarefa, pessoa, dia ou "total") e "mensagem".
+    """
+    pessoas, tarefas = param["pessoas"], param["tarefas"]
+    total_slots = param["total_slots"]
+    duracao_slot = param["duracao_slot"]
+    slots_por_dia = (24 * 60) // duracao_slot
+    duracao = param["duracao_tarefas"]
+    ocorrencias = param["ocorrencias"]
+    disponivel = disponibilidade_pessoas(param)
+    alguem_pode = {j: param["mascara_inicio"][:, idx_j, :].any(axis=0) for idx_j, j in enumerate(tarefas)}
+    problemas = []
+
+    # 1. Demanda x capacidade das pessoas (no total e por tarefa, só com quem pode fazê-la)
+    vezes = {j: sum(param.get("multiplicidade", {}).get(j, 1) for _ in ocorrencias[j]) for j in tarefas}
+    demanda = sum(vezes[j] * duracao[j] for j in tarefas)
+    capacidade = {i: min(int(disponivel[idx_i].sum()), param["limite_carga"].get(i, total_slots))
+                  for idx_i, i in enumerate(pessoas)}
+    if demanda > sum(capacidade.values()):
+        detalhe = ", ".join(f"{i} {c * duracao_slot / 60:g} h" for i, c in capacidade.items())
+        problemas.append(_problema(
+            "capacidade_total", "total",
+            f"as tarefas somam {demanda * duracao_slot / 60:g} h, mas as pessoas cobrem no máximo "
+            f"{sum(capacidade.values()) * duracao_slot / 60:g} h ({detalhe}); aumente `limite_carga_horas` "
+            f"ou a disponibilidade"))
+    for idx_j, j in enumerate(tarefas):
+        # Na tarefa, cada pessoa só conta os slots que algum início dela cobre
+        cobertura = _cobertura(param["mascara_inicio"][:, idx_j, :], duracao[j]).sum(axis=1)
+        capazes = {i: min(int(cobertura[idx_i]), capacidade[i]) for idx_i, i in enumerate(pessoas) if cobertura[idx_i]}
+        if capazes and vezes[j] * duracao[j] > sum(capazes.values()):
+            problemas.append(_problema(
+                "capacidade_tarefa", j,
+                f"'{j}' exige {vezes[j] * duracao[j] * duracao_slot / 60:g} h, mas só {', '.join(capazes)} "
+                f"podem fazê-la, cobrindo no máximo {sum(capazes.values()) * duracao_slot / 60:g} h dentro da janela"))
+
+    # 2. Inícios possíveis por tarefa e por ocorrência
+    periodicas_com_problema = set()
+    for j in tarefas:
+        if j in param["periodicidade"]:
+            P_j_slots = math.ceil(param["periodicidade"][j] / duracao_slot)
+            necessario = (len(ocorrencias[j]) - 1) * P_j_slots + duracao[j]
+            if necessario > total_slots:
+                problemas.append(_problema(
+                    "cadeia_periodica", j,
+                    f"{len(ocorrencias[j])} ocorrências a cada {param['periodicidade'][j]} min ocupam "
+                    f"{necessario} slots, mas o horizonte tem {total_slots}"))
+                periodicas_com_problema.add(j)
+                continue
+        if not alguem_pode[j].any():
+            problemas.append(_problema(
+                "inicios_tarefa", j,
+                f"nenhuma pessoa pode iniciar '{j}' ({duracao[j] * duracao_slot} min) em nenhum slot: a janela "
+                f"da tarefa é menor que a duração ou ninguém está disponível durante toda ela"))
+            periodicas_com_problema.add(j)
+            continue
+        sem_inicio = [o for o in ocorrencias[j] if not (param["viavel_ocorrencia"][j][o] & alguem_pode[j]).any()]
+        if sem_inicio and j in param["periodicidade"]:
+            problemas.append(_problema(
+                "cadeia_periodica", j,
+                f"a cadeia de {len(ocorrencias[j])} ocorrências a cada {param['periodicidade'][j]} min não cabe "
+                f"nas janelas/disponibilidades (nenhum primeiro início possível)"))
+            periodicas_com_problema.add(j)
+        elif sem_inicio:
+            problemas.append(_problema(
+                "inicios_ocorrencia", j,
+                f"{len(sem_inicio)} de {len(ocorrencias[j])} ocorrências de '{j}' sem início possível "
+                f"(ex.: ocorrência {sem_inicio[0]}), em geral por precedência sem espaço na janela de espera"))
+
+    # 3. Tarefas do bebê presas a um dia x slots desse dia com alguém disponível
+    # (só ocorrências cujos inícios possíveis caem todos no mesmo dia)
+    n_dias = -(-total_slots // slots_por_dia)
+    alguem_disponivel = disponivel.any(axis=0)
+    forcada = np.zeros(n_dias, dtype=np.int64)
+    for j in param["tarefas_bebe"]:
+        if j in periodicas_com_problema:
+            continue
+        for o in ocorrencias[j]:
+            inicios = np.flatnonzero(param["viavel_ocorrencia"][j][o] & alguem_pode[j])
+            if len(inicios) and inicios[0] // slots_por_dia == inicios[-1] // slots_por_dia:
+                forcada[inicios[0] // slots_por_dia] += param.get("multiplicidade", {}).get(j, 1) * duracao[j]
+    dur_max = max(duracao.values(), default=1)
+    for d in np.flatnonzero(forcada).tolist():
+        # Tarefas que começam no dia podem terminar até dur_max - 1 slots depois dele
+        livres = int(alguem_disponivel[d * slots_por_dia : min(total_slots, (d + 1) * slots_por_dia + dur_max - 1)].sum())
+        if forcada[d] > livres:
+            problemas.append(_problema(
+                "bebe_por_dia", f"dia {d + 1}",
+                f"tarefas do bebê que só podem acontecer no dia {d + 1} somam {forcada[d] * duracao_slot / 60:g} h, "
+                f"mas só há {livres * duracao_slot / 60:g} h com alguém disponível (e o bebê faz uma por vez)"))
+    return problemas
+
+def imprimir_diagnostico(problemas, tempo=None):
+    """
+    Imprime os problemas encontrados (ou que nenhum foi encontrado).
+    """
+    sufixo = "" if tempo is None else f" ({1000 * tempo:.1f} ms)"
+    if not problemas:
+        print(f"Diagnóstico: nenhuma inviabilidade evidente{sufixo}.")
+        return
+    print(f"Diagnóstico: {len(problemas)} problema(s) que tornam o modelo inviável{sufixo}:")
+    for p in problemas:
+        print(f"  - [{p['verificacao']}] {p['alvo']}: {p['mensagem']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Diagnóstico rápido de inviabilidade da entrada.")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO, help="JSON de entrada")
+    args = parser.parse_args()
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+    inicio = time.perf_counter()
+    param = preparar_parametros(data)
+    problemas = diagnosticar(param)
+    imprimir_diagnostico(problemas, time.perf_counter() - inicio)
+    sys.exit(1 if problemas else 0)
+
+
+if __name__ == "__main__":
+    main()
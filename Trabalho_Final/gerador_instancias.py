@@ -0,0 +1,202 @@
+import argparse
+import json
+import math
+import random
+
+from preprocessamento import DIAS_SEMANA
+
+
+# Gerador de instâncias sintéticas no mesmo formato de `input_semanal.json`.
+# A rotina do bebê é a mesma dos arquivos de entrada (amamentar -> arrotar, trocar fralda e ninar
+# a cada 3 horas, que cabem juntas no período); as tarefas da casa são sorteadas. Uma pessoa fica
+# disponível o tempo todo e, se as horas demandadas passarem de `OCUPACAO_MAXIMA` da capacidade das
+# pessoas, as ocorrências das tarefas da casa são reduzidas na mesma proporção. Isso não garante
+# viabilidade: a instância gerada passa por `diagnostico.diagnosticar` e é recusada se falhar.
+#
+# Parâmetros controláveis: número de pessoas e tarefas, escala do número de ocorrências,
+# dias, duração do slot e aperto das janelas (0 = sem janela, 1 = janela justa para as ocorrências do dia).
+
+ROTINA_BEBE = {
+    "amamentar": {"duracao": 60, "tipo": "bebe"},
+    "arrotar": {"duracao": 30, "tipo": "bebe"},
+    "trocar_fralda": {"duracao": 30, "tipo": "bebe"},
+    "ninar": {"duracao": 30, "tipo": "bebe"},
+}
+PERIODO_BEBE_MIN = 180
+# Fração da capacidade das pessoas (limite de carga) que as tarefas podem ocupar
+OCUPACAO_MAXIMA = 0.9
+
+def _hora(minutos):
+    """
+    (Função interna) Minutos desde 00:00 -> 'HH:MM' ('24:00' no fim do dia).
+    """
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+def _arredondar_slot(minutos, slot_min):
+    """
+    (Função interna) Arredonda para um múltiplo do slot (mínimo de um slot).
+    """
+    return max(slot_min, int(round(minutos / slot_min)) * slot_min)
+
+def gerar_instancia(pessoas=6, tarefas=19, ocorrencias=1.0, dias=7, slot_min=30, aperto=0.5, alpha=1, semente=0):
+    """
+    Gera uma instância sintética (dicionário no formato do JSON de entrada).
+      - pessoas: número de pessoas (a primeira fica disponível o dia inteiro);
+      - tarefas: número total de tarefas (as 4 primeiras são a rotina periódica do bebê);
+      - ocorrencias: escala do número de ocorrências por dia das tarefas da casa;
+      - dias, slot_min: horizonte e duração do slot em minutos;
+      - aperto: 0 (sem janela de horário) a 1 (janela justa: as ocorrências do dia em sequência);
+      - semente: semente do sorteio (mesma semente, mesma instância).
+    A instância não é conferida aqui (ver `gerar_instancia_viavel`).
+    """
+    rng = random.Random(semente)
+    nomes_pessoas = [f"pessoa_{k + 1}" for k in range(pessoas)]
+
+    # Tarefas: rotina do bebê + tarefas da casa sorteadas
+    dados_tarefas = {}
+    periodicidade = {}
+    dependencias = {}
+    rotina = list(ROTINA_BEBE)[: min(tarefas, len(ROTINA_BEBE))]
+    duracoes_bebe = {nome: _arredondar_slot(ROTINA_BEBE[nome]["duracao"], slot_min) for nome in rotina}
+    # Com slots grandes as durações arredondadas podem não caber em 3 h: o período cresce junto
+    periodo = max(PERIODO_BEBE_MIN, sum(duracoes_bebe.values()))
+    periodo = int(math.ceil(periodo / slot_min)) * slot_min
+    for nome in rotina:
+        dados_tarefas[nome] = {
+            "duracao": duracoes_bebe[nome],
+            "ocorrencias": dias * (24 * 60) // periodo,
+            "tipo": "bebe",
+        }
+        if nome != "arrotar":
+            periodicidade[nome] = periodo
+    if "amamentar" in dados_tarefas and "arrotar" in dados_tarefas:
+        dependencias["amamentar"] = {"proxima_tarefa": "arrotar", "janela_de_espera": 0}
+
+    janelas = {}
+    tarefas_casa = [f"tarefa_{k + 1}" for k in range(max(0, tarefas - len(ROTINA_BEBE)))]
+    for k, nome in enumerate(tarefas_casa):
+        duracao = _arredondar_slot(rng.choice((15, 30, 30, 60)), slot_min)
+        por_dia = rng.choice((0.5, 1, 1, 2)) * ocorrencias
+        dados_tarefas[nome] = {
+            "duracao": duracao,
+            "ocorrencias": max(1, int(round(por_dia * dias))),
+            "tipo": "casa",
+        }
+        if aperto > 0:
+            # Largura da janela diária: de 24 h (aperto 0) até as ocorrências do dia em sequência mais um
+            # slot (aperto 1), já que o fim da janela é exclusivo (ver `preprocessamento._processar_janelas_tarefas`)
+            minima = math.ceil(por_dia) * duracao + slot_min
+            largura = _arredondar_slot(minima + (1 - aperto) * (24 * 60 - minima), slot_min)
+            largura = min(largura, 24 * 60)
+            inicio = rng.randrange(0, 24 * 60 - largura + 1, slot_min)
+            janelas[nome] = [{"inicio": _hora(inicio), "fim": _hora(inicio + largura)}]
+        # A cada três tarefas da casa, uma depende da anterior (ex.: preparar -> lavar louça)
+        if k % 3 == 1:
+            anterior = tarefas_casa[k - 1]
+            if dados_tarefas[anterior]["ocorrencias"] == dados_tarefas[nome]["ocorrencias"]:
+                dependencias[anterior] = {"proxima_tarefa": nome,
+                                          "janela_de_espera": rng.choice((0, 60, 120, 300))}
+                janelas.pop(nome, None)
+
+    # Disponibilidade: a primeira pessoa sempre; as demais em blocos diários sorteados
+    disponibilidade = {nomes_pessoas[0]: [{"dia": "todos", "inicio": "00:00", "fim": "24:00"}]}
+    limite = {nomes_pessoas[0]: dias * 24}
+    for nome in nomes_pessoas[1:]:
+        regras = []
+        horas = 0
+        for dia in DIAS_SEMANA:
+            if rng.random() < 0.3:
+                continue
+            inicio = rng.randrange(0, 20) * 60
+            fim = min(24 * 60, inicio + rng.randrange(2, 11) * 60)
+            regras.append({"dia": dia, "inicio": _hora(inicio), "fim": _hora(fim)})
+            horas += (fim - inicio) / 60
+        disponibilidade[nome] = regras
+        limite[nome] = max(1, int(math.ceil(horas * dias / len(DIAS_SEMANA))))
+
+    # Demanda acima da capacidade: reduz as ocorrências da casa na mesma proporção (tarefas com
+    # precedência têm o mesmo número de ocorrências e continuam iguais)
+    demanda = {j: dados_tarefas[j]["ocorrencias"] * dados_tarefas[j]["duracao"] / 60 for j in dados_tarefas}
+    disponivel_casa = OCUPACAO_MAXIMA * sum(limite.values()) - sum(demanda[j] for j in rotina)
+    demanda_casa = sum(demanda[j] for j in tarefas_casa)
+    if demanda_casa > disponivel_casa:
+        fator = max(0.0, disponivel_casa) / demanda_casa
+        for nome in tarefas_casa:
+            dados_tarefas[nome]["ocorrencias"] = max(1, int(dados_tarefas[nome]["ocorrencias"] * fator))
+        # Cada tarefa da casa fica com ao menos uma ocorrência: pode não chegar à fração desejada
+        demanda_casa = sum(dados_tarefas[j]["ocorrencias"] * dados_tarefas[j]["duracao"] / 60 for j in tarefas_casa)
+        if demanda_casa > disponivel_casa:
+            print(f"Aviso: as tarefas da casa ainda pedem {demanda_casa:g} h, acima das {max(0.0, disponivel_casa):g} h "
+                  f"que sobram da rotina do bebê; a instância tende a ser inviável (use mais pessoas ou menos tarefas).")
+
+    aptidao = {
+        i: {j: round(rng.uniform(0.3, 1.0), 1) for j in dados_tarefas}
+        for i in nomes_pessoas
+    }
+
+    return {
+        "alpha": alpha,
+        "dias": dias,
+        "slot_duracao_min": slot_min,
+        "pessoas": nomes_pessoas,
+        "tarefas": dados_tarefas,
+        "disponibilidade_pessoas": disponibilidade,
+        "aptidao": aptidao,
+        "dependencias": dependencias,
+        "periodicidade": periodicidade,
+        "limite_carga_horas": limite,
+        "disponibilidade_tarefas": janelas,
+    }
+
+def gerar_instancia_viavel(**kwargs):
+    """
+    Gera a instância com `gerar_instancia(**kwargs)` e a confere com `diagnostico.diagnosticar`.
+    Retorna a instância, ou None (com os problemas impressos) se o diagnóstico apontar inviabilidade.
+    """
+    import preprocessamento as pp
+    import diagnostico
+    from model import preparar_parametros
+
+    instancia = gerar_instancia(**kwargs)
+    data = pp.processar_dados(json.loads(json.dumps(instancia)))
+    if data is None:
+        return None
+    problemas = diagnostico.diagnosticar(preparar_parametros(data))
+    if problemas:
+        diagnostico.imprimir_diagnostico(problemas)
+        print("Erro: a instância gerada é inviável; mude os parâmetros ou a semente.")
+        return None
+    return instancia
+
+def salvar_instancia(instancia, caminho_arquivo):
+    """
+    Grava a instância em JSON (UTF-8, indentado).
+    """
+    with open(caminho_arquivo, "w", encoding="utf-8") as f:
+        json.dump(instancia, f, ensure_ascii=False, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera uma instância sintética no formato de input_semanal.json.")
+    parser.add_argument("saida", help="arquivo JSON de saída")
+    parser.add_argument("--pessoas", type=int, default=6)
+    parser.add_argument("--tarefas", type=int, default=19)
+    parser.add_argument("--ocorrencias", type=float, default=1.0, help="escala das ocorrências por dia")
+    parser.add_argument("--dias", type=int, default=7)
+    parser.add_argument("--slot", type=int, default=30, help="duração do slot (min)")
+    parser.add_argument("--aperto", type=float, default=0.5, help="0 = sem janelas, 1 = janelas justas para as ocorrências do dia")
+    parser.add_argument("--alpha", type=float, default=1)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    instancia = gerar_instancia_viavel(pessoas=args.pessoas, tarefas=args.tarefas, ocorrencias=args.ocorrencias,
+                                       dias=args.dias, slot_min=args.slot, aperto=args.aperto, alpha=args.alpha,
+                                       semente=args.semente)
+    if instancia is None:
+        exit()
+    salvar_instancia(instancia, args.saida)
+    print(f"Instância salva em '{args.saida}' ({args.pessoas} pessoas, {len(instancia['tarefas'])} tarefas, "
+          f"{args.dias} dias).")
+
+
+if __name__ == "__main__":
+    main()
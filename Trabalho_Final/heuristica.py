@@ -0,0 +1,404 @@
+import argparse
+import math
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import ARQUIVO_PADRAO, preparar_parametros, calcular_cargas, calcular_delta
+
+
+# Heurística construtiva (list scheduling) para a alocação de tarefas.
+# Monta uma agenda viável diretamente dos dados pré-processados, sem solver:
+#   1. tarefas periódicas primeiro (cadeias amamentar/ninar/trocar_fralda a cada P_j minutos),
+#      escolhendo o primeiro início de cadeia em que todas as ocorrências cabem;
+#   2. depois as demais ocorrências, das tarefas com menos inícios possíveis para as com mais;
+#   3. cada ocorrência que tem sucessora (ex.: amamentar -> arrotar) só é aceita se a sucessora
+#      couber na janela de espera logo em seguida.
+# Em cada ocorrência é escolhida a pessoa mais apta disponível dentro de `limite_carga`.
+# A agenda serve como modo rápido (sem MILP) ou como solução inicial (MIP start) do HiGHS.
+
+# Máximo de candidatos (pessoa, slot) testados por ocorrência quando a sucessora não cabe
+MAX_TENTATIVAS = 200
+
+def _preparar_estado(param):
+    """
+    (Função interna) Estruturas auxiliares da heurística: matrizes de aptidão e ocupação,
+    durações, limites de carga e mapa de precedências nos dois sentidos.
+    """
+    pessoas = param["pessoas"]
+    tarefas = param["tarefas"]
+    total_slots = param["total_slots"]
+    limite_carga = param["limite_carga"]
+
+    balancear = bool(limite_carga) and param["alpha"] > 0
+    sucessora, antecessora = {}, {}
+    for j1, dep in param["dependencias"].items():
+        j2 = dep["proxima_tarefa"]
+        janela = math.ceil(dep["janela_de_espera"] / param["duracao_slot"])
+        sucessora[j1] = (j2, janela)
+        antecessora[j2] = (j1, janela)
+
+    return {
+        "idx_tarefa": {j: idx for idx, j in enumerate(tarefas)},
+        "capacidade": np.array([[param["capacidade"][i][j] for j in tarefas] for i in pessoas]),
+        "limite": np.array([limite_carga.get(i, np.inf) for i in pessoas], dtype=np.float64),
+        "peso_balanceamento": param["alpha"] if balancear else 0.0,
+        "sucessora": sucessora,
+        "antecessora": antecessora,
+        "ocupado": np.zeros((len(pessoas), total_slots), dtype=bool),
+        "ocupado_bebe": np.zeros(total_slots, dtype=bool),
+        "carga": np.zeros(len(pessoas), dtype=np.int64),
+        "inicio": {},
+    }
+
+def slots_livres(ocupado, dur):
+    """
+    livre[..., t] = nenhum slot de [t, t + dur) está ocupado (janela deslizante).
+    """
+    total_slots = ocupado.shape[-1]
+    acumulada = np.zeros(ocupado.shape[:-1] + (total_slots + 1,), dtype=np.int32)
+    np.cumsum(ocupado, axis=-1, out=acumulada[..., 1:])
+    livre = np.zeros(ocupado.shape, dtype=bool)
+    if dur <= total_slots:
+        livre[..., : total_slots - dur + 1] = (acumulada[..., dur:] - acumulada[..., : total_slots - dur + 1]) == 0
+    return livre
+
+def _candidatos(param, estado, j, o=None):
+    """
+    (Função interna) Matriz (pessoas x slots) dos inícios possíveis para a ocorrência o de j
+    dado o que já foi alocado: máscara de início, pessoa livre, bebê livre (tarefas do bebê),
+    limite de carga e janelas de precedência com tarefas já posicionadas.
+    Com o=None ignora o índice por ocorrência (usado nas cadeias periódicas).
+    """
+    idx_j = estado["idx_tarefa"][j]
+    dur = param["duracao_tarefas"][j]
+    total_slots = param["total_slots"]
+
+    cand = param["mascara_inicio"][:, idx_j, :] & slots_livres(estado["ocupado"], dur)
+    if o is not None:
+        cand &= param["viavel_ocorrencia"][j][o]
+    if j in param["tarefas_bebe"]:
+        cand &= slots_livres(estado["ocupado_bebe"], dur)
+    cand &= (estado["carga"] + dur <= estado["limite"])[:, None]
+
+    if o is not None:
+        janela_permitida = np.ones(total_slots, dtype=bool)
+        if j in estado["antecessora"]:
+            j1, W = estado["antecessora"][j]
+            if (j1, o) in estado["inicio"]:
+                t1 = estado["inicio"][(j1, o)][1]
+                fim_j1 = t1 + param["duracao_tarefas"][j1]
+                janela_permitida[:] = False
+                janela_permitida[fim_j1 : fim_j1 + W + 1] = True
+        if j in estado["sucessora"]:
+            j2, W = estado["sucessora"][j]
+            if (j2, o) in estado["inicio"]:
+                t2 = estado["inicio"][(j2, o)][1]
+                fim_max = t2 - dur
+                janela = np.zeros(total_slots, dtype=bool)
+                janela[max(0, fim_max - W) : max(0, fim_max + 1)] = True
+                janela_permitida &= janela
+        cand &= janela_permitida
+    return cand
+
+def _ordenar_candidatos(param, estado, j, cand):
+    """
+    (Função interna) Lista (idx_i, t) dos candidatos: pessoas da mais apta/menos carregada
+    para a menos, e para cada pessoa os slots em ordem crescente.
+    """
+    idx_j = estado["idx_tarefa"][j]
+    dur = param["duracao_tarefas"][j]
+    uso = (estado["carga"] + dur) / estado["limite"]
+    pontuacao = (1 - estado["capacidade"][:, idx_j]) + estado["peso_balanceamento"] * uso + 1e-6 * uso
+    candidatos = []
+    for idx_i in np.argsort(pontuacao, kind="stable"):
+        candidatos.extend((int(idx_i), t) for t in np.flatnonzero(cand[idx_i]).tolist())
+    return candidatos
+
+def _posicionar(param, estado, idx_i, j, o, t):
+    dur = param["duracao_tarefas"][j]
+    estado["ocupado"][idx_i, t : t + dur] = True
+    if j in param["tarefas_bebe"]:
+        estado["ocupado_bebe"][t : t + dur] = True
+    estado["carga"][idx_i] += dur
+    estado["inicio"][(j, o)] = (idx_i, t)
+
+def _remover(param, estado, j, o):
+    idx_i, t = estado["inicio"].pop((j, o))
+    dur = param["duracao_tarefas"][j]
+    estado["ocupado"][idx_i, t : t + dur] = False
+    if j in param["tarefas_bebe"]:
+        estado["ocupado_bebe"][t : t + dur] = False
+    estado["carga"][idx_i] -= dur
+
+def _posicionar_sucessoras(param, estado, j, o):
+    """
+    (Função interna) Depois de posicionar (j, o), posiciona a ocorrência o da sucessora de j
+    (e as sucessoras dela) dentro da janela de espera. Desfaz tudo e retorna False se não couber.
+    """
+    if j not in estado["sucessora"]:
+        return True
+    j2, _ = estado["sucessora"][j]
+    if o not in param["ocorrencias"][j2] or (j2, o) in estado["inicio"] or j2 in param["periodicidade"]:
+        return True
+    return _posicionar_grupo(param, estado, j2, o)
+
+def _posicionar_grupo(param, estado, j, o):
+    """
+    (Função interna) Posiciona a ocorrência o de j no melhor candidato cujas sucessoras também cabem.
+    """
+    candidatos = _ordenar_candidatos(param, estado, j, _candidatos(param, estado, j, o))
+    for idx_i, t in candidatos[:MAX_TENTATIVAS]:
+        _posicionar(param, estado, idx_i, j, o, t)
+        if _posicionar_sucessoras(param, estado, j, o):
+            return True
+        _remover(param, estado, j, o)
+    return False
+
+def _posicionar_cadeia(param, estado, j):
+    """
+    (Função interna) Posiciona todas as ocorrências de uma tarefa periódica j (início s, s + P, ...),
+    testando os inícios de cadeia em ordem crescente até todas as ocorrências (e sucessoras) caberem.
+    """
+    ocorrencias = param["ocorrencias"][j]
+    P_j_slots = math.ceil(param["periodicidade"][j] / param["duracao_slot"])
+    total_slots = param["total_slots"]
+
+    livre_algum = _candidatos(param, estado, j).any(axis=0)
+    inicio_ok = param["viavel_ocorrencia"][j][0].copy()
+    for o in ocorrencias:
+        deslocado = np.zeros(total_slots, dtype=bool)
+        if o * P_j_slots < total_slots:
+            deslocado[: total_slots - o * P_j_slots] = livre_algum[o * P_j_slots :]
+        inicio_ok &= deslocado
+
+    for s in np.flatnonzero(inicio_ok).tolist():
+        posicionadas = []
+        for o in ocorrencias:
+            t = s + o * P_j_slots
+            cand = np.zeros_like(estado["ocupado"])
+            cand[:, t] = _candidatos(param, estado, j, o)[:, t]
+            if not _posicionar_ocorrencia_fixa(param, estado, j, o, cand):
+                break
+            posicionadas.append(o)
+        else:
+            return True
+        for o in reversed(posicionadas):
+            _remover_com_sucessoras(param, estado, j, o)
+    return False
+
+def _posicionar_ocorrencia_fixa(param, estado, j, o, cand):
+    for idx_i, t in _ordenar_candidatos(param, estado, j, cand):
+        _posicionar(param, estado, idx_i, j, o, t)
+        if _posicionar_sucessoras(param, estado, j, o):
+            return True
+        _remover(param, estado, j, o)
+    return False
+
+def _remover_com_sucessoras(param, estado, j, o):
+    if j in estado["sucessora"]:
+        j2, _ = estado["sucessora"][j]
+        if (j2, o) in estado["inicio"] and j2 not in param["periodicidade"]:
+            _remover_com_sucessoras(param, estado, j2, o)
+    _remover(param, estado, j, o)
+
+def objetivo_alocacoes(param, alocacoes):
+    """
+    Valor da função objetivo de `model.py` para um conjunto de alocações (idx_i, idx_j, o, t):
+    falta de aptidão + α · Δ (Δ só entra se o balanceamento estiver ativo, como no modelo).
+    """
+    pessoas, tarefas = param["pessoas"], param["tarefas"]
+    aptidao = sum(1 - param["capacidade"][pessoas[idx_i]][tarefas[idx_j]] for idx_i, idx_j, _, _ in alocacoes)
+    if param["limite_carga"] and param["alpha"] > 0:
+        return aptidao + param["alpha"] * calcular_delta(param, calcular_cargas(param, alocacoes))
+    return aptidao
+
+def _completar(param, estado):
+    """
+    (Função interna) Posiciona as ocorrências que ainda não estão em estado["inicio"].
+    Retorna a primeira (j, o) que não coube ((j, None) para uma cadeia periódica inteira) ou None.
+    """
+    tarefas = param["tarefas"]
+
+    # 1. Cadeias periódicas: as que têm sucessora primeiro (ocupam também a sucessora), depois as mais longas.
+    #    Cadeia com alguma ocorrência já posicionada é rígida: as demais só escolhem a pessoa.
+    periodicas = sorted(
+        (j for j in tarefas if j in param["periodicidade"]),
+        key=lambda j: (j not in estado["sucessora"], -param["duracao_tarefas"][j]),
+    )
+    for j in periodicas:
+        posicionadas = [o for o in param["ocorrencias"][j] if (j, o) in estado["inicio"]]
+        if not posicionadas:
+            if not _posicionar_cadeia(param, estado, j):
+                return (j, None)
+            continue
+        P_j_slots = math.ceil(param["periodicidade"][j] / param["duracao_slot"])
+        o_ref = posicionadas[0]
+        t_ref = estado["inicio"][(j, o_ref)][1]
+        for o in param["ocorrencias"][j]:
+            if (j, o) in estado["inicio"]:
+                continue
+            t = t_ref + (o - o_ref) * P_j_slots
+            cand = np.zeros_like(estado["ocupado"])
+            if 0 <= t < param["total_slots"]:
+                cand[:, t] = _candidatos(param, estado, j, o)[:, t]
+            if not _posicionar_ocorrencia_fixa(param, estado, j, o, cand):
+                return (j, o)
+
+    # 2. Demais ocorrências: tarefas do bebê antes das da casa, menos inícios possíveis primeiro.
+    #    Sucessoras são posicionadas junto com a antecessora (se a antecessora ainda não estava posicionada).
+    restantes = [j for j in tarefas if j not in param["periodicidade"]]
+    restantes.sort(key=lambda j: (j not in param["tarefas_bebe"], int(param["viavel_ocorrencia"][j][0].sum())))
+    ja_posicionadas = set(estado["inicio"])
+    for j in restantes:
+        for o in param["ocorrencias"][j]:
+            if (j, o) in estado["inicio"]:
+                continue
+            if j in estado["antecessora"] and o in param["ocorrencias"][estado["antecessora"][j][0]]:
+                if (estado["antecessora"][j][0], o) not in ja_posicionadas:
+                    continue  # posicionada junto com a antecessora
+            if not _posicionar_grupo(param, estado, j, o):
+                return (j, o)
+    return None
+
+def construir_agenda(param):
+    """
+    Executa a heurística construtiva.
+    Retorna a lista de alocações (idx_i, idx_j, o, t) ou None se alguma ocorrência não couber.
+    """
+    estado = _preparar_estado(param)
+    falha = _completar(param, estado)
+    if falha is not None:
+        j, o = falha
+        if o is None:
+            print(f"Heurística: não foi possível posicionar a cadeia periódica de '{j}'.")
+        else:
+            print(f"Heurística: não foi possível posicionar '{j}' (ocorrência {o}).")
+        return None
+
+    tarefas = param["tarefas"]
+    faltando = [(j, o) for j in tarefas for o in param["ocorrencias"][j] if (j, o) not in estado["inicio"]]
+    if faltando:
+        print(f"Heurística: não foi possível posicionar {faltando[:5]}.")
+        return None
+
+    idx_tarefa = estado["idx_tarefa"]
+    return [(idx_i, idx_tarefa[j], o, t) for (j, o), (idx_i, t) in estado["inicio"].items()]
+
+def completar_agenda(param, fixadas):
+    """
+    Completa uma agenda parcial com as regras da heurística construtiva: as alocações em `fixadas`
+    ({(j, o): (idx_i, t)}) ficam como estão e as demais ocorrências são inseridas em volta delas.
+    Retorna a lista completa de alocações (idx_i, idx_j, o, t) ou None se alguma não couber.
+    """
+    estado = _preparar_estado(param)
+    for (j, o), (idx_i, t) in fixadas.items():
+        _posicionar(param, estado, idx_i, j, o, t)
+    if _completar(param, estado) is not None:
+        return None
+    if any((j, o) not in estado["inicio"] for j in param["tarefas"] for o in param["ocorrencias"][j]):
+        return None
+    idx_tarefa = estado["idx_tarefa"]
+    return [(idx_i, idx_tarefa[j], o, t) for (j, o), (idx_i, t) in estado["inicio"].items()]
+
+def verificar_alocacoes(param, alocacoes):
+    """
+    Confere se as alocações (idx_i, idx_j, o, t) satisfazem as restrições 4.1 a 4.8.
+    Retorna a lista de violações encontradas (vazia se a agenda é viável).
+    """
+    pessoas, tarefas = param["pessoas"], param["tarefas"]
+    duracao_tarefas = param["duracao_tarefas"]
+    total_slots = param["total_slots"]
+    violacoes = []
+
+    inicio = {}
+    ocupacao = np.zeros((len(pessoas), total_slots), dtype=np.int32)
+    ocupacao_bebe = np.zeros(total_slots, dtype=np.int32)
+    for idx_i, idx_j, o, t in alocacoes:
+        j = tarefas[idx_j]
+        dur = duracao_tarefas[j]
+        if (j, o) in inicio:
+            violacoes.append(f"4.1: '{j}' ocorrência {o} alocada mais de uma vez")
+        inicio[(j, o)] = t
+        if not (param["mascara_inicio"][idx_i, idx_j, t] and param["viavel_ocorrencia"][j][o][t]):
+            violacoes.append(f"4.4/4.5: '{pessoas[idx_i]}' não pode iniciar '{j}' ({o}) no slot {t}")
+        ocupacao[idx_i, t : t + dur] += 1
+        if j in param["tarefas_bebe"]:
+            ocupacao_bebe[t : t + dur] += 1
+
+    for j in tarefas:
+        for o in param["ocorrencias"][j]:
+            if (j, o) not in inicio:
+                violacoes.append(f"4.1: '{j}' ocorrência {o} não alocada")
+    for idx_i, t in zip(*np.nonzero(ocupacao > 1)):
+        violacoes.append(f"4.2: '{pessoas[idx_i]}' com tarefas sobrepostas no slot {t}")
+    for t in np.flatnonzero(ocupacao_bebe > 1):
+        violacoes.append(f"4.3: tarefas do bebê sobrepostas no slot {t}")
+
+    for j1, dep in param["dependencias"].items():
+        j2 = dep["proxima_tarefa"]
+        W = math.ceil(dep["janela_de_espera"] / param["duracao_slot"])
+        for o in param["ocorrencias"][j1]:
+            if (j1, o) in inicio and (j2, o) in inicio:
+                espera = inicio[(j2, o)] - inicio[(j1, o)] - duracao_tarefas[j1]
+                if not 0 <= espera <= W:
+                    violacoes.append(f"4.6: '{j2}' ({o}) fora da janela após '{j1}'")
+    for j, P_j in param["periodicidade"].items():
+        P_j_slots = math.ceil(P_j / param["duracao_slot"])
+        for o in range(len(param["ocorrencias"][j]) - 1):
+            if (j, o) in inicio and (j, o + 1) in inicio and inicio[(j, o + 1)] - inicio[(j, o)] != P_j_slots:
+                violacoes.append(f"4.7: '{j}' ocorrências {o} e {o + 1} fora da periodicidade")
+
+    cargas = calcular_cargas(param, alocacoes)
+    for i, L_i in param["limite_carga"].items():
+        if i in cargas and cargas[i] > L_i:
+            violacoes.append(f"4.8: '{i}' excede o limite de carga ({cargas[i]} > {L_i} slots)")
+    return violacoes
+
+def resolver_heuristica(param):
+    """
+    Modo rápido: só a heurística construtiva.
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)` (status "Feasible" ou "Not Solved").
+    """
+    inicio = time.perf_counter()
+    alocacoes = construir_agenda(param)
+    tempo = time.perf_counter() - inicio
+
+    resultado = {
+        "status": "Not Solved",
+        "objetivo": None,
+        "alocacoes": [],
+        "tempo_montagem": 0.0,
+        "tempo_resolucao": tempo,
+    }
+    if alocacoes is not None:
+        resultado["status"] = "Feasible"
+        resultado["objetivo"] = objetivo_alocacoes(param, alocacoes)
+        resultado["alocacoes"] = alocacoes
+        print(f"Heurística: objetivo {resultado['objetivo']:.4f} em {tempo:.3f}s")
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Heurística construtiva (modo rápido, sem MILP).")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO, help="JSON de entrada")
+    args = parser.parse_args()
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+
+    from model import formatar_solucao, imprimir_cronograma
+    param = preparar_parametros(data)
+    resultado = resolver_heuristica(param)
+    if resultado["objetivo"] is None:
+        print("\nA heurística NÃO ENCONTROU uma agenda viável.")
+        return
+    violacoes = verificar_alocacoes(param, resultado["alocacoes"])
+    if violacoes:
+        print(f"Aviso: {len(violacoes)} violações na agenda da heurística: {violacoes[:5]}")
+    imprimir_cronograma(formatar_solucao(param, resultado["alocacoes"]))
+
+
+if __name__ == "__main__":
+    main()
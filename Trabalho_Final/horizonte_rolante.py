@@ -0,0 +1,268 @@
+import argparse
+import math
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import preparar_parametros, formatar_solucao, imprimir_cronograma
+import modelo_highs
+from heuristica import slots_livres, objetivo_alocacoes, verificar_alocacoes
+
+
+# Horizonte rolante para instâncias de vários dias.
+# Em vez de um único modelo para a semana inteira, resolve uma janela de `janela_dias` dias
+# (mais uma sobreposição de `sobreposicao_horas` dentro da janela seguinte), fixa as alocações
+# que começam antes do fim da janela e avança. O que começou na sobreposição é liberado e
+# volta a ser decidido na janela seguinte.
+#
+# O que atravessa a fronteira entre janelas:
+#   - periodicidade: a primeira ocorrência pendente de uma tarefa periódica só pode começar
+#     em t_{o-1} + P_j, contado a partir da última ocorrência fixada;
+#   - precedência: se a antecessora (j1, o) já foi fixada, (j2, o) fica restrita à janela de espera;
+#   - ocupação: tarefas fixadas que invadem a janela bloqueiam a pessoa (e o bebê) nesses slots;
+#   - limite_carga e balanceamento: a carga fixada entra como constante (`carga_fixa`).
+#
+# Cada janela é montada como um subproblema (mesmo dicionário de parâmetros de `model.py`,
+# com ocorrências, índice de viabilidade e máscara restritos) e resolvida pelo backend highs.
+
+def _ocupacao_fixada(param, fixadas):
+    """
+    (Função interna) Ocupação (pessoas x slots), ocupação do bebê e carga por pessoa
+    das alocações já fixadas.
+    """
+    ocupado = np.zeros((len(param["pessoas"]), param["total_slots"]), dtype=bool)
+    ocupado_bebe = np.zeros(param["total_slots"], dtype=bool)
+    carga_fixa = {i: 0 for i in param["pessoas"]}
+    for (j, _), (idx_i, t) in fixadas.items():
+        dur = param["duracao_tarefas"][j]
+        ocupado[idx_i, t : t + dur] = True
+        if j in param["tarefas_bebe"]:
+            ocupado_bebe[t : t + dur] = True
+        carga_fixa[param["pessoas"][idx_i]] += dur
+    return ocupado, ocupado_bebe, carga_fixa
+
+def montar_subproblema(param, fixadas, inicio, fim_commit, fim):
+    """
+    Monta o subproblema de uma janela: inícios permitidos em [inicio, fim), ocorrências pendentes
+    que precisam (ou podem) ser feitas até `fim_commit` e tudo o que foi fixado antes.
+    Retorna o dicionário de parâmetros do subproblema, ou None se alguma ocorrência obrigatória
+    não tiver nenhum início possível na janela.
+    """
+    tarefas = param["tarefas"]
+    total_slots = param["total_slots"]
+    duracao_slot = param["duracao_slot"]
+    ultima_janela = fim_commit >= total_slots
+
+    antecessora, sucessora = {}, {}
+    for j1, dep in param["dependencias"].items():
+        W = math.ceil(dep["janela_de_espera"] / duracao_slot)
+        antecessora[dep["proxima_tarefa"]] = (j1, W)
+        sucessora[j1] = (dep["proxima_tarefa"], W)
+
+    # Máscara de início restrita à janela e aos slots ainda livres
+    ocupado, ocupado_bebe, carga_fixa = _ocupacao_fixada(param, fixadas)
+    dentro = np.zeros(total_slots, dtype=bool)
+    dentro[inicio:fim] = True
+    mascara = param["mascara_inicio"] & dentro
+    for idx_j, j in enumerate(tarefas):
+        dur = param["duracao_tarefas"][j]
+        mascara[:, idx_j, :] &= slots_livres(ocupado, dur)
+        if j in param["tarefas_bebe"]:
+            mascara[:, idx_j, :] &= slots_livres(ocupado_bebe, dur)
+
+    # Viabilidade por ocorrência pendente, com o que vem das janelas anteriores
+    viavel = {}
+    pendentes = {}
+    for j in tarefas:
+        pendentes[j] = [o for o in param["ocorrencias"][j] if (j, o) not in fixadas]
+        viavel[j] = {}
+        for o in pendentes[j]:
+            v = param["viavel_ocorrencia"][j][o] & mascara[:, tarefas.index(j), :].any(axis=0)
+            if j in param["periodicidade"] and (j, o - 1) in fixadas:
+                P_j_slots = math.ceil(param["periodicidade"][j] / duracao_slot)
+                t_fixo = fixadas[(j, o - 1)][1] + P_j_slots
+                v = v & (np.arange(total_slots) == t_fixo)
+            if j in param["periodicidade"] and (j, o + 1) in fixadas:
+                # Só ocorre quando o que está fixado não é um prefixo da cadeia (ex.: LNS em `lns.py`)
+                P_j_slots = math.ceil(param["periodicidade"][j] / duracao_slot)
+                t_fixo = fixadas[(j, o + 1)][1] - P_j_slots
+                v = v & (np.arange(total_slots) == t_fixo)
+            if j in antecessora and (antecessora[j][0], o) in fixadas:
+                j1, W = antecessora[j]
+                fim_j1 = fixadas[(j1, o)][1] + param["duracao_tarefas"][j1]
+                janela = np.zeros(total_slots, dtype=bool)
+                janela[fim_j1 : fim_j1 + W + 1] = True
+                v = v & janela
+            if j in sucessora and (sucessora[j][0], o) in fixadas:
+                j2, W = sucessora[j]
+                fim_max = fixadas[(j2, o)][1] - param["duracao_tarefas"][j]
+                janela = np.zeros(total_slots, dtype=bool)
+                janela[max(0, fim_max - W) : max(0, fim_max + 1)] = True
+                v = v & janela
+            viavel[j][o] = v
+
+    # Ocorrências incluídas na janela
+    incluidas = {}
+    antes_do_commit = set()
+    for j in tarefas:
+        n_j = len(param["ocorrencias"][j])
+        if ultima_janela:
+            incluidas[j] = list(pendentes[j])
+        elif j in param["periodicidade"]:
+            # Periódicas: as ocorrências da cadeia que cabem inteiras na janela, sobreposição
+            # inclusa. A cadeia é rígida: cortar o domínio de uma ocorrência no fim da janela
+            # força as anteriores, e parar em fim_commit deixa para a janela seguinte inícios
+            # forçados que podem colidir entre si.
+            incluidas[j] = []
+            for o in pendentes[j]:
+                if not viavel[j][o].any() or param["viavel_ocorrencia"][j][o][fim:].any():
+                    break
+                # A sucessora entra junto (fecho abaixo); precisa caber na janela também
+                if j in sucessora and o in viavel[sucessora[j][0]]:
+                    if param["viavel_ocorrencia"][sucessora[j][0]][o][fim:].any():
+                        break
+                incluidas[j].append(o)
+        else:
+            # Demais: cota proporcional ao tempo decorrido (ex.: 7 por semana -> 1 por dia).
+            # A cota até fim_commit precisa começar antes de fim_commit (senão seria liberada e
+            # acumularia para a última janela); a cota até `fim` entra como antecipação.
+            # Ocorrências da cota sem início possível antes de fim_commit (ex.: jantar numa janela
+            # de meio dia) ficam para a janela seguinte.
+            feitas = n_j - len(pendentes[j])
+            obrigatorias = max(0, math.ceil(n_j * fim_commit / total_slots) - feitas)
+            antecipadas = max(0, math.ceil(n_j * fim / total_slots) - feitas)
+            incluidas[j] = [
+                o for o in pendentes[j][: max(obrigatorias, antecipadas)] if viavel[j][o].any()
+            ]
+            if j not in antecessora:
+                # Sucessoras seguem a antecessora e podem terminar na sobreposição
+                antes_do_commit.update(
+                    (j, o) for o in pendentes[j][:obrigatorias] if viavel[j][o][:fim_commit].any()
+                )
+            # Mais as que já não têm nenhum início possível depois da janela
+            for o in pendentes[j][max(obrigatorias, antecipadas):]:
+                if not param["viavel_ocorrencia"][j][o][fim:].any() and viavel[j][o].any():
+                    incluidas[j].append(o)
+
+    # Fecho pelas precedências: (j1, o) e (j2, o) entram juntas na mesma janela
+    mudou = True
+    while mudou:
+        mudou = False
+        for j1, (j2, _) in sucessora.items():
+            for a, b in ((j1, j2), (j2, j1)):
+                for o in incluidas[a]:
+                    if o in viavel[b] and o not in incluidas[b]:
+                        incluidas[b].append(o)
+                        mudou = True
+    for j, o in antes_do_commit:
+        viavel[j][o] = viavel[j][o] & (np.arange(total_slots) < fim_commit)
+    for j in tarefas:
+        incluidas[j].sort()
+        for o in incluidas[j]:
+            if not viavel[j][o].any():
+                print(f"Horizonte rolante: '{j}' (ocorrência {o}) sem início possível em [{inicio}, {fim}).")
+                return None
+
+    subproblema = dict(param)
+    subproblema["ocorrencias"] = incluidas
+    subproblema["viavel_ocorrencia"] = {j: {o: viavel[j][o] for o in incluidas[j]} for j in tarefas}
+    subproblema["mascara_inicio"] = mascara
+    subproblema["carga_fixa"] = carga_fixa
+    return subproblema
+
+def resolver_horizonte_rolante(param, janela_dias=1, sobreposicao_horas=6, time_limit=60, msg=False):
+    """
+    Resolve a instância janela a janela. Cada janela cobre `janela_dias` dias mais
+    `sobreposicao_horas` de sobreposição; só o que começa antes do fim da janela é fixado.
+    `time_limit` vale para cada janela.
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)`, com "janelas" (tempo, status e
+    objetivo de cada janela).
+    """
+    total_slots = param["total_slots"]
+    slots_por_dia = (24 * 60) // param["duracao_slot"]
+    passo = max(1, int(janela_dias * slots_por_dia))
+    sobreposicao = math.ceil(sobreposicao_horas * 60 / param["duracao_slot"])
+    # Folga no fim da janela para a sucessora de uma tarefa que começa no último slot
+    folga = max(
+        [param["duracao_tarefas"][j1] + math.ceil(dep["janela_de_espera"] / param["duracao_slot"])
+         for j1, dep in param["dependencias"].items()],
+        default=0,
+    )
+
+    fixadas = {}
+    janelas = []
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": 0.0,
+                 "tempo_resolucao": 0.0, "janelas": janelas}
+
+    inicio = 0
+    while inicio < total_slots:
+        fim_commit = min(total_slots, inicio + passo)
+        fim = min(total_slots, fim_commit + sobreposicao + folga)
+
+        t0 = time.perf_counter()
+        sub = montar_subproblema(param, fixadas, inicio, fim_commit, fim)
+        if sub is None:
+            resultado["status"] = "Infeasible"
+            return resultado
+        matrizes = modelo_highs.montar_matrizes(sub)
+        h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=msg)
+        t1 = time.perf_counter()
+        h.run()
+        t2 = time.perf_counter()
+        resultado["tempo_montagem"] += t1 - t0
+        resultado["tempo_resolucao"] += t2 - t1
+
+        status_string = modelo_highs.status_highs(h)
+        janelas.append({"inicio_slot": inicio, "fim_slot": fim_commit, "status": status_string,
+                        "variaveis": matrizes["coluna_delta"], "tempo_s": t2 - t0})
+        print(f"Janela [{inicio}, {fim_commit}) + {fim - fim_commit} slots: {status_string}, "
+              f"{matrizes['coluna_delta']} variáveis, {t2 - t0:.2f}s")
+        if status_string != "Optimal" and status_string != "Feasible":
+            resultado["status"] = status_string
+            return resultado
+
+        # Fixa o que começa antes do fim da janela (na última, tudo)
+        for idx_i, idx_j, o, t in modelo_highs.extrair_alocacoes(h, matrizes):
+            if t < fim_commit or fim_commit >= total_slots:
+                fixadas[(param["tarefas"][idx_j], o)] = (idx_i, t)
+        inicio = fim_commit
+
+    resultado["alocacoes"] = [(idx_i, param["tarefas"].index(j), o, t) for (j, o), (idx_i, t) in fixadas.items()]
+    violacoes = verificar_alocacoes(param, resultado["alocacoes"])
+    if violacoes:
+        print(f"Horizonte rolante: {len(violacoes)} violações na agenda final: {violacoes[:5]}")
+        resultado["status"] = "Infeasible"
+        return resultado
+    resultado["status"] = "Feasible"
+    resultado["objetivo"] = objetivo_alocacoes(param, resultado["alocacoes"])
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Horizonte rolante (uma janela de dias por vez).")
+    parser.add_argument("arquivo", nargs="?", default="input_semanal.json", help="JSON de entrada")
+    parser.add_argument("--janela-dias", type=float, default=1, help="dias fixados por janela")
+    parser.add_argument("--sobreposicao-horas", type=float, default=6, help="horas de sobreposição com a janela seguinte")
+    parser.add_argument("--time-limit", type=float, default=60, help="limite de tempo por janela (s)")
+    args = parser.parse_args()
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+
+    param = preparar_parametros(data)
+    print ("Alpha (α) utilizado: ", param["alpha"] )
+    resultado = resolver_horizonte_rolante(param, janela_dias=args.janela_dias,
+                                           sobreposicao_horas=args.sobreposicao_horas,
+                                           time_limit=args.time_limit)
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nO horizonte rolante NÃO ENCONTROU uma solução viável.")
+        return
+    print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+    print(f"Tempo total: montagem {resultado['tempo_montagem']:.2f}s, resolução {resultado['tempo_resolucao']:.2f}s")
+    imprimir_cronograma(formatar_solucao(param, resultado["alocacoes"]))
+
+
+if __name__ == "__main__":
+    main()
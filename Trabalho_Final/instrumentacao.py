@@ -0,0 +1,145 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+# Instrumentação opcional da execução: tempo de cada fase (leitura, pré-processamento, montagem,
+# carga no solver, resolução, extração), linhas/não-nulos/tempo de cada família de restrições e
+# progresso do HiGHS (incumbente, limitante e gap ao longo do tempo).
+#
+# Tudo fica em um dicionário "registro" criado por `novo_registro()` e passado adiante pelas funções
+# de resolução. Com registro None (padrão) as funções daqui não fazem nada, então o custo da
+# instrumentação desligada é uma comparação por fase.
+
+def novo_registro(**contexto):
+    """
+    Cria um registro vazio; `contexto` (ex.: arquivo, backend) vai junto no log.
+    """
+    return {
+        "contexto": contexto,
+        "inicio": time.perf_counter(),
+        "fases": [],
+        "familias": [],
+        "progresso": [],
+        "modelo": {},
+        "resultado": {},
+    }
+
+@contextmanager
+def fase(registro, nome):
+    """
+    Mede o bloco `with` como a fase `nome` (nada é feito se `registro` for None).
+    """
+    if registro is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        registro["fases"].append({"fase": nome, "inicio_s": inicio - registro["inicio"],
+                                  "duracao_s": time.perf_counter() - inicio})
+
+def cronometrar(registro, nome, funcao):
+    """
+    Retorna `funcao` envolvida na fase `nome` (ou a própria `funcao`, sem registro).
+    Útil para medir etapas internas de outra biblioteca, ex.: os passos do solver HiGHS do PuLP.
+    """
+    if registro is None:
+        return funcao
+
+    def envolvida(*args, **kwargs):
+        with fase(registro, nome):
+            return funcao(*args, **kwargs)
+    return envolvida
+
+def registrar_familias(registro, familias):
+    """
+    Guarda as famílias de restrições [(nome, linhas, não-nulos, segundos), ...] e os totais do modelo.
+    """
+    if registro is None:
+        return
+    registro["familias"] = [{"familia": nome, "linhas": linhas, "nao_nulos": nao_nulos, "montagem_s": segundos}
+                            for nome, linhas, nao_nulos, segundos in familias]
+    registro["modelo"]["linhas"] = sum(linhas for _, linhas, _, _ in familias)
+    registro["modelo"]["nao_nulos"] = sum(nao_nulos for _, _, nao_nulos, _ in familias)
+
+def callback_progresso(registro):
+    """
+    Callback para `Highs.setCallback(...)`: guarda um ponto (tempo, incumbente, limitante, gap)
+    sempre que o incumbente ou o limitante do branch-and-bound mudam.
+    """
+    import highspy
+    solucao_melhorada = highspy.cb.HighsCallbackType.kCallbackMipImprovingSolution
+    progresso = registro["progresso"]
+    ultimo = [None]
+
+    def callback(tipo, mensagem, saida, entrada, dados_usuario):
+        incumbente, limitante = saida.mip_primal_bound, saida.mip_dual_bound
+        # Compara arredondado: o limitante oscila na última casa decimal sem mudar de fato
+        chave = (round(incumbente, 9), round(limitante, 9))
+        if chave == ultimo[0]:
+            return
+        ultimo[0] = chave
+        progresso.append({
+            "tempo_s": saida.running_time,
+            "incumbente": incumbente if abs(incumbente) < float("inf") else None,
+            "limitante": limitante if abs(limitante) < float("inf") else None,
+            "gap": saida.mip_gap if saida.mip_gap < float("inf") else None,
+            "nova_solucao": tipo == solucao_melhorada,
+        })
+    return callback
+
+def callbacks_progresso():
+    """
+    Tipos de callback do HiGHS usados por `callback_progresso` (interrupção periódica do MIP e nova solução).
+    """
+    import highspy
+    return [highspy.cb.HighsCallbackType.kCallbackMipInterrupt,
+            highspy.cb.HighsCallbackType.kCallbackMipImprovingSolution]
+
+def acompanhar_highs(registro, h):
+    """
+    Liga o registro de progresso em uma instância highspy.Highs (nada sem registro).
+    """
+    if registro is None:
+        return
+    h.setCallback(callback_progresso(registro), None)
+    for tipo in callbacks_progresso():
+        h.startCallback(tipo)
+
+def salvar_log(registro, caminho_arquivo):
+    """
+    Grava o registro em JSON (tempos em segundos, relativos ao início do registro).
+    """
+    log = {chave: valor for chave, valor in registro.items() if chave != "inicio"}
+    log["total_s"] = time.perf_counter() - registro["inicio"]
+    with open(caminho_arquivo, "w", encoding="utf-8") as f:
+        json.dump(log, f, ensure_ascii=False, indent=2, default=float)
+    print(f"Log de instrumentação salvo em '{caminho_arquivo}'.")
+
+def imprimir_resumo(registro, pontos_progresso=8):
+    """
+    Resumo em uma tela: fases, famílias de restrições e os últimos pontos do progresso do solver.
+    """
+    from tabulate import tabulate
+    total = time.perf_counter() - registro["inicio"]
+    print("\n=== Fases ===")
+    print(tabulate([[f["fase"], f["duracao_s"], 100 * f["duracao_s"] / max(total, 1e-9)] for f in registro["fases"]],
+                   headers=["fase", "tempo (s)", "% do total"], tablefmt="psql", floatfmt=".3f"))
+    print(f"Total: {total:.3f} s")
+
+    if registro["familias"]:
+        print("\n=== Famílias de restrições ===")
+        print(tabulate([[f["familia"], f["linhas"], f["nao_nulos"], f["montagem_s"]] for f in registro["familias"]],
+                       headers=["família", "linhas", "não-nulos", "montagem (s)"], tablefmt="psql", floatfmt=".3f"))
+    if registro["modelo"]:
+        print("Modelo: " + ", ".join(f"{chave} = {valor}" for chave, valor in registro["modelo"].items()))
+
+    if registro["progresso"]:
+        print(f"\n=== Progresso do solver ({len(registro['progresso'])} pontos, últimos {pontos_progresso}) ===")
+        print(tabulate([[p["tempo_s"], p["incumbente"], p["limitante"],
+                         None if p["gap"] is None else 100 * p["gap"]] for p in registro["progresso"][-pontos_progresso:]],
+                       headers=["tempo (s)", "incumbente", "limitante", "gap (%)"], tablefmt="psql", floatfmt=".4g"))
+    if registro["resultado"]:
+        print("Resultado: " + ", ".join(f"{chave} = {valor}" for chave, valor in registro["resultado"].items()))
@@ -0,0 +1,311 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+import preprocessamento as pp
+from model import preparar_parametros, imprimir_cronograma, formatar_solucao, exportar_solucao
+import modelo_highs
+from heuristica import resolver_heuristica, completar_agenda, objetivo_alocacoes, verificar_alocacoes
+from horizonte_rolante import montar_subproblema, resolver_horizonte_rolante
+
+
+# Busca em vizinhança grande adaptativa (ALNS) para horizontes em que o MILP não fecha o gap.
+# Parte de uma agenda viável (heurística construtiva; horizonte rolante se ela falhar) e repete:
+#   1. destruição: sorteia uma ocorrência e libera o dia, a pessoa ou a família de tarefas dela
+#      (unidades grandes saem com mais frequência); depois de `ESTAGNACAO` vizinhanças sem novo
+#      melhor, junta até `GRAU_MAXIMO` unidades na mesma vizinhança;
+#   2. reparo: reinsere as ocorrências liberadas com o resto fixado, por um sub-MILP pequeno
+#      (`montar_subproblema` + HiGHS, partindo da agenda atual) ou por inserção gulosa
+#      (`heuristica.completar_agenda`);
+#   3. aceitação: a nova agenda é aceita se não piora o objetivo de `model.py`
+#      (falta de aptidão + α · Δ, calculado por `objetivo_alocacoes`).
+# Cada par (destruição, reparo) é sorteado com probabilidade proporcional a um peso que aumenta
+# quando o par encontra agendas melhores. Com `processos` > 1 várias vizinhanças são reparadas ao
+# mesmo tempo, cada uma em um processo; cada reparo devolve uma agenda completa, então o resultado
+# de uma vizinhança sorteada a partir de uma agenda anterior continua valendo por si só.
+
+DESTRUICOES = ("dia", "pessoa", "familia")
+REPAROS = ("milp", "guloso")
+# Pontos de cada resultado no peso do operador: novo melhor, melhora a atual, aceita sem melhorar, rejeitada
+PONTOS = {"melhor": 3.0, "melhora": 2.0, "aceita": 0.5, "rejeitada": 0.0}
+# Fração do peso substituída pelos pontos a cada uso, e peso mínimo (nenhum operador deixa de ser sorteado)
+REACAO = 0.2
+PESO_MINIMO = 0.1
+# Vizinhanças seguidas sem novo melhor antes de juntar mais uma unidade na destruição
+ESTAGNACAO = 10
+GRAU_MAXIMO = 3
+TOLERANCIA = 1e-9
+
+def familias_tarefas(param):
+    """
+    Famílias de tarefas: tarefas ligadas por precedência ficam juntas (ex.: amamentar e arrotar) e
+    as tarefas periódicas formam uma família só (as cadeias dividem o tempo do bebê e uma não se
+    desloca sem as outras); as demais formam uma família cada. Retorna uma lista de listas de tarefas.
+    """
+    grupo = {j: [j] for j in param["tarefas"]}
+    periodicas = [j for j in param["tarefas"] if j in param["periodicidade"]]
+    ligacoes = [(j1, dep["proxima_tarefa"]) for j1, dep in param["dependencias"].items()]
+    ligacoes += list(zip(periodicas, periodicas[1:]))
+    for j1, j2 in ligacoes:
+        if grupo[j1] is not grupo[j2]:
+            unido = grupo[j1] + grupo[j2]
+            for j in unido:
+                grupo[j] = unido
+    familias = []
+    for j in param["tarefas"]:
+        if grupo[j] not in familias:
+            familias.append(grupo[j])
+    return familias
+
+def destruir(param, alocacoes, destruicao, alvo):
+    """
+    Ocorrências liberadas por um operador de destruição:
+      - "dia": as que começam no dia `alvo` (0 = primeiro dia);
+      - "pessoa": as alocadas à pessoa de índice `alvo`;
+      - "familia": todas as ocorrências das tarefas da lista `alvo` (ver `familias_tarefas`).
+    Ocorrências ligadas por precedência (j1, o) -> (j2, o) são liberadas juntas.
+    Numa cadeia periódica com alguma ocorrência ainda fixada os inícios não mudam (só a pessoa);
+    a cadeia só se desloca quando é liberada inteira (destruição por família).
+    Retorna o conjunto {(j, o)}.
+    """
+    tarefas = param["tarefas"]
+    slots_por_dia = (24 * 60) // param["duracao_slot"]
+    livres = set()
+    for idx_i, idx_j, o, t in alocacoes:
+        j = tarefas[idx_j]
+        if ((destruicao == "dia" and t // slots_por_dia == alvo)
+                or (destruicao == "pessoa" and idx_i == alvo)
+                or (destruicao == "familia" and j in alvo)):
+            livres.add((j, o))
+    for j1, dep in param["dependencias"].items():
+        j2 = dep["proxima_tarefa"]
+        for o in param["ocorrencias"][j1]:
+            if o in param["ocorrencias"][j2] and ((j1, o) in livres or (j2, o) in livres):
+                livres.update(((j1, o), (j2, o)))
+    return livres
+
+def reparar(param, alocacoes, livres, reparo="milp", time_limit=10):
+    """
+    Reinsere as ocorrências `livres` com as demais alocações fixadas.
+      - "milp": subproblema com só as ocorrências livres (`montar_subproblema`), resolvido pelo HiGHS
+        partindo das posições atuais (o resultado nunca é pior que a agenda recebida);
+      - "guloso": inserção pela heurística construtiva (`completar_agenda`).
+    Retorna a nova lista completa de alocações (idx_i, idx_j, o, t) ou None se o reparo falhar.
+    """
+    tarefas = param["tarefas"]
+    fixadas = {(tarefas[idx_j], o): (idx_i, t) for idx_i, idx_j, o, t in alocacoes if (tarefas[idx_j], o) not in livres}
+    if reparo == "guloso":
+        return completar_agenda(param, fixadas)
+
+    sub = montar_subproblema(param, fixadas, 0, param["total_slots"], param["total_slots"])
+    if sub is None:
+        return None
+    matrizes = modelo_highs.montar_matrizes(sub)
+    h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=False)
+    # Subproblemas pequenos com solução inicial completa: o presolve custa mais do que economiza
+    h.setOptionValue("presolve", "off")
+    coluna = modelo_highs.indice_colunas(matrizes)
+    colunas_iniciais = [coluna[a] for a in alocacoes if (tarefas[a[1]], a[2]) in livres and a in coluna]
+    if colunas_iniciais:
+        modelo_highs.definir_solucao_parcial(h, colunas_iniciais, np.ones(len(colunas_iniciais)))
+    h.run()
+    status_string = modelo_highs.status_highs(h)
+    if status_string != "Optimal" and status_string != "Feasible":
+        return None
+    return ([(idx_i, tarefas.index(j), o, t) for (j, o), (idx_i, t) in fixadas.items()]
+            + modelo_highs.extrair_alocacoes(h, matrizes))
+
+# ====================================================================
+# Execução em paralelo: cada processo recebe os parâmetros uma vez
+# ====================================================================
+
+_param_processo = None
+
+def _iniciar_processo(param):
+    """
+    (Função interna) Inicializador dos processos: guarda os parâmetros da instância.
+    """
+    global _param_processo
+    _param_processo = param
+
+def _reparar_em_processo(alocacoes, livres, reparo, time_limit):
+    """
+    (Função interna) Reparo de uma vizinhança dentro de um processo; devolve (alocações, objetivo).
+    """
+    novas = reparar(_param_processo, alocacoes, livres, reparo=reparo, time_limit=time_limit)
+    return novas, None if novas is None else objetivo_alocacoes(_param_processo, novas)
+
+# ====================================================================
+# Laço principal
+# ====================================================================
+
+def _sortear_vizinhanca(param, alocacoes, pesos, familias, grau, rng):
+    """
+    (Função interna) Sorteia um par (destruição, reparo) pelos pesos e `grau` unidades a destruir:
+    a primeira com a destruição do par, as demais com uma destruição qualquer. Cada unidade é o dia,
+    a pessoa ou a família de uma ocorrência sorteada.
+    Retorna (operador, ocorrências livres, reparo).
+    """
+    pares = list(pesos)
+    probabilidades = np.array([pesos[par] for par in pares])
+    destruicao, reparo = pares[rng.choice(len(pares), p=probabilidades / probabilidades.sum())]
+    destruicoes = sorted({d for d, _ in pares})
+    slots_por_dia = (24 * 60) // param["duracao_slot"]
+    livres, descricoes = set(), []
+    for k in range(grau):
+        tipo = destruicao if k == 0 else destruicoes[rng.integers(len(destruicoes))]
+        idx_i, idx_j, _, t = alocacoes[rng.integers(len(alocacoes))]
+        if tipo == "dia":
+            alvo, descricao = t // slots_por_dia, f"dia {t // slots_por_dia + 1}"
+        elif tipo == "pessoa":
+            alvo, descricao = idx_i, param["pessoas"][idx_i]
+        else:
+            alvo = next(f for f in familias if param["tarefas"][idx_j] in f)
+            descricao = "+".join(alvo)
+        livres |= destruir(param, alocacoes, tipo, alvo)
+        descricoes.append(descricao)
+    return (destruicao, reparo, ",".join(dict.fromkeys(descricoes))), livres, reparo
+
+def resolver_lns(param, tempo_limite=60, processos=1, tempo_reparo=10, alocacoes_iniciais=None,
+                 destruicoes=DESTRUICOES, reparos=REPAROS, semente=0):
+    """
+    Executa a ALNS por `tempo_limite` segundos (relógio de parede, incluindo a agenda inicial).
+      - processos: vizinhanças reparadas ao mesmo tempo (1 = tudo no processo atual);
+      - tempo_reparo: limite de tempo de cada sub-MILP (s);
+      - alocacoes_iniciais: agenda inicial (padrão: heurística construtiva).
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)` com "trajetoria" (uma linha por
+    vizinhança avaliada: tempo, operador com as unidades destruídas, objetivo candidato, atual e melhor), "iteracoes",
+    "objetivo_inicial" e "pesos" finais de cada par (destruição, reparo).
+    """
+    inicio = time.perf_counter()
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": 0.0,
+                 "tempo_resolucao": 0.0, "trajetoria": [], "iteracoes": 0}
+    if alocacoes_iniciais is None:
+        inicial = resolver_heuristica(param)
+        if inicial["objetivo"] is None:
+            inicial = resolver_horizonte_rolante(param, time_limit=tempo_reparo)
+        if inicial["objetivo"] is None:
+            print("LNS: não foi possível obter uma agenda inicial viável.")
+            return resultado
+        alocacoes_iniciais = inicial["alocacoes"]
+
+    rng = np.random.default_rng(semente)
+    familias = familias_tarefas(param)
+    pesos = {(d, r): 1.0 for d in destruicoes for r in reparos}
+    atual = melhor = list(alocacoes_iniciais)
+    grau, sem_melhora = 1, 0
+    objetivo_atual = objetivo_melhor = objetivo_alocacoes(param, atual)
+    trajetoria = resultado["trajetoria"]
+    trajetoria.append({"tempo_s": time.perf_counter() - inicio, "iteracao": 0, "operador": "inicial",
+                       "candidato": objetivo_atual, "atual": objetivo_atual, "melhor": objetivo_melhor,
+                       "resultado": "melhor"})
+    resultado["objetivo_inicial"] = objetivo_atual
+
+    def avaliar(operador, novas, objetivo):
+        nonlocal atual, melhor, objetivo_atual, objetivo_melhor, grau, sem_melhora
+        veredito = "rejeitada"
+        if novas is not None and objetivo <= objetivo_atual + TOLERANCIA:
+            violacoes = verificar_alocacoes(param, novas)
+            if violacoes:
+                print(f"LNS: reparo {operador} gerou {len(violacoes)} violações: {violacoes[:3]}")
+            else:
+                veredito = ("melhor" if objetivo < objetivo_melhor - TOLERANCIA
+                            else "melhora" if objetivo < objetivo_atual - TOLERANCIA else "aceita")
+                atual, objetivo_atual = novas, objetivo
+                if veredito == "melhor":
+                    melhor, objetivo_melhor = novas, objetivo
+        par = operador[:2]
+        # Sem novo melhor por muito tempo: vizinhanças maiores; com novo melhor, volta a uma unidade
+        sem_melhora = 0 if veredito == "melhor" else sem_melhora + 1
+        if veredito == "melhor":
+            grau = 1
+        elif sem_melhora % ESTAGNACAO == 0:
+            grau = min(GRAU_MAXIMO, grau + 1)
+        pesos[par] = max(PESO_MINIMO, (1 - REACAO) * pesos[par] + REACAO * PONTOS[veredito])
+        resultado["iteracoes"] += 1
+        trajetoria.append({"tempo_s": time.perf_counter() - inicio, "iteracao": resultado["iteracoes"],
+                           "operador": "/".join(operador), "candidato": objetivo, "atual": objetivo_atual,
+                           "melhor": objetivo_melhor, "resultado": veredito})
+        if veredito == "melhor":
+            print(f"[{trajetoria[-1]['tempo_s']:.1f}s] LNS: novo melhor {objetivo_melhor:.4f} ({'/'.join(operador)})")
+
+    def restante():
+        return tempo_limite - (time.perf_counter() - inicio)
+
+    if processos <= 1:
+        while restante() > 0:
+            operador, livres, reparo = _sortear_vizinhanca(param, atual, pesos, familias, grau, rng)
+            novas = reparar(param, atual, livres, reparo=reparo, time_limit=min(tempo_reparo, max(restante(), 0.1)))
+            avaliar(operador, novas, None if novas is None else objetivo_alocacoes(param, novas))
+    else:
+        executor = ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo, initargs=(param,))
+        pendentes = {}
+        try:
+            while restante() > 0:
+                while len(pendentes) < processos:
+                    operador, livres, reparo = _sortear_vizinhanca(param, atual, pesos, familias, grau, rng)
+                    futuro = executor.submit(_reparar_em_processo, atual, livres, reparo,
+                                             min(tempo_reparo, max(restante(), 0.1)))
+                    pendentes[futuro] = operador
+                prontos, _ = wait(pendentes, timeout=max(restante(), 0), return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    avaliar(pendentes.pop(futuro), *futuro.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    resultado["status"] = "Feasible"
+    resultado["objetivo"] = objetivo_melhor
+    resultado["alocacoes"] = melhor
+    resultado["tempo_resolucao"] = time.perf_counter() - inicio
+    resultado["pesos"] = {"/".join(par): peso for par, peso in pesos.items()}
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca em vizinhança grande (ALNS) com limite de tempo.")
+    parser.add_argument("arquivo", nargs="?", default="input_semanal.json", help="JSON de entrada")
+    parser.add_argument("--tempo", type=float, default=60, help="tempo total (s, relógio de parede)")
+    parser.add_argument("--processos", type=int, default=1, help="vizinhanças reparadas em paralelo")
+    parser.add_argument("--tempo-reparo", type=float, default=10, help="limite de tempo de cada sub-MILP (s)")
+    parser.add_argument("--destruicoes", nargs="+", choices=DESTRUICOES, default=list(DESTRUICOES))
+    parser.add_argument("--reparos", nargs="+", choices=REPAROS, default=list(REPAROS))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--trajetoria", metavar="ARQUIVO", help="grava a trajetória do objetivo em CSV")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="grava a melhor agenda (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true", help="não imprime o cronograma no terminal")
+    args = parser.parse_args()
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+
+    param = preparar_parametros(data)
+    resultado = resolver_lns(param, tempo_limite=args.tempo, processos=args.processos, tempo_reparo=args.tempo_reparo,
+                             destruicoes=args.destruicoes, reparos=args.reparos, semente=args.semente)
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nA LNS NÃO ENCONTROU uma agenda viável.")
+        return
+
+    trajetoria = pd.DataFrame(resultado["trajetoria"])
+    melhorias = trajetoria[trajetoria["resultado"] == "melhor"]
+    print(tabulate(melhorias[["tempo_s", "iteracao", "operador", "melhor"]], headers="keys", tablefmt="psql",
+                   showindex=False, floatfmt=".4f"))
+    print(f"Vizinhanças avaliadas: {resultado['iteracoes']} "
+          f"({(trajetoria['resultado'] != 'rejeitada').sum() - 1} aceitas) em {resultado['tempo_resolucao']:.1f}s")
+    print("Pesos finais: " + ", ".join(f"{par} = {peso:.2f}" for par, peso in resultado["pesos"].items()))
+    print(f"Valor da Função Objetivo: {resultado['objetivo_inicial']:.4f} (inicial) -> {resultado['objetivo']:.4f}")
+    if args.trajetoria:
+        trajetoria.to_csv(args.trajetoria, index=False)
+        print(f"Trajetória salva em '{args.trajetoria}'.")
+    if not args.sem_cronograma:
+        imprimir_cronograma(formatar_solucao(param, resultado["alocacoes"]))
+    if args.exportar:
+        exportar_solucao(param, resultado, args.exportar)
+
+
+if __name__ == "__main__":
+    main()
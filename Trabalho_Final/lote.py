@@ -0,0 +1,215 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# Resolução em lote: muitas entradas (famílias diferentes ou variações "e se" da mesma entrada)
+# resolvidas num pool de processos. Cada processo importa o modelo uma vez e resolve várias tarefas,
+# em vez de um interpretador novo (com numpy, pulp, pandas...) por execução de `model.py`.
+#
+# A origem é uma pasta (uma tarefa por .json) ou um manifesto JSON: lista de caminhos ou de
+# dicionários com "arquivo" e, opcionalmente, "nome", "alteracoes" (chaves do JSON de entrada
+# substituídas, ex.: {"alpha": 0.5}), "tempo" e as opções de `model.resolver_parametros`
+# ("backend", "simetria", "balanceamento", "sobreposicao", "rapido", "mip_start").
+#
+# Cada tarefa tem um orçamento de tempo, contado desde a leitura: cada chamada ao solver recebe o que
+# sobra até o fim dele (`model.limite_ate_prazo`). O número de threads do solver é limitado em cada processo
+# (padrão: núcleos / processos) para os processos não disputarem os mesmos núcleos.
+# O resumo de cada tarefa é gravado em JSON Lines assim que ela termina.
+
+OPCOES_TAREFA = ("backend", "simetria", "balanceamento", "sobreposicao", "rapido", "mip_start")
+
+def ler_tarefas(origem):
+    """
+    Lê as tarefas de uma pasta (todos os .json, em ordem alfabética) ou de um manifesto JSON
+    (caminhos relativos à pasta do manifesto). Nomes repetidos ganham sufixo (_2, _3, ...).
+    Retorna a lista de tarefas (dicionários com pelo menos "nome" e "arquivo"), ou None se a origem for inválida.
+    """
+    if os.path.isdir(origem):
+        entradas = [os.path.join(origem, nome) for nome in sorted(os.listdir(origem)) if nome.endswith(".json")]
+        base = origem
+    else:
+        try:
+            with open(origem, "r", encoding="utf-8") as f:
+                entradas = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            print(f"Erro: não foi possível ler o manifesto '{origem}' ({e}).")
+            return None
+        if not isinstance(entradas, list):
+            print(f"Erro: o manifesto '{origem}' deve ser uma lista de arquivos ou de tarefas.")
+            return None
+        base = os.path.dirname(origem)
+
+    tarefas = []
+    vistos = {}
+    for entrada in entradas:
+        tarefa = {"arquivo": entrada} if isinstance(entrada, str) else dict(entrada)
+        if "arquivo" not in tarefa:
+            print(f"Erro: tarefa sem 'arquivo' no manifesto: {entrada}")
+            return None
+        if not os.path.isabs(tarefa["arquivo"]) and not os.path.isdir(origem):
+            tarefa["arquivo"] = os.path.join(base, tarefa["arquivo"])
+        nome = tarefa.get("nome") or os.path.splitext(os.path.basename(tarefa["arquivo"]))[0]
+        vistos[nome] = vistos.get(nome, 0) + 1
+        tarefa["nome"] = nome if vistos[nome] == 1 else f"{nome}_{vistos[nome]}"
+        tarefas.append(tarefa)
+    return tarefas
+
+def _iniciar_processo(threads):
+    """
+    (Função interna) Inicialização de cada processo do pool: bibliotecas numéricas (OpenMP/BLAS)
+    também ficam limitadas a `threads`. Roda antes de o processo importar numpy.
+    """
+    for variavel in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[variavel] = str(threads)
+
+def resolver_tarefa(tarefa, threads=None, diretorio_saida=None):
+    """
+    Resolve uma tarefa do lote no processo atual: lê o JSON, aplica "alteracoes", pré-processa,
+    roda o diagnóstico e resolve até o fim do orçamento ("tempo", em segundos, contado desde a leitura).
+    A saída impressa pelo modelo é descartada (ou guardada em "mensagens" quando não há solução).
+    Com `diretorio_saida`, a agenda é exportada em `<diretorio_saida>/<nome>.json`.
+    Retorna um resumo serializável em JSON (nome, status, objetivo, gap, tempos, ...).
+    """
+    inicio = time.perf_counter()
+    resumo = {"nome": tarefa["nome"], "arquivo": tarefa["arquivo"], "status": None, "objetivo": None, "gap": None}
+    saida = io.StringIO()
+    with contextlib.redirect_stdout(saida):
+        import preprocessamento as pp
+        import diagnostico
+        from model import preparar_parametros, resolver_parametros, exportar_solucao
+
+        try:
+            with open(tarefa["arquivo"], "r", encoding="utf-8") as f:
+                dados = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            dados = None
+            print(f"Erro: não foi possível ler '{tarefa['arquivo']}' ({e}).")
+        if dados is not None and not isinstance(dados, dict):
+            # Ex.: um manifesto ou arquivo de resultados salvo na pasta do lote
+            print(f"Erro: '{tarefa['arquivo']}' não é uma entrada do modelo (o JSON deve ser um objeto).")
+            dados = None
+        if dados is not None:
+            dados.update(tarefa.get("alteracoes", {}))
+            data = pp.processar_dados(dados)
+        if dados is None or data is None:
+            resumo["status"] = "Erro de entrada"
+        else:
+            param = preparar_parametros(data)
+            problemas = diagnostico.diagnosticar(param)
+            if problemas:
+                resumo["status"] = "Infeasible"
+                resumo["problemas"] = [f"[{p['verificacao']}] {p['alvo']}: {p['mensagem']}" for p in problemas]
+            else:
+                # O limite de cada chamada ao solver é recalculado logo antes dela (depois da montagem,
+                # da heurística do mip_start e de cada rodada da geração preguiçosa)
+                tempo = tarefa.get("tempo", 60)
+                opcoes = {chave: tarefa[chave] for chave in OPCOES_TAREFA if chave in tarefa}
+                resultado = resolver_parametros(param, time_limit=tempo, msg=False, threads=threads,
+                                                prazo=inicio + tempo, **opcoes)
+                for chave in ("status", "objetivo", "gap", "tempo_montagem", "tempo_resolucao"):
+                    resumo[chave] = resultado.get(chave)
+                if diretorio_saida and resultado["objetivo"] is not None:
+                    resumo["saida"] = exportar_solucao(param, resultado,
+                                                       os.path.join(diretorio_saida, f"{tarefa['nome']}.json"))[0]
+    if resumo["objetivo"] is None:
+        resumo["mensagens"] = saida.getvalue().splitlines()[-10:]
+    resumo["tempo_total"] = time.perf_counter() - inicio
+    return resumo
+
+def _ja_resolvidas(arquivo_resultados):
+    """
+    (Função interna) Nomes das tarefas já gravadas em `arquivo_resultados` (para retomar um lote).
+    """
+    if not os.path.exists(arquivo_resultados):
+        return set()
+    nomes = set()
+    with open(arquivo_resultados, "r", encoding="utf-8") as f:
+        for linha in f:
+            try:
+                nomes.add(json.loads(linha)["nome"])
+            except (json.JSONDecodeError, KeyError):
+                continue # linha cortada por uma execução interrompida
+    return nomes
+
+def executar_lote(tarefas, arquivo_resultados, processos=None, tempo=60, threads=None, diretorio_saida=None,
+                  retomar=False, **opcoes):
+    """
+    Resolve as tarefas em `processos` processos (padrão: um por núcleo), cada uma com orçamento de
+    `tempo` segundos e no máximo `threads` threads no solver (padrão: núcleos / processos).
+    `opcoes` (ver `OPCOES_TAREFA`) valem para todas as tarefas que não as definem no manifesto.
+    Cada resumo é acrescentado a `arquivo_resultados` (JSON Lines) assim que a tarefa termina;
+    com `retomar`, as tarefas que já estão no arquivo são puladas.
+    Retorna a lista de resumos desta execução, na ordem em que terminaram.
+    """
+    nucleos = os.cpu_count() or 1
+    processos = processos or nucleos
+    threads = threads or max(1, nucleos // processos)
+    if retomar:
+        feitas = _ja_resolvidas(arquivo_resultados)
+        if feitas:
+            print(f"Retomando: {len(feitas)} tarefa(s) já em '{arquivo_resultados}'.")
+        tarefas = [t for t in tarefas if t["nome"] not in feitas]
+    if diretorio_saida:
+        os.makedirs(diretorio_saida, exist_ok=True)
+
+    print(f"Lote: {len(tarefas)} tarefa(s), {processos} processo(s), {threads} thread(s) por solver, "
+          f"{tempo:g} s por tarefa.")
+    resumos = []
+    with open(arquivo_resultados, "a" if retomar else "w", encoding="utf-8") as f, \
+            ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo, initargs=(threads,)) as pool:
+        futuros = {pool.submit(resolver_tarefa, {**opcoes, "tempo": tempo, **tarefa}, threads, diretorio_saida): tarefa
+                   for tarefa in tarefas}
+        for futuro in as_completed(futuros):
+            tarefa = futuros[futuro]
+            try:
+                resumo = futuro.result()
+            except Exception as e: # erro inesperado não derruba o lote
+                resumo = {"nome": tarefa["nome"], "arquivo": tarefa["arquivo"], "status": "Erro",
+                          "objetivo": None, "erro": f"{type(e).__name__}: {e}"}
+            f.write(json.dumps(resumo, ensure_ascii=False) + "\n")
+            f.flush()
+            resumos.append(resumo)
+            objetivo = "-" if resumo["objetivo"] is None else f"{resumo['objetivo']:.4f}"
+            print(f"[{len(resumos)}/{len(tarefas)}] {resumo['nome']}: {resumo['status']}, objetivo {objetivo}, "
+                  f"{resumo.get('tempo_total', 0):.2f}s")
+    return resumos
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve muitas entradas em paralelo (pool de processos).")
+    parser.add_argument("origem", help="pasta com os JSON de entrada ou manifesto JSON (lista de tarefas)")
+    parser.add_argument("--resultados", default="resultados_lote.jsonl",
+                        help="arquivo JSON Lines com o resumo de cada tarefa (gravado à medida que terminam)")
+    parser.add_argument("--processos", type=int, help="processos em paralelo (padrão: número de núcleos)")
+    parser.add_argument("--tempo", type=float, default=60, help="orçamento de tempo de cada tarefa (s)")
+    parser.add_argument("--threads", type=int, help="threads do solver por tarefa (padrão: núcleos / processos)")
+    parser.add_argument("--backend", choices=("pulp", "highs"), default="highs",
+                        help="backend do modelo (padrão highs: matrizes direto no highspy)")
+    parser.add_argument("--rapido", action="store_true", help="só a heurística construtiva, sem MILP")
+    parser.add_argument("--mip-start", action="store_true", help="heurística como solução inicial (backend highs)")
+    parser.add_argument("--exportar", metavar="PASTA", help="grava a agenda de cada tarefa em PASTA/<nome>.json")
+    parser.add_argument("--retomar", action="store_true",
+                        help="pula as tarefas que já estão no arquivo de resultados e acrescenta as demais")
+    args = parser.parse_args()
+
+    tarefas = ler_tarefas(args.origem)
+    if tarefas is None:
+        exit()
+    if not tarefas:
+        print(f"Nenhuma entrada .json em '{args.origem}'.")
+        return
+    inicio = time.perf_counter()
+    resumos = executar_lote(tarefas, args.resultados, processos=args.processos, tempo=args.tempo,
+                            threads=args.threads, diretorio_saida=args.exportar, retomar=args.retomar,
+                            backend=args.backend, rapido=args.rapido, mip_start=args.mip_start)
+    resolvidas = sum(r["objetivo"] is not None for r in resumos)
+    print(f"\n{resolvidas}/{len(resumos)} tarefa(s) com solução em {time.perf_counter() - inicio:.1f}s; "
+          f"resumos em '{args.resultados}'.")
+
+
+if __name__ == "__main__":
+    main()
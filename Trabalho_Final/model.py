@@ -1,339 +1,809 @@
+import argparse
 import json
-import pulp
-import pandas as pd
+import os
 import math
 import itertools
-from tabulate import tabulate
+import time
+import numpy as np
 import preprocessamento as pp
+import instrumentacao
 
 
 # Script principal para montar e resolver o modelo de alocação de tarefas.
 # Este arquivo monta um modelo MILP (pulp) a partir do JSON processado
 # por `carregar_dados(...)` e aplica as restrições
-# Foram utilizados 2 solvers diferentes: HiGHS e CBC 
+# Foram utilizados 2 solvers diferentes: HiGHS e CBC
 # Esta ativo o HiGHS por ter tido melhor desempenho nas resoluções.
+#
+# Há dois backends para a mesma formulação:
+#   - "pulp":  monta o modelo com LpVariable/lpSum e resolve com HiGHS via PuLP;
+#   - "highs": monta as matrizes diretamente (modelo_highs.py) e passa ao highspy em memória.
+# pulp, pandas e tabulate são importados só nas funções que os usam: importar este módulo
+# (ex.: nos processos de `lote.py`) não paga a carga deles quando não são necessários.
+
+ARQUIVO_PADRAO = "input_semanal_1dia.json"
+BACKENDS = ("pulp", "highs")
+SIMETRIAS = ("nenhuma", "ordenar", "agregar")
+# Formulações de 4.9: "extremos" (U_max/U_min, 2 restrições por pessoa) ou "pares" (2 por par)
+BALANCEAMENTOS = ("extremos", "pares")
+# Linhas de 4.2/4.3: todas desde o início ou só as violadas pelo incumbente, rodada a rodada (backend highs)
+SOBREPOSICOES = ("completa", "preguicosa")
 
 # ==============================
 # 1. Leitura e Pré-processamento
 # ==============================
 
-# Carrega e processa o JSON com funções utilitárias (converte janelas e disponibilidades
-# em vetores binários, calcula slots, etc.). O dicionário retornado contém tanto os dados
-# originais quanto as chaves auxiliares `disponibilidade_pessoas_binaria` e `disponibilidade_tarefas_binaria`.
-data = pp.carregar_dados("input_semanal_1dia.json")
-
-if data is None:
-    print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
-    exit()
-
-pessoas = data["pessoas"] # conjunto de pessoas
-tarefas = list(data["tarefas"].keys()) # conjunto de tarefas
-duracao_slot = data["slot_duracao_min"] # duração do slot em minutos
-total_slots = data["dias"]*24*(60//duracao_slot) # número total de slots
-disponibilidade_tarefas = data.get("disponibilidade_tarefas_binaria") # TA_{j,t}
-alpha = data.get("alpha", 0) # Valor padrão 0 se não estiver definido
-tarefas_bebe = [j for j, task_data in data["tarefas"].items() if task_data.get("tipo") == "bebe"] # Tarefas do bebê (conjunto D_b)
-duracao_tarefas = {
-    j: math.ceil(data["tarefas"][j]["duracao"] / duracao_slot) 
-    for j in tarefas
-} # d_j (duração em slots)
-ocorrencias = {j: range(data["tarefas"][j]["ocorrencias"]) for j in tarefas}
-disponibilidade_pessoas = data["disponibilidade_pessoas_binaria"]
-capacidade = data["aptidao"] # c_{i,j}
-dependencias =  data["dependencias"] # dependências entre tarefas
-limite_carga_horas = data.get("limite_carga_horas", {})
-if duracao_slot > 0:
-    limite_carga = {i: int((limite_em_horas * 60) / duracao_slot) 
-                    for i, limite_em_horas in limite_carga_horas.items()}
-else:
-    limite_carga = {}
-    print("Aviso: 'slot_duracao_min' é 0. O Limite de Carga não será aplicado.")
+def _sincronizar_cadeia(viavel_por_ocorrencia, P_j_slots):
+    """
+    (Função interna) Em uma tarefa periódica, o início da ocorrência o em t fixa todas as outras
+    em t + (k - o) * P_j. Mantém em cada ocorrência só os inícios cuja cadeia inteira é viável.
+    """
+    ocorrencias = list(viavel_por_ocorrencia)
+    total_slots = len(viavel_por_ocorrencia[ocorrencias[0]]) if ocorrencias else 0
+    # inicio_cadeia[s] = todos os inícios s + k·P (k = ocorrência) são viáveis
+    inicio_cadeia = np.ones(total_slots, dtype=bool)
+    for k in ocorrencias:
+        deslocado = np.zeros(total_slots, dtype=bool)
+        if k * P_j_slots < total_slots:
+            deslocado[: total_slots - k * P_j_slots] = viavel_por_ocorrencia[k][k * P_j_slots :]
+        inicio_cadeia &= deslocado
+    resultado = {}
+    for o in ocorrencias:
+        viavel = np.zeros(total_slots, dtype=bool)
+        if o * P_j_slots < total_slots:
+            viavel[o * P_j_slots :] = inicio_cadeia[: total_slots - o * P_j_slots]
+        resultado[o] = viavel
+    return resultado
 
-# ==============================
-# 2. Criação do modelo
-# ==============================
+def preparar_parametros(data, restricao_inicios=None):
+    """
+    Extrai do JSON processado por `carregar_dados(...)` os conjuntos e parâmetros do modelo
+    e monta o índice de viabilidade (inícios que podem de fato acontecer).
+    `restricao_inicios` ({j: {o: array bool por slot}}) limita os inícios de algumas ocorrências
+    (ex.: vizinhança da solução grossa em `multi_resolucao.py`); as podas de cadeia e precedência
+    propagam o corte.
+    Retorna um dicionário com os parâmetros usados pelos backends.
+    """
+    pessoas = data["pessoas"] # conjunto de pessoas
+    tarefas = list(data["tarefas"].keys()) # conjunto de tarefas
+    duracao_slot = data["slot_duracao_min"] # duração do slot em minutos
+    total_slots = data["dias"]*24*(60//duracao_slot) # número total de slots
+    alpha = data.get("alpha", 0) # Valor padrão 0 se não estiver definido
+    tarefas_bebe = [j for j, task_data in data["tarefas"].items() if task_data.get("tipo") == "bebe"] # Tarefas do bebê (conjunto D_b)
+    duracao_tarefas = {
+        j: math.ceil(data["tarefas"][j]["duracao"] / duracao_slot)
+        for j in tarefas
+    } # d_j (duração em slots)
+    ocorrencias = {j: range(data["tarefas"][j]["ocorrencias"]) for j in tarefas}
+    capacidade = data["aptidao"] # c_{i,j}
+    dependencias =  data["dependencias"] # dependências entre tarefas
+    periodicidade = data.get("periodicidade", {})
+    limite_carga_horas = data.get("limite_carga_horas", {})
+    if duracao_slot > 0:
+        limite_carga = {i: int((limite_em_horas * 60) / duracao_slot)
+                        for i, limite_em_horas in limite_carga_horas.items()}
+    else:
+        limite_carga = {}
+        print("Aviso: 'slot_duracao_min' é 0. O Limite de Carga não será aplicado.")
 
-print ("Alpha (α) utilizado: ", alpha )
+    # Índice de viabilidade: inícios que podem de fato acontecer
+    # Em vez de criar uma variável para todo (i, j, o, t) e depois fixá-la em zero,
+    # calculamos uma única vez quais inícios são possíveis e só criamos variáveis para eles.
 
-model = pulp.LpProblem("x_Cuidados_Bebe", pulp.LpMinimize)
+    # Por pessoa e tarefa: a tarefa cabe no horizonte, o início respeita a janela da tarefa (TA_{j,t})
+    # e a pessoa está disponível durante toda a duração (PA_{i,t} ... PA_{i,t+d_j-1}).
+    # Calculado no pré-processamento como matriz (pessoas x tarefas x slots).
+    mascara_inicio = data["mascara_inicio"]
 
-# Variável Delta para o Balanceamento 
-# Representa a maior diferença de % de carga entre duas pessoas
-delta_balanceamento = pulp.LpVariable("Delta_Balanceamento", lowBound=0, cat="Continuous")
+    # Por tarefa: inícios em que ao menos uma pessoa pode começar
+    viavel_tarefa = {j: mascara_inicio[:, idx_j, :].any(axis=0) for idx_j, j in enumerate(tarefas)}
 
-# Variáveis de decisão: x[i][j][o][t] = 1 se pessoa i inicia tarefa j, ocorrência o no slot t
-x = {}
-for i in pessoas:
-    x[i] = {}
+    # Por ocorrência: em tarefas periódicas a ocorrência o em t fixa toda a cadeia
+    # t + (k - o) * P_j, k = 0..n-1, então t só é viável se a cadeia inteira for viável.
+    viavel_ocorrencia = {}
     for j in tarefas:
-        x[i][j] = {}
-        for o in ocorrencias[j]:
-            x[i][j][o] = {}
-            for t in range(total_slots):
-                x[i][j][o][t] = pulp.LpVariable(f"x_{i}_{j}_{o}_{t}", cat="Binary")
+        viavel_ocorrencia[j] = {o: viavel_tarefa[j] for o in ocorrencias[j]}
+        for o, permitidos in (restricao_inicios or {}).get(j, {}).items():
+            viavel_ocorrencia[j][o] = viavel_ocorrencia[j][o] & permitidos
+        if j in periodicidade:
+            viavel_ocorrencia[j] = _sincronizar_cadeia(viavel_ocorrencia[j], math.ceil(periodicidade[j] / duracao_slot))
 
-# Proibir inícios inválidos: se t + D[j] > Slots então x[i][j][o][t] == 0
-for i in pessoas:
-    for j in tarefas:
-        dur = duracao_tarefas[j]
-        ultimo_inicio = total_slots - dur
-        for o in ocorrencias[j]:
-            for t in range(total_slots):
-                if t > ultimo_inicio:
-                    model += x[i][j][o][t] == 0
+    # Precedência: a ocorrência o de j2 só pode começar em t2 se a ocorrência o de j1
+    # puder começar em algum t1 dentro da janela [t2 - d_j1 - W, t2 - d_j1], e vice-versa
+    # (j1 em t1 precisa de j2 em [t1 + d_j1, t1 + d_j1 + W]). Se j1 for periódica, o corte
+    # em uma ocorrência se propaga pela cadeia (ex.: a última amamentação precisa deixar
+    # espaço para o último arroto antes do fim do horizonte), e j2 é podada de novo.
+    t = np.arange(total_slots)
+    for j1_id in dependencias:
+        j2_id = dependencias[j1_id]["proxima_tarefa"]
+        W = math.ceil(dependencias[j1_id]["janela_de_espera"] / duracao_slot)
+        d_j1 = duracao_tarefas[j1_id]
+        comuns = [o for o in ocorrencias[j1_id] if o in ocorrencias[j2_id]]
+        for sentido in ("j2", "j1", "j2"):
+            for o in comuns:
+                if sentido == "j2":
+                    # acumulada[t] = número de inícios viáveis de j1 em [0, t)
+                    acumulada = np.concatenate(([0], np.cumsum(viavel_ocorrencia[j1_id][o])))
+                    inicio = np.clip(t - d_j1 - W, 0, total_slots)
+                    fim = np.clip(t - d_j1 + 1, 0, total_slots)
+                    viavel_ocorrencia[j2_id][o] = viavel_ocorrencia[j2_id][o] & (acumulada[fim] - acumulada[inicio] > 0)
+                else:
+                    acumulada = np.concatenate(([0], np.cumsum(viavel_ocorrencia[j2_id][o])))
+                    inicio = np.clip(t + d_j1, 0, total_slots)
+                    fim = np.clip(t + d_j1 + W + 1, 0, total_slots)
+                    viavel_ocorrencia[j1_id][o] = viavel_ocorrencia[j1_id][o] & (acumulada[fim] - acumulada[inicio] > 0)
+            if sentido == "j1" and j1_id in periodicidade:
+                viavel_ocorrencia[j1_id] = _sincronizar_cadeia(
+                    viavel_ocorrencia[j1_id], math.ceil(periodicidade[j1_id] / duracao_slot)
+                )
 
-# ==============================
-# 3. Função Objetivo
-# ==============================
+    return {
+        "pessoas": pessoas,
+        "tarefas": tarefas,
+        "duracao_slot": duracao_slot,
+        "total_slots": total_slots,
+        "alpha": alpha,
+        "tarefas_bebe": tarefas_bebe,
+        "duracao_tarefas": duracao_tarefas,
+        "ocorrencias": ocorrencias,
+        "capacidade": capacidade,
+        "dependencias": dependencias,
+        "periodicidade": periodicidade,
+        "limite_carga": limite_carga,
+        "mascara_inicio": mascara_inicio,
+        "viavel_ocorrencia": viavel_ocorrencia,
+    }
+
+def enumerar_variaveis(param):
+    """
+    Lista, em ordem fixa, todos os inícios viáveis (i, j, o, t): uma variável x por entrada.
+    A mesma ordem é usada pelos dois backends, então a coluna k de um é a variável k do outro.
+    Retorna um dicionário de arrays numpy com os índices de "pessoa", "tarefa", "ocorrencia" e "slot".
+    """
+    pessoa, tarefa, ocorrencia, slot = [], [], [], []
+    for idx_i, i in enumerate(param["pessoas"]):
+        for idx_j, j in enumerate(param["tarefas"]):
+            for o in param["ocorrencias"][j]:
+                inicios = np.flatnonzero(param["viavel_ocorrencia"][j][o] & param["mascara_inicio"][idx_i, idx_j])
+                pessoa.append(np.full(len(inicios), idx_i))
+                tarefa.append(np.full(len(inicios), idx_j))
+                ocorrencia.append(np.full(len(inicios), o))
+                slot.append(inicios)
+    return {
+        "pessoa": np.concatenate(pessoa).astype(np.int64),
+        "tarefa": np.concatenate(tarefa).astype(np.int64),
+        "ocorrencia": np.concatenate(ocorrencia).astype(np.int64),
+        "slot": np.concatenate(slot).astype(np.int64),
+    }
+
+def _grupos_intercambiaveis(param, j, sucessora=None):
+    """
+    (Função interna) Agrupa as ocorrências de j com o mesmo domínio de início (e, se houver,
+    o mesmo domínio da ocorrência correspondente da sucessora). Ocorrências do mesmo grupo
+    podem trocar de rótulo sem mudar a agenda.
+    """
+    grupos = {}
+    for o in param["ocorrencias"][j]:
+        chave = param["viavel_ocorrencia"][j][o].tobytes()
+        if sucessora is not None:
+            if o in param["ocorrencias"][sucessora]:
+                chave += param["viavel_ocorrencia"][sucessora][o].tobytes()
+            else:
+                chave += b"sem_sucessora"
+        grupos.setdefault(chave, []).append(o)
+    return list(grupos.values())
 
-# Termo 1: Aptidão (Minimizar falta de aptidão)
-objetivo_aptidao = pulp.lpSum(
-    (1 - capacidade[i][j]) * x[i][j][o][t]
-    for i in pessoas
-    for j in tarefas 
-    for o in ocorrencias[j]
-    for t in range(total_slots)
-)
+def simetria_ocorrencias(param, modo="nenhuma"):
+    """
+    Trata a simetria entre ocorrências da mesma tarefa: sem periodicidade, as ocorrências
+    de uma tarefa são intercambiáveis e o índice o só multiplica soluções equivalentes.
+      - "ordenar": inícios em ordem crescente dentro de cada grupo de ocorrências intercambiáveis
+        (tarefas com sucessora levam a sucessora junto; sucessoras seguem a antecessora);
+      - "agregar": tarefas sem periodicidade e sem precedência viram uma única ocorrência
+        representativa (o = 0) que precisa ser feita n_j vezes; as demais são ordenadas.
+    Retorna uma cópia de `param` com "multiplicidade" {j: n_j} (tarefas agregadas) e
+    "ordem_ocorrencias" {j: [(o, o_seguinte), ...]}.
+    """
+    if modo not in SIMETRIAS:
+        raise ValueError(f"Simetria '{modo}' desconhecida. Use uma de {SIMETRIAS}.")
+    param = dict(param)
+    if modo == "nenhuma":
+        return param
 
-# Termo 2: Penalidade de Desequilíbrio (alpha * delta)
-model += objetivo_aptidao + (alpha * delta_balanceamento)
+    sucessora = {j1: dep["proxima_tarefa"] for j1, dep in param["dependencias"].items()}
+    antecessoras = set(sucessora.values())
+    ocorrencias = dict(param["ocorrencias"])
+    viavel_ocorrencia = dict(param["viavel_ocorrencia"])
+    multiplicidade = {}
+    ordem = {}
+    for j in param["tarefas"]:
+        # Periódicas já têm ordem fixada por 4.7; sucessoras herdam a ordem da antecessora
+        if j in param["periodicidade"] or j in antecessoras or len(ocorrencias[j]) < 2:
+            continue
+        grupos = _grupos_intercambiaveis(param, j, sucessora.get(j))
+        if modo == "agregar" and j not in sucessora and len(grupos) == 1:
+            o = grupos[0][0]
+            multiplicidade[j] = len(grupos[0])
+            ocorrencias[j] = [o]
+            viavel_ocorrencia[j] = {o: param["viavel_ocorrencia"][j][o]}
+            continue
+        pares = [(a, b) for grupo in grupos for a, b in zip(grupo, grupo[1:])]
+        if pares:
+            ordem[j] = pares
+
+    param["ocorrencias"] = ocorrencias
+    param["viavel_ocorrencia"] = viavel_ocorrencia
+    param["multiplicidade"] = multiplicidade
+    param["ordem_ocorrencias"] = ordem
+    return param
+
+def agrupar_alocacoes(param, alocacoes):
+    """
+    Reescreve alocações da formulação original (idx_i, idx_j, o, t) na formulação de
+    `simetria_ocorrencias(...)`: ocorrências agregadas viram a representativa e, nos grupos
+    ordenados, os rótulos são trocados para que os inícios fiquem em ordem (ex.: MIP start).
+    """
+    tarefas = param["tarefas"]
+    multiplicidade = param.get("multiplicidade", {})
+    sucessora = {j1: dep["proxima_tarefa"] for j1, dep in param["dependencias"].items()}
+    inicio = {(tarefas[idx_j], o): t for _, idx_j, o, t in alocacoes}
+
+    novo_rotulo = {}
+    for j, pares in param.get("ordem_ocorrencias", {}).items():
+        # Reconstrói os grupos (cadeias o -> o_seguinte) e redistribui os rótulos pelo início
+        seguinte = dict(pares)
+        primeiros = set(seguinte) - set(seguinte.values())
+        for o in primeiros:
+            grupo = [o]
+            while grupo[-1] in seguinte:
+                grupo.append(seguinte[grupo[-1]])
+            por_inicio = sorted(grupo, key=lambda o: inicio[(j, o)])
+            for rotulo, o_original in zip(grupo, por_inicio):
+                novo_rotulo[(j, o_original)] = rotulo
+                if j in sucessora:
+                    novo_rotulo[(sucessora[j], o_original)] = rotulo
+
+    resultado = []
+    for idx_i, idx_j, o, t in alocacoes:
+        j = tarefas[idx_j]
+        if j in multiplicidade:
+            o = param["ocorrencias"][j][0]
+        resultado.append((idx_i, idx_j, novo_rotulo.get((j, o), o), t))
+    return resultado
+
+def desagregar_alocacoes(param, alocacoes):
+    """
+    Volta às ocorrências originais: em tarefas agregadas, as n_j alocações da ocorrência
+    representativa recebem os rótulos 0..n_j-1 em ordem de início.
+    """
+    tarefas = param["tarefas"]
+    multiplicidade = param.get("multiplicidade", {})
+    if not multiplicidade:
+        return list(alocacoes)
+    contador = {j: 0 for j in multiplicidade}
+    resultado = []
+    for idx_i, idx_j, o, t in sorted(alocacoes, key=lambda a: a[3]):
+        j = tarefas[idx_j]
+        if j in multiplicidade:
+            o = contador[j]
+            contador[j] += 1
+        resultado.append((idx_i, idx_j, o, t))
+    return resultado
 
 # ==============================
-# 4. Restrições
+# 2. Criação do modelo
 # ==============================
 
-# 4.1 Cada ocorrência de tarefa deve ser realizada exatamente uma vez
-for j in tarefas:
-    for o in ocorrencias[j]:
-        model += pulp.lpSum(x[i][j][o][t] for i in pessoas for t in range(total_slots)) == 1
-
-# 4.2 Não sobreposição de tarefas por pessoa
-for i in pessoas:
-    for t in range(total_slots):
-        model += (
-            pulp.lpSum(
-                x[i][j][o][t_start]
-                for j in tarefas
-                for o in ocorrencias[j]
-                for t_start in range(max(0, t - duracao_tarefas[j] + 1), t + 1)
-            )
-            <= 1
-        )
+def _marcar_familia(model, estado, familia):
+    """
+    (Função interna) Fecha a família de restrições `familia`: linhas e não-nulos acrescentados
+    ao modelo e tempo decorridos desde a marca anterior. Sem `estado` (instrumentação desligada) não faz nada.
+    """
+    if estado is None:
+        return
+    agora = time.perf_counter()
+    novas = list(model.constraints.values())[estado["linhas"]:]
+    estado["familias"].append((familia, len(novas), sum(len(restricao) for restricao in novas),
+                               agora - estado["relogio"]))
+    estado["linhas"] += len(novas)
+    estado["relogio"] = agora
+
+def montar_modelo(param, variaveis=None, familias=None):
+    """
+    Monta o modelo PuLP (objetivo e restrições 4.1 a 4.10) sobre o índice de viabilidade.
+    Se `familias` for uma lista, recebe (nome, linhas, não-nulos, segundos) de cada família de restrições.
+    Retorna (model, x, delta_balanceamento), com x[i][j][o] = {t: LpVariable}.
+    """
+    import pulp
+    pessoas = param["pessoas"]
+    tarefas = param["tarefas"]
+    duracao_slot = param["duracao_slot"]
+    alpha = param["alpha"]
+    tarefas_bebe = param["tarefas_bebe"]
+    duracao_tarefas = param["duracao_tarefas"]
+    ocorrencias = param["ocorrencias"]
+    capacidade = param["capacidade"]
+    dependencias = param["dependencias"]
+    periodicidade = param["periodicidade"]
+    limite_carga = param["limite_carga"]
+    viavel_ocorrencia = param["viavel_ocorrencia"]
+    estado = None if familias is None else {"familias": familias, "linhas": 0, "relogio": time.perf_counter()}
+    if variaveis is None:
+        variaveis = enumerar_variaveis(param)
+
+    model = pulp.LpProblem("x_Cuidados_Bebe", pulp.LpMinimize)
+
+    # Variável Delta para o Balanceamento
+    # Representa a maior diferença de % de carga entre duas pessoas
+    delta_balanceamento = pulp.LpVariable("Delta_Balanceamento", lowBound=0, cat="Continuous")
+
+    # Variáveis de decisão: x[i][j][o][t] = 1 se pessoa i inicia tarefa j, ocorrência o no slot t
+    # Só existem as chaves t do índice de viabilidade; inícios inválidos (fora do horizonte,
+    # fora da janela da tarefa ou com a pessoa indisponível) simplesmente não têm variável.
+    x = {i: {j: {o: {} for o in ocorrencias[j]} for j in tarefas} for i in pessoas}
+    for idx_i, idx_j, o, t in zip(
+        variaveis["pessoa"].tolist(), variaveis["tarefa"].tolist(),
+        variaveis["ocorrencia"].tolist(), variaveis["slot"].tolist(),
+    ):
+        i, j = pessoas[idx_i], tarefas[idx_j]
+        x[i][j][o][t] = pulp.LpVariable(f"x_{i}_{j}_{o}_{t}", cat="Binary")
+
+    print(f"Variáveis x criadas: {len(variaveis['slot'])}")
 
-# 4.3 Não sobreposição de tarefas do bebê
-for t in range(total_slots):
-    expr = []
+    # ==============================
+    # 3. Função Objetivo
+    # ==============================
+
+    # Termo 1: Aptidão (Minimizar falta de aptidão)
+    objetivo_aptidao = pulp.lpSum(
+        (1 - capacidade[i][j]) * var
+        for i in pessoas
+        for j in tarefas
+        for o in ocorrencias[j]
+        for var in x[i][j][o].values()
+    )
+
+    # Termo 2: Penalidade de Desequilíbrio (alpha * delta)
+    model += objetivo_aptidao + (alpha * delta_balanceamento)
+    _marcar_familia(model, estado, "variaveis_objetivo")
+
+    # ==============================
+    # 4. Restrições
+    # ==============================
+
+    # 4.1 Cada ocorrência de tarefa deve ser realizada exatamente uma vez
+    # (ocorrências agregadas por `simetria_ocorrencias(...)`: n_j vezes)
+    # Em cadeias periódicas só a primeira ocorrência precisa da linha: somando as igualdades
+    # de 4.7 sobre t, cada ocorrência seguinte é feita tantas vezes quanto a anterior.
+    multiplicidade = param.get("multiplicidade", {})
+    for j in tarefas:
+        for o in ocorrencias[j]:
+            if j in periodicidade and o - 1 in ocorrencias[j]:
+                continue
+            model += pulp.lpSum(var for i in pessoas for var in x[i][j][o].values()) == multiplicidade.get(j, 1)
+    _marcar_familia(model, estado, "4.1_ocorrencia")
+
+    # Cobertura: para cada slot t, quais variáveis representam uma tarefa em andamento em t
+    # (início em t_start com t_start <= t < t_start + d_j). Montada uma vez percorrendo só as
+    # variáveis existentes, em vez de varrer a janela de cada (i, t).
+    cobertura_pessoa = {i: {} for i in pessoas}
+    cobertura_bebe = {}
     for i in pessoas:
-        for j in tarefas_bebe:
+        for j in tarefas:
             dur = duracao_tarefas[j]
-            t_start_min = max(0, t - dur + 1)
-            t_start_max = min(t, total_slots - dur)
             for o in ocorrencias[j]:
-                for t_start in range(t_start_min, t_start_max + 1):
-                    expr.append(x[i][j][o][t_start])
-    model += pulp.lpSum(expr) <= 1
+                for t_start, var in x[i][j][o].items():
+                    for t in range(t_start, t_start + dur):
+                        cobertura_pessoa[i].setdefault(t, []).append(var)
+                        if j in tarefas_bebe:
+                            cobertura_bebe.setdefault(t, []).append(var)
 
-# 4.4 Respeitar disponibilidade das pessoas (Considerando a duração completa)
-for i in pessoas:
-    for j in tarefas:
-        duracao_j = duracao_tarefas[j] 
-        for o in ocorrencias[j]:
-            for t in range(total_slots):
-                # Fronteira do Tempo:
-                # Verifica se a tarefa cabe n total de slots se começar neste slot t.
-                # Se t + duração ultrapassar o total de slots, é impossível iniciar aqui.
-                if t + duracao_j > total_slots:
-                    model += x[i][j][o][t] == 0
-                    continue # Pula para o próximo t, pois este já é inválido
-                
-                # Disponibilidade na Janela:
-                # Cria uma "fatia" da lista de disponibilidade que cobre 
-                # do momento t até o momento t + duracao_j.
-                janela_disponibilidade = disponibilidade_pessoas[i][t : t + duracao_j]
-                
-                # Se houver algum '0' (indisponível) dentro dessa janela necessária, 
-                # a pessoa não pode aceitar a tarefa.
-                if 0 in janela_disponibilidade:
-                    model += x[i][j][o][t] == 0
-
-# 4.5 Respeitar horários das Tarefas
-# Se disponibilidade_tarefas[j][t] == 0, a tarefa j não pode começar no slot t.
-for j in tarefas:
-    if disponibilidade_tarefas and 0 in disponibilidade_tarefas[j]:
-        for o in ocorrencias[j]:
-            for t in range(total_slots):
-                if disponibilidade_tarefas[j][t] == 0:
-                    for i in pessoas:
-                        model += x[i][j][o][t] == 0
-
-# 4.6 Precedência entre tarefas
-#print("tamanho dependencias:", len(dependencias))
-for j1_id in dependencias:
-    j2_id = dependencias[j1_id]["proxima_tarefa"]
-    W = math.ceil(dependencias[j1_id]["janela_de_espera"] / duracao_slot)
-    #print(f"Aplicando precedência: {j1_id} -> {j2_id} com janela {W} slots.")
-
-    for o in ocorrencias[j1_id]:
-        for t2 in range(total_slots):
-            d_j1 = duracao_tarefas[j1_id]
-            t1_min = max(0, t2 - d_j1 - W)
-            t1_max = min(t2 - d_j1, total_slots - d_j1)
-
-            if t1_min > t1_max:
-                # Se não existe nenhum início válido de j1 que permita j2 iniciar em t2,
-                # então nenhum i2 pode iniciar j2 em t2 (forçamos a variável a 0).
-                for i2 in pessoas:
-                    model += x[i2][j2_id][o][t2] == 0
+    # 4.2 Não sobreposição de tarefas por pessoa
+    # Slots cobertos por no máximo uma variável não precisam de restrição.
+    for i in pessoas:
+        for t in sorted(cobertura_pessoa[i]):
+            if len(cobertura_pessoa[i][t]) > 1:
+                model += pulp.lpSum(cobertura_pessoa[i][t]) <= 1
+    _marcar_familia(model, estado, "4.2_sobreposicao_pessoa")
+
+    # 4.3 Não sobreposição de tarefas do bebê
+    for t in sorted(cobertura_bebe):
+        if len(cobertura_bebe[t]) > 1:
+            model += pulp.lpSum(cobertura_bebe[t]) <= 1
+    _marcar_familia(model, estado, "4.3_sobreposicao_bebe")
+
+    # 4.4 Respeitar disponibilidade das pessoas (Considerando a duração completa)
+    # 4.5 Respeitar horários das Tarefas
+    # Garantidas pelo índice de viabilidade: x[i][j][o][t] só existe se a tarefa cabe no
+    # horizonte, se TA_{j,t} = 1 e se a pessoa está disponível em todos os slots da tarefa.
+
+    # 4.6 Precedência entre tarefas
+    # Uma restrição por (o, t2), somando j2 sobre as pessoas: no máximo uma pessoa inicia
+    # (j2, o) em t2, então a soma vale o mesmo que cada x[i2] isolado nas soluções inteiras,
+    # mas a relaxação fica mais justa e a soma da janela de j1 não é repetida para cada i2.
+    for j1_id in dependencias:
+        j2_id = dependencias[j1_id]["proxima_tarefa"]
+        W = math.ceil(dependencias[j1_id]["janela_de_espera"] / duracao_slot)
+        d_j1 = duracao_tarefas[j1_id]
+
+        for o in ocorrencias[j1_id]:
+            if o not in ocorrencias[j2_id]:
                 continue
+            # Inícios de j2 sem nenhum j1 possível na janela já foram removidos do índice.
+            for t2 in np.flatnonzero(viavel_ocorrencia[j2_id][o]).tolist():
+                rhs = [x[i2][j2_id][o][t2] for i2 in pessoas if t2 in x[i2][j2_id][o]]
+                if not rhs:
+                    continue
+                t1_min = max(0, t2 - d_j1 - W)
+                t1_max = t2 - d_j1
 
-            lhs = []
-            for i1 in pessoas:
-                for t1 in range(t1_min, t1_max + 1):
-                    lhs.append(x[i1][j1_id][o][t1])
+                lhs = []
+                for i1 in pessoas:
+                    for t1 in range(t1_min, t1_max + 1):
+                        if t1 in x[i1][j1_id][o]:
+                            lhs.append(x[i1][j1_id][o][t1])
 
-            for i2 in pessoas:
-                model += pulp.lpSum(lhs) >= x[i2][j2_id][o][t2]
+                model += pulp.lpSum(lhs) >= pulp.lpSum(rhs)
+    _marcar_familia(model, estado, "4.6_precedencia")
 
-# 4.6 Restrição de periodicidade (tarefas recorrentes)
-if "periodicidade" in data:
-    for j, P_j in data["periodicidade"].items():
+    # 4.7 Restrição de periodicidade (tarefas recorrentes)
+    for j, P_j in periodicidade.items():
         P_j_slots = math.ceil(P_j / duracao_slot)
-        dur = duracao_tarefas[j]
-        last_start = total_slots - dur
-        for o in range(len(ocorrencias[j]) - 1):
-            for t1 in range(0, last_start + 1):
+        for o in ocorrencias[j]:
+            if o + 1 not in ocorrencias[j]:
+                continue
+            inicios_o = set(np.flatnonzero(viavel_ocorrencia[j][o]).tolist())
+            inicios_o_seguinte = set(np.flatnonzero(viavel_ocorrencia[j][o + 1]).tolist())
+            for t1 in sorted(inicios_o | {t - P_j_slots for t in inicios_o_seguinte}):
                 t2 = t1 + P_j_slots
-                if t2 <= last_start:
-                    model += pulp.lpSum(x[i][j][o][t1] for i in pessoas) == \
-                             pulp.lpSum(x[i][j][o+1][t2] for i in pessoas)
-                else:
-                    # Se o deslocamento pela periodicidade ultrapassa o horizonte,
-                    # então um início em t1 não é válido (eliminação de inicios inválidos).
-                    model += pulp.lpSum(x[i][j][o][t1] for i in pessoas) == 0
+                lhs = [x[i][j][o][t1] for i in pessoas if t1 in x[i][j][o]]
+                rhs = [x[i][j][o + 1][t2] for i in pessoas if t2 in x[i][j][o + 1]]
+                # Se os dois lados não têm variáveis a igualdade é trivial; se só um lado tem,
+                # a restrição força esses inícios a zero (o deslocamento cai fora do índice).
+                if lhs or rhs:
+                    model += pulp.lpSum(lhs) == pulp.lpSum(rhs)
+    _marcar_familia(model, estado, "4.7_periodicidade")
 
-# 4.8 e 4.9 : Limites e Balanceamento
+    # 4.10 Quebra de simetria: ocorrências intercambiáveis começam em ordem crescente
+    # sum t * x[i][j][o][t] <= sum t * x[i][j][o_seguinte][t]
+    for j, pares in param.get("ordem_ocorrencias", {}).items():
+        for o, o_seguinte in pares:
+            model += pulp.lpSum(
+                t * var for i in pessoas for t, var in x[i][j][o].items()
+            ) <= pulp.lpSum(t * var for i in pessoas for t, var in x[i][j][o_seguinte].items())
+    _marcar_familia(model, estado, "4.10_simetria")
 
-# Pré-cálculo das Expressões de Carga
-# Isso cria a expressão linear da carga total (em slots) para cada pessoa.
-expressao_carga_pessoa = {}
+    # 4.8 e 4.9 : Limites e Balanceamento
 
-for i in pessoas:
-    # Monta a soma de (duração * variável_decisao)
-    expressao_carga_pessoa[i] = pulp.lpSum(
-        duracao_tarefas[j] * x[i][j][o][t]
-        for j in tarefas
-        for o in ocorrencias[j]
-        for t in range(total_slots)
-    )
+    # Pré-cálculo das Expressões de Carga
+    # Isso cria a expressão linear da carga total (em slots) para cada pessoa,
+    # somando a carga já comprometida fora do modelo, se houver (ex.: horizonte rolante).
+    carga_fixa = param.get("carga_fixa", {})
+    expressao_carga_pessoa = {}
 
-# Aplicação da Restrição "Hard" (Limite Máximo)
-# Ninguém pode ultrapassar seu teto de horas, independente do balanceamento.
-if limite_carga:
     for i in pessoas:
-        if i in limite_carga:
-            L_i = limite_carga[i]
-            # Usa a expressão pré-calculada (muito mais rápido)
-            model += expressao_carga_pessoa[i] <= L_i, f"Limite_Maximo_{i}"
-
-# Aplicação da Restrição "Soft" (Balanceamento Relativo / Minimax)
-# Tenta igualar a % de ocupação entre as pessoas.
-if limite_carga and alpha > 0:
-    # Filtra apenas pessoas com limite definido > 0
-    pessoas_validas = [p for p in pessoas if p in limite_carga and limite_carga[p] > 0]
-    
-    if len(pessoas_validas) >= 2:
-        # itertools.combinations evita pares duplicados e auto-comparação (ex: A-B é igual B-A)
-        for p1, p2 in itertools.combinations(pessoas_validas, 2):
-            L1 = float(limite_carga[p1])
-            L2 = float(limite_carga[p2])
-            
-            # Percentual de uso = Carga Real / Limite Total
-            pct_p1 = expressao_carga_pessoa[p1] / L1
-            pct_p2 = expressao_carga_pessoa[p2] / L2
-            
-            # Para garantir Delta >= |pct_p1 - pct_p2|, usamos a técnica de variáveis auxiliares.
-            
-            # 1. (P1 - P2) <= Delta
-            model += pct_p1 - pct_p2 <= delta_balanceamento, f"Balanceamento_{p1}_{p2}_pos"
-            
-            # 2. (P2 - P1) <= Delta
-            model += pct_p2 - pct_p1 <= delta_balanceamento, f"Balanceamento_{p1}_{p2}_neg"
+        # Monta a soma de (duração * variável_decisao)
+        expressao_carga_pessoa[i] = pulp.lpSum(
+            duracao_tarefas[j] * var
+            for j in tarefas
+            for o in ocorrencias[j]
+            for var in x[i][j][o].values()
+        ) + carga_fixa.get(i, 0)
 
+    # Aplicação da Restrição "Hard" (Limite Máximo)
+    # Ninguém pode ultrapassar seu teto de horas, independente do balanceamento.
+    if limite_carga:
+        for i in pessoas:
+            if i in limite_carga:
+                L_i = limite_carga[i]
+                # Usa a expressão pré-calculada (muito mais rápido)
+                model += expressao_carga_pessoa[i] <= L_i, f"Limite_Maximo_{i}"
+    _marcar_familia(model, estado, "4.8_limite_carga")
+
+    # Aplicação da Restrição "Soft" (Balanceamento Relativo / Minimax)
+    # Tenta igualar a % de ocupação entre as pessoas.
+    if limite_carga and alpha > 0:
+        # Filtra apenas pessoas com limite definido > 0
+        pessoas_validas = [p for p in pessoas if p in limite_carga and limite_carga[p] > 0]
+
+        if len(pessoas_validas) >= 2 and param.get("modo_balanceamento", "extremos") == "extremos":
+            # max_p pct_p - min_p pct_p é a maior diferença entre dois percentuais, então basta
+            # limitar cada percentual entre U_min e U_max e exigir Delta >= U_max - U_min:
+            # 2 restrições por pessoa em vez de 2 por par.
+            u_max = pulp.LpVariable("U_max", lowBound=0, cat="Continuous")
+            u_min = pulp.LpVariable("U_min", lowBound=0, cat="Continuous")
+            for p in pessoas_validas:
+                pct_p = expressao_carga_pessoa[p] / float(limite_carga[p])
+                model += pct_p <= u_max, f"Balanceamento_{p}_max"
+                model += pct_p >= u_min, f"Balanceamento_{p}_min"
+            model += u_max - u_min <= delta_balanceamento, "Balanceamento_Delta"
+
+        elif len(pessoas_validas) >= 2:
+            # itertools.combinations evita pares duplicados e auto-comparação (ex: A-B é igual B-A)
+            for p1, p2 in itertools.combinations(pessoas_validas, 2):
+                L1 = float(limite_carga[p1])
+                L2 = float(limite_carga[p2])
+
+                # Percentual de uso = Carga Real / Limite Total
+                pct_p1 = expressao_carga_pessoa[p1] / L1
+                pct_p2 = expressao_carga_pessoa[p2] / L2
+
+                # Para garantir Delta >= |pct_p1 - pct_p2|, usamos a técnica de variáveis auxiliares.
+
+                # 1. (P1 - P2) <= Delta
+                model += pct_p1 - pct_p2 <= delta_balanceamento, f"Balanceamento_{p1}_{p2}_pos"
+
+                # 2. (P2 - P1) <= Delta
+                model += pct_p2 - pct_p1 <= delta_balanceamento, f"Balanceamento_{p1}_{p2}_neg"
+    _marcar_familia(model, estado, "4.9_balanceamento")
+
+    return model, x, delta_balanceamento
 
 # ======================================
 # 5. Resolver modelo e mostrar solução
 # ======================================
 
-#solver = pulp.PULP_CBC_CMD(msg=False) # Solver CBC não utilizado atualmente
+def _extrair_alocacoes_pulp(param, model, x, variaveis):
+    """
+    (Função interna) Lê o vetor primal do HiGHS de uma vez (em vez de `pulp.value` em cada x) e
+    devolve as alocações ativas (idx_i, idx_j, o, t), na ordem de `enumerar_variaveis(param)`.
+    """
+    pessoas, tarefas = param["pessoas"], param["tarefas"]
+    colunas = np.fromiter(
+        (x[pessoas[idx_i]][tarefas[idx_j]][o][t].index for idx_i, idx_j, o, t in zip(
+            variaveis["pessoa"].tolist(), variaveis["tarefa"].tolist(),
+            variaveis["ocorrencia"].tolist(), variaveis["slot"].tolist())),
+        dtype=np.int64, count=len(variaveis["slot"]),
+    )
+    valores = np.asarray(model.solverModel.getSolution().col_value)[colunas]
+    ativas = np.flatnonzero(valores > 0.99)
+    return list(zip(
+        variaveis["pessoa"][ativas].tolist(), variaveis["tarefa"][ativas].tolist(),
+        variaveis["ocorrencia"][ativas].tolist(), variaveis["slot"][ativas].tolist(),
+    ))
+
+def limite_ate_prazo(time_limit, prazo=None):
+    """
+    Limite de tempo do solver chamado agora: `time_limit`, sem passar do `prazo`
+    (instante absoluto de `time.perf_counter()`, ex.: orçamento de uma tarefa em `lote.py`).
+    """
+    if prazo is None:
+        return time_limit
+    return max(0.0, min(time_limit, prazo - time.perf_counter()))
+
+def resolver_pulp(param, time_limit=300, msg=True, registro=None, threads=None, prazo=None):
+    """
+    Monta o modelo com PuLP e resolve com HiGHS (com no máximo `threads` threads, se dado).
+    Com `prazo`, o limite de tempo é recalculado logo antes de o HiGHS rodar (`limite_ate_prazo`).
+    `registro` (de `instrumentacao.novo_registro()`) recebe tempos por fase e família e o progresso do solver.
+    Retorna um dicionário com "status", "objetivo", "alocacoes" [(idx_i, idx_j, o, t), ...] e tempos.
+    """
+    import pulp
+    inicio = time.perf_counter()
+    with instrumentacao.fase(registro, "montagem"):
+        familias = None if registro is None else []
+        variaveis = enumerar_variaveis(param)
+        model, x, _ = montar_modelo(param, variaveis=variaveis, familias=familias)
+    tempo_montagem = time.perf_counter() - inicio
+
+    #solver = pulp.PULP_CBC_CMD(msg=False) # Solver CBC não utilizado atualmente
+
+    # Usando HiGHS como solver principal
+    # Gap tolerado: 0.01 (1%) - padrão do HiGHS
+    if registro is None:
+        solver = pulp.getSolver('HiGHS', timeLimit=time_limit, msg=msg, threads=threads)
+    else:
+        instrumentacao.registrar_familias(registro, familias)
+        registro["modelo"]["variaveis"] = len(model.variables())
+        solver = pulp.getSolver('HiGHS', timeLimit=time_limit, msg=msg, threads=threads,
+                                callbackTuple=(instrumentacao.callback_progresso(registro), None),
+                                callbacksToActivate=instrumentacao.callbacks_progresso())
+        # Etapas internas do PuLP: cópia do modelo para o HiGHS, resolução e leitura dos valores
+        solver.buildSolverModel = instrumentacao.cronometrar(registro, "carga_highs", solver.buildSolverModel)
+        solver.callSolver = instrumentacao.cronometrar(registro, "solver", solver.callSolver)
+        solver.findSolutionValues = instrumentacao.cronometrar(registro, "leitura_valores",
+                                                                solver.findSolutionValues)
+    if prazo is not None:
+        # A cópia do modelo para o HiGHS acontece dentro de `model.solve`, antes de rodar
+        chamar_solver = solver.callSolver
+        def _chamar_no_prazo(lp):
+            lp.solverModel.setOptionValue("time_limit", float(limite_ate_prazo(time_limit, prazo)))
+            return chamar_solver(lp)
+        solver.callSolver = _chamar_no_prazo
 
-# Usando HiGHS como solver principal
-# Gap tolerado: 0.01 (1%) - padrão do HiGHS
-solver = pulp.getSolver('HiGHS', timeLimit=300, msg=True)
+    inicio = time.perf_counter()
+    model.solve(solver)
+    tempo_resolucao = time.perf_counter() - inicio
 
-model.solve(solver)
+    status_string = pulp.LpStatus[model.status]
+    resultado = {
+        "status": status_string,
+        "objetivo": None,
+        "alocacoes": [],
+        "tempo_montagem": tempo_montagem,
+        "tempo_resolucao": tempo_resolucao,
+    }
+    if status_string == "Optimal" or status_string == "Feasible": # HiGHS pode retornar Feasible com Gap
+        resultado["objetivo"] = pulp.value(model.objective)
+        with instrumentacao.fase(registro, "extracao"):
+            resultado["alocacoes"] = _extrair_alocacoes_pulp(param, model, x, variaveis)
+    return resultado
 
+def resolver(data, backend="pulp", time_limit=300, msg=True, rapido=False, mip_start=False, simetria="nenhuma",
+             balanceamento="extremos", sobreposicao="completa", registro=None, threads=None, prazo=None):
+    """
+    Resolve o modelo para os dados processados por `carregar_dados(...)` com o backend escolhido
+    ("pulp" ou "highs"). Com `rapido` usa só a heurística construtiva (sem MILP); com `mip_start`
+    a agenda da heurística é passada ao solver como solução inicial (backend highs).
+    `simetria` escolhe o tratamento das ocorrências intercambiáveis (ver `simetria_ocorrencias`) e
+    `balanceamento` a formulação de 4.9 (`BALANCEAMENTOS`); com `sobreposicao="preguicosa"` (backend highs)
+    as linhas de 4.2/4.3 entram só quando violadas (`modelo_highs.resolver_highs_preguicoso`). `registro` (de `instrumentacao.novo_registro()`)
+    recebe o tempo de cada fase, o tamanho de cada família de restrições e o progresso do solver.
+    `threads` limita as threads do solver (None: o padrão do HiGHS); `prazo` (instante de `time.perf_counter()`)
+    encurta o limite de tempo de cada chamada ao solver para terminar até ele.
+    Retorna o dicionário de resultado com a solução já formatada em "solucao".
+    """
+    with instrumentacao.fase(registro, "preparar_parametros"):
+        param = preparar_parametros(data)
+    return resolver_parametros(param, backend=backend, time_limit=time_limit, msg=msg, rapido=rapido,
+                               mip_start=mip_start, simetria=simetria, balanceamento=balanceamento,
+                               sobreposicao=sobreposicao, registro=registro, threads=threads, prazo=prazo)
 
-status_code = model.status
-status_string = pulp.LpStatus[status_code]
-print(f"Status do Modelo: {status_string}")
+def resolver_parametros(param, backend="pulp", time_limit=300, msg=True, rapido=False, mip_start=False,
+                        simetria="nenhuma", balanceamento="extremos", sobreposicao="completa", matrizes=None,
+                        registro=None, threads=None, prazo=None):
+    """
+    Mesmo que `resolver(...)`, a partir dos parâmetros já preparados por `preparar_parametros(...)`.
+    `matrizes` (backend highs) são as matrizes já montadas para esta simetria e este balanceamento,
+    ex.: vindas do cache (`cache_modelo.py`); sem elas o modelo é montado aqui.
+    """
+    if balanceamento not in BALANCEAMENTOS:
+        raise ValueError(f"Balanceamento '{balanceamento}' desconhecido. Use um de {BALANCEAMENTOS}.")
+    if sobreposicao not in SOBREPOSICOES:
+        raise ValueError(f"Sobreposição '{sobreposicao}' desconhecida. Use uma de {SOBREPOSICOES}.")
+    print ("Alpha (α) utilizado: ", param["alpha"] )
+    with instrumentacao.fase(registro, "simetria"):
+        param_modelo = simetria_ocorrencias(param, simetria)
+    param_modelo["modo_balanceamento"] = balanceamento
 
-if status_string != "Optimal" and status_string != "Feasible": # HiGHS pode retornar Feasible com Gap
-    print("\nO modelo NÃO ENCONTROU uma solução viável.")
-else:
-    print(f"Valor da Função Objetivo: {pulp.value(model.objective):.2f}")
+    inicial = None
+    if rapido or mip_start:
+        import heuristica
+        with instrumentacao.fase(registro, "heuristica"):
+            inicial = heuristica.resolver_heuristica(param)
 
+    if rapido:
+        resultado = inicial
+    elif backend == "pulp":
+        if mip_start:
+            print("Aviso: solução inicial só é suportada no backend 'highs'; ignorada.")
+        if sobreposicao == "preguicosa":
+            print("Aviso: geração preguiçosa de 4.2/4.3 só é suportada no backend 'highs'; ignorada.")
+        resultado = resolver_pulp(param_modelo, time_limit=time_limit, msg=msg, registro=registro, threads=threads,
+                                  prazo=prazo)
+    elif backend == "highs" and sobreposicao == "preguicosa":
+        # As matrizes do cache têm todas as linhas de 4.2/4.3: aqui o modelo é montado sem elas
+        import modelo_highs
+        with instrumentacao.fase(registro, "solver"):
+            resultado = modelo_highs.resolver_highs_preguicoso(
+                param_modelo, time_limit=time_limit, msg=msg,
+                solucao_inicial=agrupar_alocacoes(param_modelo, inicial["alocacoes"]) if inicial else None,
+                threads=threads, prazo=prazo,
+            )
+    elif backend == "highs":
+        import modelo_highs
+        resultado = modelo_highs.resolver_highs(
+            param_modelo, time_limit=time_limit, msg=msg,
+            solucao_inicial=agrupar_alocacoes(param_modelo, inicial["alocacoes"]) if inicial else None,
+            matrizes=matrizes, registro=registro, threads=threads, prazo=prazo,
+        )
+    else:
+        raise ValueError(f"Backend '{backend}' desconhecido. Use um de {BACKENDS}.")
+    if not rapido:
+        resultado["alocacoes"] = desagregar_alocacoes(param_modelo, resultado["alocacoes"])
+
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nO modelo NÃO ENCONTROU uma solução viável.")
+    else:
+        print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+        if inicial is not None and inicial["objetivo"] is not None and not rapido:
+            resultado["objetivo_heuristica"] = inicial["objetivo"]
+            diferenca = (inicial["objetivo"] - resultado["objetivo"]) / max(abs(resultado["objetivo"]), 1e-9)
+            print(f"Heurística: {inicial['objetivo']:.2f} ({100 * diferenca:.1f}% acima do MILP)")
+
+    with instrumentacao.fase(registro, "formatar_solucao"):
+        resultado["solucao"] = formatar_solucao(param, resultado["alocacoes"])
+    if registro is not None:
+        registro["resultado"] = {chave: resultado.get(chave) for chave in ("status", "objetivo", "gap")}
+        if "rodadas" in resultado:
+            registro["modelo"]["rodadas_sobreposicao"] = len(resultado["rodadas"])
+            registro["modelo"]["linhas_sobreposicao"] = resultado["linhas_sobreposicao"]
+    return resultado
 
 # ==============================
 # 6. Exportar solução em JSON
 # ==============================
 
-# Exporta a solução detalhada em formato tabular (DataFrame)
-# Apenas se houver solução viável -> dado que podemos receber "Feasible" com HiGHS
-if status_string == "Optimal" or status_string == "Feasible":
-    solution = []
-    for i in pessoas:
-        for j in tarefas:
-            for o in ocorrencias[j]:
-                for t in range(total_slots):
-                    if pulp.value(x[i][j][o][t]) > 0.99:
-                        # Cálculos de tempo
-                        slots_por_dia = (24 * 60) // duracao_slot
-                        inicio_slot = t
-                        fim_slot = t + duracao_tarefas[j]
-
-                        dia_inicio = (inicio_slot // slots_por_dia) + 1
-                        slot_no_dia_inicio = inicio_slot % slots_por_dia
-                        minutos_inicio = slot_no_dia_inicio * duracao_slot
-                        hora_inicio = f"{minutos_inicio // 60:02d}:{minutos_inicio % 60:02d}"
-
-                        dia_fim = (fim_slot // slots_por_dia) + 1
-                        slot_no_dia_fim = fim_slot % slots_por_dia
-                        minutos_fim = slot_no_dia_fim * duracao_slot
-                        hora_fim = f"{minutos_fim // 60:02d}:{minutos_fim % 60:02d}"
-
-                        # Adiciona à solução
-                        solution.append({
-                            "dia_inicio": dia_inicio,
-                            "hora_inicio": hora_inicio,
-                            "hora_fim": hora_fim,
-                            "pessoa": i,
-                            "tarefa": j,
-                            "ocorrencia": o,
-                            "inicio_slot": inicio_slot, # mantido para ordenação
-                            "fim_slot": fim_slot
-                        })
-
-    # Ordena por tempo global
-    solution = sorted(solution, key=lambda x: x["inicio_slot"])
-    
+def iterar_cronograma(param, alocacoes):
+    """
+    Gera as linhas do cronograma (dia, horários, pessoa, tarefa) para as alocações (idx_i, idx_j, o, t),
+    uma por vez e na ordem do slot de início, sem montar a lista inteira (ver `exportar_solucao`).
+    """
+    duracao_slot = param["duracao_slot"]
+    slots_por_dia = (24 * 60) // duracao_slot
+    if not len(alocacoes):
+        return
+    alocacoes = np.asarray(alocacoes, dtype=np.int64).reshape(-1, 4)
+    # Ordena por tempo global (estável: empates mantêm a ordem das alocações)
+    alocacoes = alocacoes[np.argsort(alocacoes[:, 3], kind="stable")]
+    for idx_i, idx_j, o, t in alocacoes.tolist():
+        i = param["pessoas"][idx_i]
+        j = param["tarefas"][idx_j]
+
+        # Cálculos de tempo
+        inicio_slot = t
+        fim_slot = inicio_slot + param["duracao_tarefas"][j]
+
+        dia_inicio = (inicio_slot // slots_por_dia) + 1
+        slot_no_dia_inicio = inicio_slot % slots_por_dia
+        minutos_inicio = slot_no_dia_inicio * duracao_slot
+        hora_inicio = f"{minutos_inicio // 60:02d}:{minutos_inicio % 60:02d}"
+
+        slot_no_dia_fim = fim_slot % slots_por_dia
+        minutos_fim = slot_no_dia_fim * duracao_slot
+        hora_fim = f"{minutos_fim // 60:02d}:{minutos_fim % 60:02d}"
+
+        yield {
+            "dia_inicio": dia_inicio,
+            "hora_inicio": hora_inicio,
+            "hora_fim": hora_fim,
+            "pessoa": i,
+            "tarefa": j,
+            "ocorrencia": o,
+            "inicio_slot": inicio_slot, # mantido para ordenação
+            "fim_slot": fim_slot
+        }
+
+def formatar_solucao(param, alocacoes):
+    """
+    Converte as alocações (idx_i, idx_j, o, t) em linhas do cronograma (dia, horários, pessoa, tarefa),
+    ordenadas pelo slot de início.
+    """
+    return list(iterar_cronograma(param, alocacoes))
+
+def calcular_cargas(param, alocacoes):
+    """
+    Carga (em slots) de cada pessoa para um conjunto de alocações (idx_i, idx_j, o, t).
+    """
+    cargas = {i: 0 for i in param["pessoas"]}
+    for idx_i, idx_j, _, _ in alocacoes:
+        cargas[param["pessoas"][idx_i]] += param["duracao_tarefas"][param["tarefas"][idx_j]]
+    return cargas
+
+def calcular_delta(param, cargas):
+    """
+    Maior diferença de % de carga (carga / limite) entre duas pessoas com limite > 0,
+    isto é, o menor Delta compatível com as restrições de balanceamento.
+    """
+    limite_carga = param["limite_carga"]
+    percentuais = [cargas[p] / limite_carga[p] for p in param["pessoas"]
+                   if p in limite_carga and limite_carga[p] > 0]
+    if len(percentuais) < 2:
+        return 0.0
+    return max(percentuais) - min(percentuais)
+
+def imprimir_cronograma(solution):
+    """
+    Impressão tabular no terminal (separada por dia).
+    """
+    import pandas as pd
+    from tabulate import tabulate
     # Cria DataFrame
     df = pd.DataFrame(solution)
 
-    # ---------------------------------------------------------
-    # Impressão tabular no terminal (separada por dia)
-    # ---------------------------------------------------------
     colunas_visuais = ['hora_inicio', 'hora_fim', 'pessoa', 'tarefa', 'ocorrencia']
-    
+
     print("\n" + "="*50)
     print("           CRONOGRAMA DETALHADO")
     print("="*50)
@@ -341,15 +811,328 @@ if status_string == "Optimal" or status_string == "Feasible":
     dias_unicos = sorted(df['dia_inicio'].unique())
 
     for dia in dias_unicos:
-        
+
         print(f"\n>>> DIA {dia}")
         df_dia = df[df['dia_inicio'] == dia][colunas_visuais]
-        
+
         # Opções de tablefmt: 'psql', 'grid', 'simple', 'github'
         print(tabulate(df_dia, headers='keys', tablefmt='psql', showindex=False))
-      
 
+def resumo_cargas(param, alocacoes):
+    """
+    Carga e utilização por pessoa: número de tarefas, horas alocadas, limite em horas e
+    utilização (carga / limite; None para quem não tem limite).
+    """
+    duracao_slot = param["duracao_slot"]
+    cargas = calcular_cargas(param, alocacoes)
+    tarefas_por_pessoa = np.bincount(np.asarray(alocacoes, dtype=np.int64).reshape(-1, 4)[:, 0],
+                                     minlength=len(param["pessoas"]))
+    resumo = []
+    for idx_i, i in enumerate(param["pessoas"]):
+        limite = param["limite_carga"].get(i)
+        resumo.append({
+            "pessoa": i,
+            "tarefas": int(tarefas_por_pessoa[idx_i]),
+            "carga_horas": cargas[i] * duracao_slot / 60,
+            "limite_horas": None if limite is None else limite * duracao_slot / 60,
+            "utilizacao": cargas[i] / limite if limite else None,
+        })
+    return resumo
+
+def _escrever_json(caminho_arquivo, cabecalho, cargas, linhas):
+    """
+    (Função interna) JSON com o cabeçalho, as cargas e o cronograma, escrito linha a linha.
+    """
+    with open(caminho_arquivo, "w", encoding="utf-8") as f:
+        f.write("{\n")
+        for chave, valor in cabecalho.items():
+            f.write(f'  "{chave}": {json.dumps(valor, ensure_ascii=False)},\n')
+        f.write(f'  "cargas": {json.dumps(cargas, ensure_ascii=False)},\n')
+        f.write('  "cronograma": [')
+        separador = "\n    "
+        for linha in linhas:
+            f.write(separador + json.dumps(linha, ensure_ascii=False))
+            separador = ",\n    "
+        f.write("\n  ]\n}\n")
+
+def _escrever_csv(caminho_arquivo, registros, colunas):
+    """
+    (Função interna) CSV escrito linha a linha a partir de um iterável de dicionários.
+    """
+    import csv
+    with open(caminho_arquivo, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas)
+        escritor.writeheader()
+        for registro in registros:
+            escritor.writerow(registro)
+
+def _escrever_parquet(caminho_arquivo, registros, colunas, tamanho_lote):
+    """
+    (Função interna) Parquet escrito em lotes de `tamanho_lote` linhas (um row group por lote).
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    escritor = None
+    lote = []
+    try:
+        for registro in itertools.chain(registros, [None]):
+            if registro is not None:
+                lote.append(registro)
+            if lote and (registro is None or len(lote) >= tamanho_lote):
+                tabela = pa.Table.from_pylist(lote)
+                if escritor is None:
+                    escritor = pq.ParquetWriter(caminho_arquivo, tabela.schema)
+                escritor.write_table(tabela)
+                lote = []
+        if escritor is None:
+            pq.write_table(pa.table({c: [] for c in colunas}), caminho_arquivo)
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+def exportar_solucao(param, resultado, caminho_arquivo, tamanho_lote=10000):
+    """
+    Grava o cronograma e o resumo de carga por pessoa. O formato vem da extensão:
+      - .json: um arquivo com status, objetivo, gap, delta, "cargas" e "cronograma";
+      - .csv / .parquet: o cronograma em `caminho_arquivo` e as cargas em `<nome>_cargas.<ext>`.
+    O cronograma é escrito à medida que é gerado (`iterar_cronograma`), sem montar DataFrame.
+    Retorna a lista de arquivos escritos, ou None se o formato não for suportado.
+    """
+    base, extensao = os.path.splitext(caminho_arquivo)
+    extensao = extensao.lower()
+    if extensao not in (".json", ".csv", ".parquet"):
+        print(f"Erro: formato '{extensao}' não suportado. Use .json, .csv ou .parquet.")
+        return None
+
+    alocacoes = resultado["alocacoes"]
+    cargas = resumo_cargas(param, alocacoes)
+    linhas = iterar_cronograma(param, alocacoes)
+    colunas_cronograma = ["dia_inicio", "hora_inicio", "hora_fim", "pessoa", "tarefa", "ocorrencia",
+                          "inicio_slot", "fim_slot"]
+    colunas_cargas = ["pessoa", "tarefas", "carga_horas", "limite_horas", "utilizacao"]
+
+    if extensao == ".json":
+        cabecalho = {
+            "status": resultado.get("status"),
+            "objetivo": resultado.get("objetivo"),
+            "gap": resultado.get("gap"),
+            "delta": calcular_delta(param, calcular_cargas(param, alocacoes)),
+        }
+        _escrever_json(caminho_arquivo, cabecalho, cargas, linhas)
+        arquivos = [caminho_arquivo]
+    elif extensao == ".csv":
+        arquivo_cargas = f"{base}_cargas.csv"
+        _escrever_csv(caminho_arquivo, linhas, colunas_cronograma)
+        _escrever_csv(arquivo_cargas, cargas, colunas_cargas)
+        arquivos = [caminho_arquivo, arquivo_cargas]
+    else:
+        try:
+            import pyarrow
+        except ImportError:
+            print("Erro: exportar em Parquet requer o pacote 'pyarrow' (pip install pyarrow).")
+            return None
+        arquivo_cargas = f"{base}_cargas.parquet"
+        _escrever_parquet(caminho_arquivo, linhas, colunas_cronograma, tamanho_lote)
+        _escrever_parquet(arquivo_cargas, cargas, colunas_cargas, tamanho_lote)
+        arquivos = [caminho_arquivo, arquivo_cargas]
+
+    print(f"Solução exportada em: {', '.join(arquivos)}")
+    return arquivos
+
+def comparar_backends(caminho_arquivo=ARQUIVO_PADRAO, time_limit=300, tolerancia=1e-6):
+    """
+    Resolve a mesma instância com os dois backends e confere se o valor ótimo é o mesmo.
+    Retorna True se os objetivos coincidem (dentro da tolerância).
+    """
+    data = pp.carregar_dados(caminho_arquivo)
+    if data is None:
+        return False
+    objetivos = {}
+    for backend in BACKENDS:
+        resultado = resolver(data, backend=backend, time_limit=time_limit, msg=False)
+        objetivos[backend] = resultado["objetivo"]
+        print(f"[{backend}] status: {resultado['status']}, objetivo: {resultado['objetivo']}, "
+              f"montagem: {resultado['tempo_montagem']:.2f}s, resolução: {resultado['tempo_resolucao']:.2f}s")
+
+    if any(obj is None for obj in objetivos.values()):
+        print("Comparação inválida: algum backend não encontrou solução.")
+        return False
+    iguais = abs(objetivos["pulp"] - objetivos["highs"]) <= tolerancia * max(1.0, abs(objetivos["pulp"]))
+    print("Objetivos iguais." if iguais else "ERRO: objetivos diferentes entre backends.")
+    return iguais
+
+def comparar_simetria(caminho_arquivo=ARQUIVO_PADRAO, backend="highs", time_limit=300, mip_start=False):
+    """
+    Resolve a mesma instância com cada tratamento de simetria (`SIMETRIAS`) e imprime uma
+    tabela com número de variáveis, status, objetivo, gap (backend highs) e tempos.
+    Com `mip_start` todas partem da agenda da heurística (útil quando o limite de tempo acaba
+    antes do solver achar uma solução sozinho). Retorna o DataFrame da tabela.
+    """
+    import pandas as pd
+    from tabulate import tabulate
+    data = pp.carregar_dados(caminho_arquivo)
+    if data is None:
+        return pd.DataFrame()
+    param = preparar_parametros(data)
+    inicial = None
+    if mip_start and backend == "highs":
+        import heuristica
+        inicial = heuristica.resolver_heuristica(param)
+    linhas = []
+    for modo in SIMETRIAS:
+        param_modelo = simetria_ocorrencias(param, modo)
+        if backend == "highs":
+            import modelo_highs
+            resultado = modelo_highs.resolver_highs(
+                param_modelo, time_limit=time_limit, msg=False,
+                solucao_inicial=agrupar_alocacoes(param_modelo, inicial["alocacoes"]) if inicial else None,
+            )
+        else:
+            resultado = resolver_pulp(param_modelo, time_limit=time_limit, msg=False)
+        linhas.append({
+            "simetria": modo,
+            "variaveis": len(enumerar_variaveis(param_modelo)["slot"]),
+            "status": resultado["status"],
+            "objetivo": resultado["objetivo"],
+            "gap": resultado.get("gap"),
+            "montagem_s": resultado["tempo_montagem"],
+            "resolucao_s": resultado["tempo_resolucao"],
+        })
+    tabela = pd.DataFrame(linhas)
+    print(tabulate(tabela, headers='keys', tablefmt='psql', showindex=False, floatfmt=".4f"))
+    return tabela
+
+def main():
+    parser = argparse.ArgumentParser(description="Alocação de tarefas da casa e do bebê (MILP).")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO, help="JSON de entrada")
+    parser.add_argument("--backend", choices=BACKENDS, default="pulp",
+                        help="pulp: modelo via PuLP; highs: matrizes passadas direto ao highspy")
+    parser.add_argument("--time-limit", type=float, default=300, help="limite de tempo do solver (s)")
+    parser.add_argument("--threads", type=int, help="número máximo de threads do solver")
+    parser.add_argument("--rapido", action="store_true",
+                        help="modo rápido: só a heurística construtiva, sem MILP")
+    parser.add_argument("--mip-start", action="store_true",
+                        help="usa a agenda da heurística como solução inicial do solver (backend highs)")
+    parser.add_argument("--comparar-backends", action="store_true",
+                        help="resolve com os dois backends e confere se o objetivo é o mesmo")
+    parser.add_argument("--simetria", choices=SIMETRIAS, default="nenhuma",
+                        help="ocorrências intercambiáveis: ordenar (quebra de simetria) ou agregar")
+    parser.add_argument("--balanceamento", choices=BALANCEAMENTOS, default="extremos",
+                        help="formulação de 4.9: extremos (U_max/U_min, O(P)) ou pares (O(P²))")
+    parser.add_argument("--sobreposicao", choices=SOBREPOSICOES, default="completa",
+                        help="4.2/4.3: todas as linhas ou só as violadas, rodada a rodada (backend highs)")
+    parser.add_argument("--horizonte-rolante", action="store_true",
+                        help="resolve janela a janela (ver horizonte_rolante.py); --time-limit vale por janela")
+    parser.add_argument("--janela-dias", type=float, default=1, help="horizonte rolante: dias fixados por janela")
+    parser.add_argument("--sobreposicao-horas", type=float, default=6,
+                        help="horizonte rolante: horas de sobreposição com a janela seguinte")
+    parser.add_argument("--comparar-simetria", action="store_true",
+                        help="resolve com cada tratamento de simetria e compara tempos e objetivos")
+    parser.add_argument("--sem-cache", action="store_true",
+                        help="ignora o cache em disco e refaz pré-processamento e montagem")
+    parser.add_argument("--cache-dir", default=".cache_modelo", help="pasta do cache do modelo")
+    parser.add_argument("--cache-limite-mb", type=float, default=512,
+                        help="tamanho máximo do cache; as entradas menos usadas são apagadas")
+    parser.add_argument("--sem-diagnostico", action="store_true",
+                        help="não confere a entrada (capacidade, janelas, cadeias) antes de montar o modelo")
+    parser.add_argument("--exportar", metavar="ARQUIVO",
+                        help="grava cronograma e cargas por pessoa (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true",
+                        help="não imprime o cronograma no terminal (útil em instâncias grandes)")
+    parser.add_argument("--log-json", help="grava tempos por fase, tamanho por família e progresso do solver em JSON")
+    parser.add_argument("--resumo", action="store_true",
+                        help="imprime um resumo da instrumentação (fases, famílias e progresso do solver)")
+    args = parser.parse_args()
+
+    registro = None
+    if args.log_json or args.resumo:
+        registro = instrumentacao.novo_registro(arquivo=args.arquivo, backend=args.backend, simetria=args.simetria,
+                                                balanceamento=args.balanceamento, sobreposicao=args.sobreposicao,
+                                                time_limit=args.time_limit,
+                                                cache=not args.sem_cache)
+
+    if args.comparar_backends:
+        raise SystemExit(0 if comparar_backends(args.arquivo, time_limit=args.time_limit) else 1)
+    if args.comparar_simetria:
+        comparar_simetria(args.arquivo, backend=args.backend, time_limit=args.time_limit,
+                          mip_start=args.mip_start)
+        return
+
+    if not args.sem_cache:
+        # Parâmetros (e, no backend highs, a matriz do modelo) vêm do cache quando a estrutura
+        # da entrada não mudou; se só α/aptidão mudaram, apenas os custos são recalculados.
+        import cache_modelo
+        with instrumentacao.fase(registro, "cache"):
+            carregado = cache_modelo.carregar_modelo(args.arquivo, backend=args.backend, simetria=args.simetria,
+                                                     balanceamento=args.balanceamento, diretorio=args.cache_dir,
+                                                     limite_mb=args.cache_limite_mb)
+        if carregado is None:
+            print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+            exit()
+        param, matrizes = carregado
+    else:
+        # Carrega e processa o JSON com funções utilitárias (converte janelas e disponibilidades
+        # em matrizes binárias numpy, calcula slots, etc.). O dicionário retornado contém tanto os dados
+        # originais quanto as chaves auxiliares `disponibilidade_pessoas_binaria`, `disponibilidade_tarefas_binaria`
+        # e `mascara_inicio` (pessoa x tarefa x slot: início possível com a duração completa).
+        with instrumentacao.fase(registro, "carregar_dados"):
+            data = pp.carregar_dados(args.arquivo)
+
+        if data is None:
+            print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+            exit()
+
+        with instrumentacao.fase(registro, "preparar_parametros"):
+            param = preparar_parametros(data)
+        matrizes = None
+
+    # Diagnóstico de inviabilidade antes de montar o modelo (milissegundos): aponta a tarefa,
+    # pessoa ou dia em vez de esperar o solver declarar "Infeasible"
+    if not args.sem_diagnostico:
+        import diagnostico
+        with instrumentacao.fase(registro, "diagnostico"):
+            problemas = diagnostico.diagnosticar(param)
+        if problemas:
+            diagnostico.imprimir_diagnostico(problemas)
+            print("Erro fatal: a entrada é inviável. Encerrando.")
+            exit()
+
+    if args.horizonte_rolante:
+        # Uma janela de dias por vez (sempre com highspy); backend, simetria e mip_start não se aplicam
+        import horizonte_rolante
+        print ("Alpha (α) utilizado: ", param["alpha"] )
+        with instrumentacao.fase(registro, "solver"):
+            resultado = horizonte_rolante.resolver_horizonte_rolante(param, janela_dias=args.janela_dias,
+                                                                     sobreposicao_horas=args.sobreposicao_horas,
+                                                                     time_limit=args.time_limit)
+        print(f"Status do Modelo: {resultado['status']}")
+        if resultado["objetivo"] is None:
+            print("\nO horizonte rolante NÃO ENCONTROU uma solução viável.")
+        else:
+            print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+        resultado["solucao"] = formatar_solucao(param, resultado["alocacoes"])
+    else:
+        resultado = resolver_parametros(param, backend=args.backend, time_limit=args.time_limit,
+                                        rapido=args.rapido, mip_start=args.mip_start, simetria=args.simetria,
+                                        balanceamento=args.balanceamento, sobreposicao=args.sobreposicao,
+                                        matrizes=matrizes, registro=registro, threads=args.threads)
+
+    # Imprime a solução detalhada em formato tabular (DataFrame) e/ou exporta em arquivo
+    # Apenas se houver solução viável -> dado que podemos receber "Feasible" com HiGHS
+    if resultado["objetivo"] is not None:
+        if not args.sem_cronograma:
+            imprimir_cronograma(resultado["solucao"])
+        if args.exportar:
+            with instrumentacao.fase(registro, "exportacao"):
+                exportar_solucao(param, resultado, args.exportar)
+    else:
+        print("\nNenhuma solução viável foi encontrada para exportar.")
+
+    if args.resumo:
+        instrumentacao.imprimir_resumo(registro)
+    if args.log_json:
+        instrumentacao.salvar_log(registro, args.log_json)
 
-else:
-    print("\nNenhuma solução viável foi encontrada para exportar.")
 
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+import math
+import itertools
+import time
+import numpy as np
+import highspy
+
+from model import enumerar_variaveis, calcular_cargas, calcular_delta, limite_ate_prazo
+import instrumentacao
+
+
+# Backend alternativo: monta a mesma formulação de `model.py` (objetivo e restrições 4.1 a 4.10)
+# diretamente como arrays (formato COO -> CSR) e passa o modelo ao highspy em memória,
+# sem criar objetos LpVariable/lpSum nem arquivos intermediários.
+# As colunas seguem a ordem de `enumerar_variaveis(param)`; a última coluna é o Delta do balanceamento.
+
+def _expandir_intervalos(inicio, fim):
+    """
+    (Função interna) Para os intervalos [inicio_k, fim_k), retorna os arrays (k, posição)
+    com uma entrada por elemento de cada intervalo, concatenados em ordem.
+    """
+    tamanho = np.maximum(fim - inicio, 0)
+    k = np.repeat(np.arange(len(inicio)), tamanho)
+    deslocamento = np.arange(tamanho.sum()) - np.repeat(np.cumsum(tamanho) - tamanho, tamanho)
+    return k, inicio[k] + deslocamento
+
+def _adicionar_linhas(matriz, familia, linhas, colunas, valores, lower, upper):
+    """
+    (Função interna) Acrescenta um bloco de restrições à matriz em construção.
+    `linhas` é local ao bloco (0..n_linhas-1); `lower`/`upper` têm uma entrada por linha.
+    O tempo registrado para a família é o decorrido desde o bloco anterior (o código que a montou).
+    """
+    n_linhas = len(lower)
+    matriz["linhas"].append(np.asarray(linhas, dtype=np.int64) + matriz["num_linhas"])
+    matriz["colunas"].append(np.asarray(colunas, dtype=np.int64))
+    matriz["valores"].append(np.asarray(valores, dtype=np.float64))
+    matriz["lower"].append(np.asarray(lower, dtype=np.float64))
+    matriz["upper"].append(np.asarray(upper, dtype=np.float64))
+    agora = time.perf_counter()
+    matriz["familias"].append((familia, n_linhas, len(colunas), agora - matriz["relogio"]))
+    matriz["relogio"] = agora
+    matriz["num_linhas"] += n_linhas
+
+def _linhas_de_cobertura(chave, colunas):
+    """
+    (Função interna) Agrupa as entradas (chave, coluna) de cobertura de slots em linhas "<= 1",
+    descartando chaves cobertas por uma única variável (restrição trivial).
+    """
+    chaves, inverso, contagem = np.unique(chave, return_inverse=True, return_counts=True)
+    manter = contagem[inverso] > 1
+    novas_linhas = np.cumsum(contagem > 1) - 1
+    return novas_linhas[inverso[manter]], colunas[manter], int((contagem > 1).sum())
+
+def custos_objetivo(param, variaveis, n_colunas):
+    """
+    Vetor de custos: (1 - c_{i,j}) em cada x e alpha em Delta (U_max/U_min, se houver, com custo 0).
+    Só depende da aptidão e de alpha, então pode ser recalculado sobre matrizes já montadas.
+    """
+    capacidade = np.array([[param["capacidade"][i][j] for j in param["tarefas"]] for i in param["pessoas"]],
+                          dtype=np.float64)
+    n_x = len(variaveis["slot"])
+    custo = np.zeros(n_colunas)
+    custo[:n_x] = 1 - capacidade[variaveis["pessoa"], variaveis["tarefa"]]
+    custo[n_x] = param["alpha"]
+    return custo
+
+def montar_matrizes(param, variaveis=None, balanceamento=None, sobreposicao=True):
+    """
+    Monta objetivo, limites e matriz de restrições da formulação em arrays numpy.
+    `balanceamento` força (True) ou omite (False) as linhas de 4.9; por padrão elas só
+    entram com alpha > 0, como em `model.py`. A formulação de 4.9 vem de
+    `param["modo_balanceamento"]` ("extremos", padrão, ou "pares").
+    Com `sobreposicao=False` as linhas de 4.2 e 4.3 são trocadas pela soma delas em cada dia
+    (geração preguiçosa, ver `resolver_highs_preguicoso`).
+    Retorna um dicionário com "variaveis", "custo", "col_lower", "col_upper", "row_lower",
+    "row_upper", "inicio", "indice", "valor" (CSR por linha), "integralidade", "familias"
+    (nome, número de linhas, de não-nulos e segundos de montagem de cada família de restrições,
+    mais as etapas "variaveis_objetivo" e "conversao_csr", sem linhas) e "colunas_extremos"
+    ((U_max, U_min) no modo "extremos", senão None).
+    """
+    pessoas = param["pessoas"]
+    tarefas = param["tarefas"]
+    duracao_slot = param["duracao_slot"]
+    total_slots = param["total_slots"]
+    alpha = param["alpha"]
+    ocorrencias = param["ocorrencias"]
+    dependencias = param["dependencias"]
+    limite_carga = param["limite_carga"]
+    inicio_montagem = time.perf_counter()
+    if variaveis is None:
+        variaveis = enumerar_variaveis(param)
+    if balanceamento is None:
+        balanceamento = alpha > 0
+
+    pessoa = variaveis["pessoa"]
+    tarefa = variaveis["tarefa"]
+    ocorrencia = variaveis["ocorrencia"]
+    slot = variaveis["slot"]
+    n_x = len(slot)
+    coluna_delta = n_x
+    colunas_x = np.arange(n_x)
+
+    # Balanceamento por extremos: duas colunas a mais (U_max, U_min) depois de Delta
+    pessoas_validas = [p for p in pessoas if p in limite_carga and limite_carga[p] > 0]
+    extremos = (bool(limite_carga) and balanceamento and len(pessoas_validas) >= 2
+                and param.get("modo_balanceamento", "extremos") == "extremos")
+    colunas_extremos = (n_x + 1, n_x + 2) if extremos else None
+    n_colunas = n_x + 3 if extremos else n_x + 1
+
+    duracao = np.array([param["duracao_tarefas"][j] for j in tarefas], dtype=np.int64)[tarefa]
+    eh_bebe = np.array([j in param["tarefas_bebe"] for j in tarefas])[tarefa]
+
+    # ==============================
+    # 3. Função Objetivo
+    # ==============================
+    custo = custos_objetivo(param, variaveis, n_colunas)
+
+    relogio = time.perf_counter()
+    matriz = {"linhas": [], "colunas": [], "valores": [], "lower": [], "upper": [],
+              "familias": [("variaveis_objetivo", 0, 0, relogio - inicio_montagem)], "num_linhas": 0, "relogio": relogio}
+
+    # 4.1 Cada ocorrência de tarefa deve ser realizada exatamente uma vez
+    # (as ocorrências de cada tarefa podem ser um subconjunto qualquer, ex.: horizonte rolante).
+    # Em cadeias periódicas só a primeira ocorrência tem linha: as seguintes ficam implícitas
+    # pelas igualdades de 4.7. Ocorrências agregadas por `simetria_ocorrencias(...)` são feitas n_j vezes.
+    multiplicidade = param.get("multiplicidade", {})
+    linha_ocorrencia = np.full((len(tarefas), max([o + 1 for j in tarefas for o in ocorrencias[j]], default=1)), -1)
+    lado_direito = []
+    for idx_j, j in enumerate(tarefas):
+        for o in ocorrencias[j]:
+            if j in param["periodicidade"] and o - 1 in ocorrencias[j]:
+                continue
+            linha_ocorrencia[idx_j, o] = len(lado_direito)
+            lado_direito.append(float(multiplicidade.get(j, 1)))
+    linha_x = linha_ocorrencia[tarefa, ocorrencia]
+    com_linha = linha_x >= 0
+    _adicionar_linhas(matriz, "4.1_ocorrencia", linha_x[com_linha], colunas_x[com_linha], np.ones(com_linha.sum()),
+                      lado_direito, lado_direito)
+
+    # Cobertura: cada variável ocupa os slots [t, t + d_j)
+    k, slot_coberto = _expandir_intervalos(slot, slot + duracao)
+
+    bebe = eh_bebe[k]
+    if sobreposicao:
+        # 4.2 Não sobreposição de tarefas por pessoa
+        linhas, colunas, n_linhas = _linhas_de_cobertura(pessoa[k] * total_slots + slot_coberto, k)
+        _adicionar_linhas(matriz, "4.2_sobreposicao_pessoa", linhas, colunas, np.ones(len(colunas)),
+                          np.full(n_linhas, -np.inf), np.ones(n_linhas))
+
+        # 4.3 Não sobreposição de tarefas do bebê
+        linhas, colunas, n_linhas = _linhas_de_cobertura(slot_coberto[bebe], k[bebe])
+        _adicionar_linhas(matriz, "4.3_sobreposicao_bebe", linhas, colunas, np.ones(len(colunas)),
+                          np.full(n_linhas, -np.inf), np.ones(n_linhas))
+    else:
+        # Relaxação agregada: soma das linhas de 4.2 de cada (pessoa, dia) e de 4.3 de cada dia,
+        # <= slots do dia. Cada x entra com o número de slots que ocupa naquele dia.
+        slots_por_dia = (24 * 60) // duracao_slot
+        n_dias = -(-total_slots // slots_por_dia)
+        chave = np.concatenate((pessoa[k] * n_dias + slot_coberto // slots_por_dia,
+                                len(pessoas) * n_dias + slot_coberto[bebe] // slots_por_dia))
+        pares, contagem = np.unique(chave * n_x + np.concatenate((k, k[bebe])), return_counts=True)
+        _, linhas = np.unique(pares // n_x, return_inverse=True)
+        n_linhas = int(linhas.max()) + 1 if len(linhas) else 0
+        _adicionar_linhas(matriz, "4.2_4.3_agregadas_dia", linhas, pares % n_x, contagem,
+                          np.full(n_linhas, -np.inf), np.full(n_linhas, float(slots_por_dia)))
+
+    # 4.4 e 4.5 garantidas pelo índice de viabilidade (variáveis inexistentes).
+
+    # 4.6 Precedência entre tarefas, uma linha por (o, t2):
+    # sum_{i1, t1 na janela} x[i1][j1][o][t1] - sum_{i2} x[i2][j2][o][t2] >= 0
+    linhas, colunas, valores = [], [], []
+    n_linhas = 0
+    for j1_id in dependencias:
+        j2_id = dependencias[j1_id]["proxima_tarefa"]
+        W = math.ceil(dependencias[j1_id]["janela_de_espera"] / duracao_slot)
+        d_j1 = param["duracao_tarefas"][j1_id]
+        idx_j1, idx_j2 = tarefas.index(j1_id), tarefas.index(j2_id)
+
+        for o in ocorrencias[j1_id]:
+            if o not in ocorrencias[j2_id]:
+                continue
+            cols_j1 = np.flatnonzero((tarefa == idx_j1) & (ocorrencia == o))
+            cols_j1 = cols_j1[np.argsort(slot[cols_j1], kind="stable")]
+            cols_j2 = np.flatnonzero((tarefa == idx_j2) & (ocorrencia == o))
+            t2, linha_j2 = np.unique(slot[cols_j2], return_inverse=True)
+
+            # Uma linha por início t2 de j2; janela de j1 localizada por busca binária
+            a = np.searchsorted(slot[cols_j1], np.maximum(t2 - d_j1 - W, 0), side="left")
+            b = np.searchsorted(slot[cols_j1], t2 - d_j1, side="right")
+            linha_local, pos = _expandir_intervalos(a, b)
+            linhas += [n_linhas + linha_local, n_linhas + linha_j2]
+            colunas += [cols_j1[pos], cols_j2]
+            valores += [np.ones(len(pos)), -np.ones(len(cols_j2))]
+            n_linhas += len(t2)
+    if n_linhas:
+        _adicionar_linhas(matriz, "4.6_precedencia", np.concatenate(linhas), np.concatenate(colunas),
+                          np.concatenate(valores), np.zeros(n_linhas), np.full(n_linhas, np.inf))
+
+    # 4.7 Periodicidade: sum_i x[i][j][o][t1] - sum_i x[i][j][o+1][t1 + P_j] == 0
+    linhas, colunas, valores = [], [], []
+    n_linhas = 0
+    for j, P_j in param["periodicidade"].items():
+        P_j_slots = math.ceil(P_j / duracao_slot)
+        cols_j = np.flatnonzero(tarefa == tarefas.index(j))
+        o_j, t_j = ocorrencia[cols_j], slot[cols_j]
+        lado_esq = np.isin(o_j + 1, list(ocorrencias[j]))   # aparece como x[o][t1] na linha (o, t1)
+        lado_dir = np.isin(o_j - 1, list(ocorrencias[j]))   # aparece como x[o+1][t2] na linha (o, t2 - P)
+        chave = np.concatenate((o_j[lado_esq] * total_slots + t_j[lado_esq],
+                                (o_j[lado_dir] - 1) * total_slots + t_j[lado_dir] - P_j_slots))
+        chaves, inverso = np.unique(chave, return_inverse=True)
+        linhas.append(n_linhas + inverso)
+        colunas.append(np.concatenate((cols_j[lado_esq], cols_j[lado_dir])))
+        valores.append(np.concatenate((np.ones(lado_esq.sum()), -np.ones(lado_dir.sum()))))
+        n_linhas += len(chaves)
+    if n_linhas:
+        _adicionar_linhas(matriz, "4.7_periodicidade", np.concatenate(linhas), np.concatenate(colunas),
+                          np.concatenate(valores), np.zeros(n_linhas), np.zeros(n_linhas))
+
+    # 4.10 Quebra de simetria: sum t * x[o] - sum t * x[o_seguinte] <= 0
+    linhas, colunas, valores = [], [], []
+    n_linhas = 0
+    for j, pares in param.get("ordem_ocorrencias", {}).items():
+        cols_j = np.flatnonzero(tarefa == tarefas.index(j))
+        for o, o_seguinte in pares:
+            cols_o = cols_j[ocorrencia[cols_j] == o]
+            cols_seguinte = cols_j[ocorrencia[cols_j] == o_seguinte]
+            linhas.append(np.full(len(cols_o) + len(cols_seguinte), n_linhas))
+            colunas.append(np.concatenate((cols_o, cols_seguinte)))
+            valores.append(np.concatenate((slot[cols_o], -slot[cols_seguinte])).astype(np.float64))
+            n_linhas += 1
+    if n_linhas:
+        _adicionar_linhas(matriz, "4.10_simetria", np.concatenate(linhas), np.concatenate(colunas),
+                          np.concatenate(valores), np.full(n_linhas, -np.inf), np.zeros(n_linhas))
+
+    # 4.8 e 4.9 : Limites e Balanceamento
+    cols_pessoa = {i: np.flatnonzero(pessoa == idx_i) for idx_i, i in enumerate(pessoas)}
+
+    # Carga já comprometida fora do modelo (ex.: dias anteriores no horizonte rolante)
+    carga_fixa = param.get("carga_fixa", {})
+
+    # Limite máximo de carga (em slots): sum d_j x[i][j][o][t] <= L_i
+    pessoas_limite = [i for i in pessoas if i in limite_carga]
+    if pessoas_limite:
+        _adicionar_linhas(
+            matriz, "4.8_limite_carga",
+            np.concatenate([np.full(len(cols_pessoa[i]), n) for n, i in enumerate(pessoas_limite)]),
+            np.concatenate([cols_pessoa[i] for i in pessoas_limite]),
+            np.concatenate([duracao[cols_pessoa[i]] for i in pessoas_limite]),
+            np.full(len(pessoas_limite), -np.inf),
+            np.array([limite_carga[i] - carga_fixa.get(i, 0) for i in pessoas_limite], dtype=np.float64),
+        )
+
+    # Balanceamento (extremos): carga_p/L_p - U_max <= 0 e carga_p/L_p - U_min >= 0 por pessoa,
+    # e U_max - U_min - Delta <= 0 (a parte fixa da carga vai para o lado direito)
+    if extremos:
+        coluna_u_max, coluna_u_min = colunas_extremos
+        linhas, colunas, valores, lower, upper = [], [], [], [], []
+        n_linhas = 0
+        for p in pessoas_validas:
+            L_p = float(limite_carga[p])
+            for coluna_u, limites in ((coluna_u_max, (-np.inf, 0.0)), (coluna_u_min, (0.0, np.inf))):
+                lower.append(limites[0] - carga_fixa.get(p, 0) / L_p)
+                upper.append(limites[1] - carga_fixa.get(p, 0) / L_p)
+                linhas.append(np.full(len(cols_pessoa[p]) + 1, n_linhas))
+                colunas.append(np.concatenate((cols_pessoa[p], [coluna_u])))
+                valores.append(np.concatenate((duracao[cols_pessoa[p]] / L_p, [-1.0])))
+                n_linhas += 1
+        linhas.append(np.full(3, n_linhas))
+        colunas.append(np.array([coluna_u_max, coluna_u_min, coluna_delta]))
+        valores.append(np.array([1.0, -1.0, -1.0]))
+        lower.append(-np.inf)
+        upper.append(0.0)
+        n_linhas += 1
+        _adicionar_linhas(matriz, "4.9_balanceamento", np.concatenate(linhas), np.concatenate(colunas),
+                          np.concatenate(valores), np.array(lower), np.array(upper))
+
+    # Balanceamento (pares): carga_p1/L1 - carga_p2/L2 - Delta <= 0 e o simétrico
+    # (a parte fixa da carga vai para o lado direito)
+    elif limite_carga and balanceamento:
+        linhas, colunas, valores, upper = [], [], [], []
+        n_linhas = 0
+        for p1, p2 in itertools.combinations(pessoas_validas, 2):
+            L1 = float(limite_carga[p1])
+            L2 = float(limite_carga[p2])
+            diferenca_fixa = carga_fixa.get(p1, 0) / L1 - carga_fixa.get(p2, 0) / L2
+            for sinal in (1.0, -1.0):
+                upper.append(-sinal * diferenca_fixa)
+                cols = np.concatenate((cols_pessoa[p1], cols_pessoa[p2], [coluna_delta]))
+                vals = np.concatenate((sinal * duracao[cols_pessoa[p1]] / L1,
+                                       -sinal * duracao[cols_pessoa[p2]] / L2, [-1.0]))
+                linhas.append(np.full(len(cols), n_linhas))
+                colunas.append(cols)
+                valores.append(vals)
+                n_linhas += 1
+        if n_linhas:
+            _adicionar_linhas(matriz, "4.9_balanceamento", np.concatenate(linhas), np.concatenate(colunas),
+                              np.concatenate(valores), np.full(n_linhas, -np.inf), np.array(upper))
+
+    # COO -> CSR (linhas ordenadas, ordem das colunas preservada dentro de cada linha)
+    linhas = np.concatenate(matriz["linhas"])
+    ordem = np.argsort(linhas, kind="stable")
+    inicio = np.concatenate(([0], np.cumsum(np.bincount(linhas, minlength=matriz["num_linhas"]))))
+
+    col_upper = np.ones(n_colunas)
+    col_upper[n_x:] = np.inf
+    indice = np.concatenate(matriz["colunas"])[ordem]
+    valor = np.concatenate(matriz["valores"])[ordem]
+    matriz["familias"].append(("conversao_csr", 0, 0, time.perf_counter() - matriz["relogio"]))
+
+    return {
+        "variaveis": variaveis,
+        "coluna_delta": coluna_delta,
+        "custo": custo,
+        "col_lower": np.zeros(n_colunas),
+        "col_upper": col_upper,
+        "row_lower": np.concatenate(matriz["lower"]),
+        "row_upper": np.concatenate(matriz["upper"]),
+        "inicio": inicio,
+        "indice": indice,
+        "valor": valor,
+        "integralidade": np.concatenate((np.ones(n_x, dtype=np.uint8), np.zeros(n_colunas - n_x, dtype=np.uint8))),
+        "familias": matriz["familias"],
+        "colunas_extremos": colunas_extremos,
+    }
+
+def criar_highs(matrizes, time_limit=300, msg=True, threads=None):
+    """
+    Cria a instância highspy.Highs com o modelo das matrizes já carregado em memória.
+    `threads` limita as threads do solver (ex.: vários processos na mesma máquina, ver `lote.py`).
+    """
+    lp = highspy.HighsLp()
+    lp.num_col_ = len(matrizes["custo"])
+    lp.num_row_ = len(matrizes["row_lower"])
+    lp.col_cost_ = matrizes["custo"]
+    lp.col_lower_ = matrizes["col_lower"]
+    lp.col_upper_ = matrizes["col_upper"]
+    lp.row_lower_ = matrizes["row_lower"]
+    lp.row_upper_ = matrizes["row_upper"]
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+    lp.a_matrix_.start_ = matrizes["inicio"]
+    lp.a_matrix_.index_ = matrizes["indice"]
+    lp.a_matrix_.value_ = matrizes["valor"]
+    lp.integrality_ = [
+        highspy.HighsVarType.kInteger if inteira else highspy.HighsVarType.kContinuous
+        for inteira in matrizes["integralidade"]
+    ]
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", bool(msg))
+    if time_limit is not None:
+        h.setOptionValue("time_limit", float(time_limit))
+    if threads is not None:
+        h.setOptionValue("threads", int(threads))
+    h.passModel(lp)
+    return h
+
+def status_highs(h):
+    """
+    Traduz o status do HiGHS para os nomes usados em `model.py` ("Optimal", "Feasible", ...).
+    """
+    status = h.getModelStatus()
+    if status == highspy.HighsModelStatus.kOptimal:
+        return "Optimal"
+    if status in (highspy.HighsModelStatus.kInfeasible, highspy.HighsModelStatus.kUnboundedOrInfeasible):
+        return "Infeasible"
+    # Limite de tempo/iterações com incumbente: solução viável com gap
+    if h.getInfo().primal_solution_status == 2:
+        return "Feasible"
+    return "Not Solved"
+
+def indice_colunas(matrizes):
+    """
+    Dicionário (idx_i, idx_j, o, t) -> coluna x do modelo, na ordem de `matrizes["variaveis"]`.
+    """
+    variaveis = matrizes["variaveis"]
+    return {
+        chave: k for k, chave in enumerate(zip(
+            variaveis["pessoa"].tolist(), variaveis["tarefa"].tolist(),
+            variaveis["ocorrencia"].tolist(), variaveis["slot"].tolist(),
+        ))
+    }
+
+def vetor_solucao(param, matrizes, alocacoes):
+    """
+    Converte alocações (idx_i, idx_j, o, t) no vetor de colunas do modelo (x, Delta e, no
+    balanceamento por extremos, U_max/U_min), para usar como solução inicial (MIP start).
+    """
+    coluna = indice_colunas(matrizes)
+    valores = np.zeros(len(matrizes["custo"]))
+    for alocacao in alocacoes:
+        valores[coluna[tuple(int(v) for v in alocacao)]] = 1.0
+    cargas = calcular_cargas(param, alocacoes)
+    valores[matrizes["coluna_delta"]] = calcular_delta(param, cargas)
+    if matrizes["colunas_extremos"] is not None:
+        carga_fixa = param.get("carga_fixa", {})
+        percentuais = [(cargas[p] + carga_fixa.get(p, 0)) / param["limite_carga"][p] for p in param["pessoas"]
+                       if p in param["limite_carga"] and param["limite_carga"][p] > 0]
+        valores[list(matrizes["colunas_extremos"])] = max(percentuais), min(percentuais)
+        valores[matrizes["coluna_delta"]] = max(percentuais) - min(percentuais)
+    return valores
+
+def definir_solucao_inicial(h, valores):
+    """
+    Passa ao HiGHS um vetor completo de colunas como solução inicial.
+    """
+    solucao = highspy.HighsSolution()
+    solucao.col_value = list(valores)
+    solucao.value_valid = True
+    h.setSolution(solucao)
+
+def definir_solucao_parcial(h, colunas, valores):
+    """
+    Passa ao HiGHS uma solução inicial parcial (só algumas colunas); o HiGHS tenta completá-la.
+    """
+    h.setSolution(len(colunas), np.asarray(colunas, dtype=np.int32), np.asarray(valores, dtype=np.float64))
+
+def extrair_alocacoes(h, matrizes):
+    """
+    Lê o vetor primal do HiGHS de uma vez e devolve as alocações ativas (idx_i, idx_j, o, t).
+    """
+    valores = np.asarray(h.getSolution().col_value)[: matrizes["coluna_delta"]]
+    # Seleção vetorial das variáveis ativas
+    ativas = np.flatnonzero(valores > 0.99)
+    variaveis = matrizes["variaveis"]
+    return list(zip(
+        variaveis["pessoa"][ativas].tolist(), variaveis["tarefa"][ativas].tolist(),
+        variaveis["ocorrencia"][ativas].tolist(), variaveis["slot"][ativas].tolist(),
+    ))
+
+def resolver_highs(param, time_limit=300, msg=True, solucao_inicial=None, matrizes=None, registro=None,
+                   threads=None, prazo=None):
+    """
+    Monta as matrizes e resolve com highspy em memória.
+    `solucao_inicial` (alocações (idx_i, idx_j, o, t), ex.: da heurística) é passada como MIP start;
+    `matrizes` já montadas (ex.: do cache) evitam a montagem.
+    `registro` (de `instrumentacao.novo_registro()`) recebe tempos por fase e família e o progresso do solver.
+    Com `prazo`, o limite de tempo é recalculado logo antes de resolver (`model.limite_ate_prazo`).
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)`.
+    """
+    inicio = time.perf_counter()
+    with instrumentacao.fase(registro, "montagem"):
+        if matrizes is None:
+            matrizes = montar_matrizes(param)
+    with instrumentacao.fase(registro, "carga_highs"):
+        h = criar_highs(matrizes, time_limit=time_limit, msg=msg, threads=threads)
+    if solucao_inicial:
+        with instrumentacao.fase(registro, "solucao_inicial"):
+            definir_solucao_inicial(h, vetor_solucao(param, matrizes, solucao_inicial))
+    tempo_montagem = time.perf_counter() - inicio
+    print(f"Variáveis x criadas: {matrizes['coluna_delta']}")
+    if registro is not None:
+        instrumentacao.registrar_familias(registro, matrizes["familias"])
+        registro["modelo"]["variaveis"] = len(matrizes["custo"])
+        instrumentacao.acompanhar_highs(registro, h)
+
+    if prazo is not None:
+        h.setOptionValue("time_limit", float(limite_ate_prazo(time_limit, prazo)))
+    inicio = time.perf_counter()
+    with instrumentacao.fase(registro, "solver"):
+        h.run()
+    tempo_resolucao = time.perf_counter() - inicio
+
+    status_string = status_highs(h)
+    resultado = {
+        "status": status_string,
+        "objetivo": None,
+        "alocacoes": [],
+        "tempo_montagem": tempo_montagem,
+        "tempo_resolucao": tempo_resolucao,
+    }
+    if status_string == "Optimal" or status_string == "Feasible":
+        info = h.getInfo()
+        resultado["objetivo"] = info.objective_function_value
+        resultado["gap"] = info.mip_gap
+        with instrumentacao.fase(registro, "extracao"):
+            resultado["alocacoes"] = extrair_alocacoes(h, matrizes)
+    return resultado
+
+# ====================================================================
+# Geração preguiçosa de 4.2/4.3: só as linhas violadas pelo incumbente
+# ====================================================================
+
+def linhas_sobreposicao(param, variaveis):
+    """
+    Todas as linhas de 4.2 e 4.3 com mais de uma variável, sem montá-las na matriz.
+    Retorna um dicionário com "chave" (pessoa * total_slots + slot em 4.2; n_pessoas * total_slots + slot
+    em 4.3), "inicio" e "tamanho" de cada linha em "colunas" (colunas agrupadas por linha).
+    """
+    total_slots = param["total_slots"]
+    duracao = np.array([param["duracao_tarefas"][j] for j in param["tarefas"]], dtype=np.int64)[variaveis["tarefa"]]
+    eh_bebe = np.array([j in param["tarefas_bebe"] for j in param["tarefas"]])[variaveis["tarefa"]]
+    k, slot_coberto = _expandir_intervalos(variaveis["slot"], variaveis["slot"] + duracao)
+    bebe = eh_bebe[k]
+    chave = np.concatenate((variaveis["pessoa"][k] * total_slots + slot_coberto,
+                            len(param["pessoas"]) * total_slots + slot_coberto[bebe]))
+    colunas = np.concatenate((k, k[bebe]))
+    ordem = np.argsort(chave, kind="stable")
+    chaves, inicio, tamanho = np.unique(chave[ordem], return_index=True, return_counts=True)
+    manter = tamanho > 1
+    return {"chave": chaves[manter], "inicio": inicio[manter], "tamanho": tamanho[manter], "colunas": colunas[ordem]}
+
+def resolver_highs_preguicoso(param, time_limit=300, msg=True, solucao_inicial=None, max_rodadas=100, margem=None,
+                              threads=None, prazo=None):
+    """
+    Resolve sem as linhas de 4.2 e 4.3 (só a soma delas por dia). A cada rodada confere o incumbente,
+    acrescenta ao modelo apenas as linhas de 4.2/4.3 violadas e resolve de novo, até a agenda não ter
+    sobreposições. Junto com cada linha violada entram as do mesmo recurso (pessoa ou bebê) a até
+    `margem` slots dela (padrão: a maior duração de tarefa), senão o conflito só muda de slot na rodada
+    seguinte. `time_limit` vale para todas as rodadas juntas; `solucao_inicial` (viável no modelo
+    completo, portanto em todas as rodadas) é passada como MIP start em cada rodada. Com `prazo` (instante
+    de `time.perf_counter()`), nenhuma rodada passa dele.
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)` com "rodadas" (violações, linhas
+    acrescentadas, objetivo e tempo de cada rodada) e "linhas_sobreposicao" (acrescentadas e total possível).
+    """
+    inicio = time.perf_counter()
+    matrizes = montar_matrizes(param, sobreposicao=False)
+    cobertura = linhas_sobreposicao(param, matrizes["variaveis"])
+    h = criar_highs(matrizes, time_limit=time_limit, msg=msg, threads=threads)
+    valores_iniciais = vetor_solucao(param, matrizes, solucao_inicial) if solucao_inicial else None
+    n_x = matrizes["coluna_delta"]
+    total_slots = param["total_slots"]
+    if margem is None:
+        margem = max(param["duracao_tarefas"].values())
+    acrescentada = np.zeros(len(cobertura["chave"]), dtype=bool)
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": time.perf_counter() - inicio,
+                 "tempo_resolucao": 0.0, "rodadas": [],
+                 "linhas_sobreposicao": {"acrescentadas": 0, "total": len(cobertura["chave"])}}
+    print(f"Variáveis x criadas: {n_x}")
+
+    inicio = time.perf_counter()
+    for rodada in range(1, max_rodadas + 1):
+        restante = limite_ate_prazo(time_limit - (time.perf_counter() - inicio), prazo)
+        if restante <= 0:
+            print("Geração preguiçosa: tempo esgotado com sobreposições na agenda.")
+            resultado["status"] = "Not Solved"
+            break
+        h.setOptionValue("time_limit", float(restante))
+        if valores_iniciais is not None:
+            definir_solucao_inicial(h, valores_iniciais)
+        t0 = time.perf_counter()
+        h.run()
+        status_string = status_highs(h)
+        resultado["status"] = status_string
+        if status_string != "Optimal" and status_string != "Feasible":
+            break
+
+        # Ocupação de cada linha possível de 4.2/4.3 no incumbente
+        ativas = np.asarray(h.getSolution().col_value)[:n_x] > 0.5
+        ocupacao = np.add.reduceat(ativas[cobertura["colunas"]].astype(np.int64), cobertura["inicio"]) \
+            if len(cobertura["inicio"]) else np.zeros(0, dtype=np.int64)
+        violadas = np.flatnonzero(ocupacao > 1)
+        objetivo = h.getInfo().objective_function_value
+        resultado["rodadas"].append({"rodada": rodada, "status": status_string, "objetivo": objetivo,
+                                     "violacoes": len(violadas), "tempo_s": time.perf_counter() - t0})
+        print(f"Rodada {rodada}: {status_string}, objetivo {objetivo:.4f}, {len(violadas)} linhas de 4.2/4.3 "
+              f"violadas, {time.perf_counter() - t0:.2f}s")
+        if not len(violadas):
+            info = h.getInfo()
+            resultado["objetivo"] = info.objective_function_value
+            resultado["gap"] = info.mip_gap
+            resultado["alocacoes"] = extrair_alocacoes(h, matrizes)
+            break
+
+        # Acrescenta as linhas violadas e as vizinhas do mesmo recurso ainda fora do modelo (sum x <= 1)
+        recurso, slot_violado = np.divmod(cobertura["chave"][violadas], total_slots)
+        vizinhas = ((recurso[:, None] * total_slots + np.clip(slot_violado[:, None] + np.arange(-margem, margem + 1),
+                                                              0, total_slots - 1))).ravel()
+        violadas = np.flatnonzero(np.isin(cobertura["chave"], vizinhas) & ~acrescentada)
+        acrescentada[violadas] = True
+        tamanhos = cobertura["tamanho"][violadas]
+        indices = np.concatenate([cobertura["colunas"][a : a + n]
+                                  for a, n in zip(cobertura["inicio"][violadas].tolist(), tamanhos.tolist())])
+        inicios_linhas = np.concatenate(([0], np.cumsum(tamanhos)[:-1]))
+        h.addRows(len(violadas), np.full(len(violadas), -np.inf), np.ones(len(violadas)), len(indices),
+                  inicios_linhas.astype(np.int32), indices.astype(np.int32), np.ones(len(indices)))
+        resultado["linhas_sobreposicao"]["acrescentadas"] += len(violadas)
+    else:
+        print(f"Geração preguiçosa: sobreposições ainda presentes depois de {max_rodadas} rodadas.")
+        resultado["status"] = "Not Solved"
+
+    resultado["tempo_resolucao"] = time.perf_counter() - inicio
+    linhas = resultado["linhas_sobreposicao"]
+    print(f"Geração preguiçosa: {len(resultado['rodadas'])} rodadas, {linhas['acrescentadas']} de "
+          f"{linhas['total']} linhas de 4.2/4.3 acrescentadas")
+    return resultado
@@ -0,0 +1,167 @@
+import argparse
+import copy
+import json
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import preparar_parametros, enumerar_variaveis, formatar_solucao, imprimir_cronograma, exportar_solucao
+import modelo_highs
+
+
+# Resolução em duas resoluções de tempo: slots grossos primeiro, depois refinamento.
+# Tarefas de 15 min (cortar_unha, banho_de_sol, ...) ocupam um slot inteiro de 30 min por causa de
+# `math.ceil(duracao / duracao_slot)`; reduzir o slot para 15 ou 5 min multiplica o número de variáveis.
+# Aqui o modelo é resolvido com o slot grosso e cada ocorrência só pode começar, no modelo fino,
+# numa vizinhança do início grosso (± `vizinhanca_min`). O tamanho do modelo fino passa a depender
+# da vizinhança, e não do horizonte inteiro.
+#
+# Em tarefas periódicas só a primeira ocorrência da cadeia é restrita: as demais seguem pela
+# periodicidade (e o arredondamento de P_j no slot grosso pode diferir do fino).
+# A solução grossa, levada para os slots finos, entra como solução inicial (parcial) do modelo fino.
+
+def dados_com_slot(dados, duracao_slot):
+    """
+    Processa uma cópia do JSON de entrada com outra duração de slot (minutos).
+    """
+    novos = copy.deepcopy(dados)
+    novos["slot_duracao_min"] = duracao_slot
+    return pp.processar_dados(novos)
+
+def vizinhanca_inicios(param_grosso, alocacoes, razao, vizinhanca, total_slots_fino):
+    """
+    Inícios permitidos no modelo fino: para cada ocorrência alocada no grosso em T, os slots finos
+    [T·razao - vizinhanca, (T + 1)·razao + vizinhanca). Retorna {j: {o: array bool}}
+    (só a primeira ocorrência das tarefas periódicas).
+    """
+    restricao = {}
+    for _, idx_j, o, t in alocacoes:
+        j = param_grosso["tarefas"][idx_j]
+        if j in param_grosso["periodicidade"] and o != min(param_grosso["ocorrencias"][j]):
+            continue
+        permitidos = np.zeros(total_slots_fino, dtype=bool)
+        permitidos[max(0, t * razao - vizinhanca) : min(total_slots_fino, (t + 1) * razao + vizinhanca)] = True
+        restricao.setdefault(j, {})[o] = permitidos
+    return restricao
+
+def resolver_multi_resolucao(dados, grossa=None, fina=15, vizinhanca_min=None, time_limit=60, msg=False):
+    """
+    Resolve com slots de `grossa` minutos (padrão: o slot da entrada) e refina com slots de `fina`
+    minutos numa vizinhança de ± `vizinhanca_min` (padrão: um slot grosso) de cada início grosso.
+    `time_limit` vale para cada resolução.
+    Retorna o dicionário de resultado do modelo fino (mesmo formato de `model.resolver_pulp(...)`),
+    com "param" (parâmetros finos) e "etapas" (variáveis, status, objetivo e tempo de cada resolução),
+    ou None se as resoluções forem incompatíveis.
+    """
+    grossa = grossa or dados["slot_duracao_min"]
+    if grossa % fina != 0:
+        print(f"Erro: o slot grosso ({grossa} min) precisa ser múltiplo do fino ({fina} min).")
+        return None
+    razao = grossa // fina
+    vizinhanca = (grossa if vizinhanca_min is None else vizinhanca_min) // fina
+    etapas = []
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": 0.0,
+                 "tempo_resolucao": 0.0, "etapas": etapas}
+
+    # 1) Modelo grosso
+    inicio = time.perf_counter()
+    dados_grossos = dados_com_slot(dados, grossa)
+    if dados_grossos is None:
+        return None
+    param_grosso = preparar_parametros(dados_grossos)
+    grosso = modelo_highs.resolver_highs(param_grosso, time_limit=time_limit, msg=msg)
+    etapas.append({"etapa": f"grossa ({grossa} min)", "variaveis": len(enumerar_variaveis(param_grosso)["slot"]),
+                   "status": grosso["status"], "objetivo": grosso["objetivo"],
+                   "tempo_s": time.perf_counter() - inicio})
+    resultado["tempo_montagem"] += grosso["tempo_montagem"]
+    resultado["tempo_resolucao"] += grosso["tempo_resolucao"]
+    if grosso["objetivo"] is None:
+        print(f"Multi-resolução: o modelo grosso ({grossa} min) não encontrou solução ({grosso['status']}).")
+        resultado["status"] = grosso["status"]
+        return resultado
+
+    # 2) Modelo fino restrito à vizinhança dos inícios grossos
+    inicio = time.perf_counter()
+    dados_finos = dados_com_slot(dados, fina)
+    total_slots_fino = dados_finos["mascara_inicio"].shape[2]
+    restricao = vizinhanca_inicios(param_grosso, grosso["alocacoes"], razao, vizinhanca, total_slots_fino)
+    param = preparar_parametros(dados_finos, restricao_inicios=restricao)
+    for j in param["tarefas"]:
+        for o in param["ocorrencias"][j]:
+            if not param["viavel_ocorrencia"][j][o].any():
+                print(f"Multi-resolução: '{j}' (ocorrência {o}) sem início fino na vizinhança; aumente a vizinhança.")
+                resultado["status"] = "Infeasible"
+                return resultado
+    matrizes = modelo_highs.montar_matrizes(param)
+    h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=msg)
+
+    # Solução inicial: a solução grossa levada para o slot fino correspondente (o HiGHS completa
+    # ou descarta o que não for viável na resolução fina)
+    coluna = modelo_highs.indice_colunas(matrizes)
+    colunas_iniciais = [coluna[(idx_i, idx_j, o, t * razao)] for idx_i, idx_j, o, t in grosso["alocacoes"]
+                        if (idx_i, idx_j, o, t * razao) in coluna]
+    if colunas_iniciais:
+        modelo_highs.definir_solucao_parcial(h, colunas_iniciais, np.ones(len(colunas_iniciais)))
+    t_montagem = time.perf_counter()
+    h.run()
+    t_resolucao = time.perf_counter()
+    resultado["tempo_montagem"] += t_montagem - inicio
+    resultado["tempo_resolucao"] += t_resolucao - t_montagem
+
+    status_string = modelo_highs.status_highs(h)
+    resultado["status"] = status_string
+    if status_string == "Optimal" or status_string == "Feasible":
+        info = h.getInfo()
+        resultado["objetivo"] = info.objective_function_value
+        resultado["gap"] = info.mip_gap
+        resultado["alocacoes"] = modelo_highs.extrair_alocacoes(h, matrizes)
+    etapas.append({"etapa": f"fina ({fina} min)", "variaveis": len(matrizes["variaveis"]["slot"]), "status": status_string,
+                   "objetivo": resultado["objetivo"], "tempo_s": t_resolucao - inicio})
+    resultado["param"] = param
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve com slots grossos e refina com slots finos.")
+    parser.add_argument("arquivo", nargs="?", default="input_semanal_1dia.json", help="JSON de entrada")
+    parser.add_argument("--grossa", type=int, help="slot grosso em minutos (padrão: o da entrada)")
+    parser.add_argument("--fina", type=int, default=15, help="slot fino em minutos")
+    parser.add_argument("--vizinhanca", type=int, help="vizinhança de cada início grosso em minutos (padrão: um slot grosso)")
+    parser.add_argument("--time-limit", type=float, default=60, help="limite de tempo de cada resolução (s)")
+    parser.add_argument("--comparar", action="store_true",
+                        help="conta também as variáveis do modelo fino completo (sem vizinhança)")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="grava a agenda fina (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true", help="não imprime o cronograma no terminal")
+    args = parser.parse_args()
+
+    try:
+        with open(args.arquivo, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Erro fatal: não foi possível ler '{args.arquivo}' ({e}). Encerrando.")
+        exit()
+
+    resultado = resolver_multi_resolucao(dados, grossa=args.grossa, fina=args.fina, vizinhanca_min=args.vizinhanca,
+                                         time_limit=args.time_limit)
+    if resultado is None:
+        exit()
+    for etapa in resultado["etapas"]:
+        objetivo = "-" if etapa["objetivo"] is None else f"{etapa['objetivo']:.2f}"
+        print(f"{etapa['etapa']}: {etapa['variaveis']} variáveis, {etapa['status']}, objetivo {objetivo}, "
+              f"{etapa['tempo_s']:.2f}s")
+    if args.comparar:
+        completo = preparar_parametros(dados_com_slot(dados, args.fina))
+        print(f"Modelo fino completo: {len(enumerar_variaveis(completo)['slot'])} variáveis")
+
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nA multi-resolução NÃO ENCONTROU uma solução viável.")
+        return
+    print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+    if not args.sem_cronograma:
+        imprimir_cronograma(formatar_solucao(resultado["param"], resultado["alocacoes"]))
+    if args.exportar:
+        exportar_solucao(resultado["param"], resultado, args.exportar)
+
+
+if __name__ == "__main__":
+    main()
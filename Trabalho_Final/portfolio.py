@@ -0,0 +1,311 @@
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import queue
+import signal
+import tempfile
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import (ARQUIVO_PADRAO, SIMETRIAS, preparar_parametros, simetria_ocorrencias, agrupar_alocacoes,
+                   desagregar_alocacoes, formatar_solucao, imprimir_cronograma, exportar_solucao)
+import modelo_highs
+
+
+# Portfólio de solvers: várias configurações resolvem o mesmo modelo ao mesmo tempo, cada uma
+# em um processo (um núcleo), e vence a primeira que provar a otimalidade; se nenhuma provar até
+# o limite de tempo, vence o melhor incumbente. As demais são encerradas.
+# O desempenho de HiGHS e CBC muda com a instância, com α e com a semente (no exemplo de 1 dia
+# o CBC prova o ótimo antes do HiGHS padrão), então a configuração padrão não precisa ser adivinhada.
+#
+# O modelo é montado uma vez (modelo_highs.montar_matrizes) e exportado em MPS; cada processo lê o
+# mesmo arquivo. Colunas c0, c1, ... seguem a ordem de `enumerar_variaveis`, então a solução de
+# qualquer configuração volta para as mesmas alocações (idx_i, idx_j, o, t).
+# Cada corrida é acrescentada a um histórico (JSON Lines) com o resultado de todas as configurações
+# e a vencedora; `--resumo-historico` conta vitórias e tempos para ajustar o padrão com dados.
+
+# "opcoes": opções do HiGHS (setOptionValue) ou argumentos de pulp.PULP_CBC_CMD
+CONFIGURACOES = (
+    {"nome": "highs", "solver": "highs", "opcoes": {}},
+    {"nome": "highs_semente_1", "solver": "highs", "opcoes": {"random_seed": 1}},
+    {"nome": "highs_semente_2", "solver": "highs", "opcoes": {"random_seed": 2}},
+    {"nome": "highs_sem_presolve", "solver": "highs", "opcoes": {"presolve": "off"}},
+    {"nome": "highs_heuristicas", "solver": "highs", "opcoes": {"mip_heuristic_effort": 0.3}},
+    {"nome": "cbc", "solver": "cbc", "opcoes": {}},
+)
+
+# Segundos além do limite de tempo esperando cada solver devolver o incumbente antes de encerrá-lo
+FOLGA = 10
+
+def _resolver_configuracao(configuracao, arquivo_mps, n_x, time_limit, threads, solucao_inicial):
+    """
+    (Função interna) Resolve o modelo em MPS com uma configuração. Retorna o resumo com as colunas x ativas.
+    """
+    opcoes = configuracao.get("opcoes", {})
+    if configuracao["solver"] == "highs":
+        import highspy
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        h.readModel(arquivo_mps)
+        h.setOptionValue("time_limit", float(time_limit))
+        h.setOptionValue("threads", int(threads))
+        for opcao, valor in opcoes.items():
+            h.setOptionValue(opcao, valor)
+        if solucao_inicial is not None:
+            modelo_highs.definir_solucao_inicial(h, solucao_inicial)
+        h.run()
+        status = modelo_highs.status_highs(h)
+        if status not in ("Optimal", "Feasible"):
+            return {"status": status, "objetivo": None, "colunas": []}
+        info = h.getInfo()
+        valores = np.asarray(h.getSolution().col_value)[:n_x]
+        return {"status": status, "objetivo": info.objective_function_value, "gap": info.mip_gap,
+                "colunas": np.flatnonzero(valores > 0.99).tolist()}
+
+    if configuracao["solver"] == "cbc":
+        import pulp
+        variaveis, problema = pulp.LpProblem.fromMPS(arquivo_mps)
+        if solucao_inicial is not None:
+            for k, valor in enumerate(solucao_inicial):
+                variaveis[f"c{k}"].setInitialValue(valor)
+        problema.solve(pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, threads=threads,
+                                         warmStart=solucao_inicial is not None, **opcoes))
+        # Com limite de tempo o CBC devolve status "Optimal" mesmo sem provar: o que vale é sol_status
+        if problema.sol_status == pulp.LpSolutionOptimal:
+            status = "Optimal"
+        elif problema.sol_status == pulp.LpSolutionIntegerFeasible:
+            status = "Feasible"
+        else:
+            return {"status": pulp.LpStatus[problema.status], "objetivo": None, "colunas": []}
+        valores = np.array([variaveis[f"c{k}"].varValue or 0.0 for k in range(n_x)])
+        return {"status": status, "objetivo": pulp.value(problema.objective),
+                "colunas": np.flatnonzero(valores > 0.99).tolist()}
+
+    raise ValueError(f"Solver '{configuracao['solver']}' desconhecido. Use 'highs' ou 'cbc'.")
+
+def _executar_configuracao(configuracao, arquivo_mps, n_x, time_limit, threads, solucao_inicial, fila):
+    """
+    (Função interna) Corpo de cada processo do portfólio: resolve e põe o resumo na fila.
+    O processo abre um grupo próprio para que encerrá-lo encerre também o executável do CBC.
+    """
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+    inicio = time.perf_counter()
+    try:
+        resumo = _resolver_configuracao(configuracao, arquivo_mps, n_x, time_limit, threads, solucao_inicial)
+    except Exception as e: # o erro de uma configuração não derruba o portfólio
+        resumo = {"status": "Erro", "objetivo": None, "colunas": [], "erro": f"{type(e).__name__}: {e}"}
+    resumo["nome"] = configuracao["nome"]
+    resumo["tempo"] = time.perf_counter() - inicio
+    fila.put(resumo)
+
+def _encerrar(processo):
+    """
+    (Função interna) Encerra o processo de uma configuração e os filhos dele (ex.: o CBC).
+    """
+    try:
+        os.killpg(processo.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        processo.terminate()
+
+def resolver_portfolio(param, configuracoes=CONFIGURACOES, time_limit=60, threads=1, simetria="nenhuma",
+                       solucao_inicial=None, msg=True):
+    """
+    Resolve o mesmo modelo com todas as `configuracoes` ao mesmo tempo, um processo cada
+    (com no máximo `threads` threads). Para na primeira que provar a otimalidade ou, no limite de
+    tempo, fica com o melhor incumbente; as demais são encerradas.
+    `solucao_inicial` (alocações (idx_i, idx_j, o, t), ex.: da heurística) é passada a todas como MIP start.
+    Retorna o mesmo dicionário de `model.resolver_pulp(...)` com "vencedora" (nome da configuração,
+    ou None) e "configuracoes" (status, objetivo e tempo de cada uma; "Interrompida" se foi encerrada).
+    """
+    nomes = [c["nome"] for c in configuracoes]
+    if len(set(nomes)) != len(nomes):
+        raise ValueError(f"Nomes de configuração repetidos: {nomes}.")
+    inicio = time.perf_counter()
+    param_modelo = simetria_ocorrencias(param, simetria)
+    matrizes = modelo_highs.montar_matrizes(param_modelo)
+    vetor_inicial = None
+    if solucao_inicial:
+        vetor_inicial = modelo_highs.vetor_solucao(param_modelo, matrizes,
+                                                   agrupar_alocacoes(param_modelo, solucao_inicial))
+
+    with tempfile.TemporaryDirectory() as pasta:
+        arquivo_mps = os.path.join(pasta, "modelo.mps")
+        modelo_highs.criar_highs(matrizes, time_limit=None, msg=False).writeModel(arquivo_mps)
+        tempo_montagem = time.perf_counter() - inicio
+        if msg:
+            print(f"Portfólio: {len(configuracoes)} configurações ({', '.join(nomes)}), "
+                  f"{matrizes['coluna_delta']} variáveis x, limite {time_limit:g} s.")
+
+        inicio = time.perf_counter()
+        fila = multiprocessing.Queue()
+        processos = {
+            c["nome"]: multiprocessing.Process(
+                target=_executar_configuracao, daemon=True,
+                args=(c, arquivo_mps, matrizes["coluna_delta"], time_limit, threads, vetor_inicial, fila),
+            )
+            for c in configuracoes
+        }
+        for processo in processos.values():
+            processo.start()
+
+        resultados = {}
+        vencedora = None
+        prazo = inicio + time_limit + FOLGA
+        while len(resultados) < len(processos) and time.perf_counter() < prazo:
+            try:
+                resumo = fila.get(timeout=0.2)
+            except queue.Empty:
+                # Processo que morreu sem responder (ex.: sem memória)
+                for nome, processo in processos.items():
+                    if nome not in resultados and processo.exitcode not in (None, 0):
+                        resultados[nome] = {"nome": nome, "status": "Erro", "objetivo": None, "colunas": [],
+                                            "tempo": time.perf_counter() - inicio,
+                                            "erro": f"processo encerrado com código {processo.exitcode}"}
+                continue
+            resultados[resumo["nome"]] = resumo
+            if msg:
+                objetivo = "-" if resumo["objetivo"] is None else f"{resumo['objetivo']:.4f}"
+                print(f"  {resumo['nome']}: {resumo['status']}, objetivo {objetivo}, {resumo['tempo']:.2f}s")
+            if resumo["status"] == "Optimal":
+                vencedora = resumo["nome"]
+                break
+
+        for nome, processo in processos.items():
+            if processo.is_alive():
+                _encerrar(processo)
+                resultados.setdefault(nome, {"nome": nome, "status": "Interrompida", "objetivo": None,
+                                             "colunas": [], "tempo": time.perf_counter() - inicio})
+            processo.join()
+        tempo_resolucao = time.perf_counter() - inicio
+
+    if vencedora is None:
+        # Sem prova de otimalidade: melhor incumbente (empate: quem terminou antes)
+        com_solucao = [r for r in resultados.values() if r["objetivo"] is not None]
+        if com_solucao:
+            vencedora = min(com_solucao, key=lambda r: (r["objetivo"], r["tempo"]))["nome"]
+
+    resultado = {
+        "status": "Not Solved" if vencedora is None else resultados[vencedora]["status"],
+        "objetivo": None,
+        "alocacoes": [],
+        "tempo_montagem": tempo_montagem,
+        "tempo_resolucao": tempo_resolucao,
+        "vencedora": vencedora,
+        "configuracoes": [{chave: valor for chave, valor in resultados[nome].items() if chave != "colunas"}
+                          for nome in nomes],
+    }
+    if vencedora is not None:
+        colunas = np.asarray(resultados[vencedora]["colunas"], dtype=np.int64)
+        variaveis = matrizes["variaveis"]
+        resultado["objetivo"] = resultados[vencedora]["objetivo"]
+        resultado["gap"] = resultados[vencedora].get("gap")
+        resultado["alocacoes"] = desagregar_alocacoes(param_modelo, list(zip(
+            variaveis["pessoa"][colunas].tolist(), variaveis["tarefa"][colunas].tolist(),
+            variaveis["ocorrencia"][colunas].tolist(), variaveis["slot"][colunas].tolist(),
+        )))
+    return resultado
+
+def registrar_historico(caminho_arquivo, resultado, **contexto):
+    """
+    Acrescenta a corrida ao histórico (JSON Lines): data, `contexto` (ex.: arquivo, alpha, limite de tempo),
+    a vencedora e o resultado de cada configuração.
+    """
+    registro = {"data": datetime.datetime.now().isoformat(timespec="seconds"), **contexto,
+                "vencedora": resultado["vencedora"], "objetivo": resultado["objetivo"],
+                "configuracoes": resultado["configuracoes"]}
+    with open(caminho_arquivo, "a", encoding="utf-8") as f:
+        f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+def resumir_historico(caminho_arquivo):
+    """
+    Lê o histórico e imprime, por configuração: corridas, vitórias, ótimos provados e o tempo
+    médio até provar o ótimo. Retorna a tabela como lista de dicionários (None se não houver histórico).
+    """
+    from tabulate import tabulate
+    if not os.path.exists(caminho_arquivo):
+        print(f"Erro: histórico '{caminho_arquivo}' não encontrado.")
+        return None
+    estatisticas = {}
+    with open(caminho_arquivo, "r", encoding="utf-8") as f:
+        for linha in f:
+            registro = json.loads(linha)
+            for config in registro["configuracoes"]:
+                estatistica = estatisticas.setdefault(config["nome"], {"configuracao": config["nome"], "corridas": 0,
+                                                                      "vitorias": 0, "otimos": 0, "tempos_otimo": []})
+                estatistica["corridas"] += 1
+                estatistica["vitorias"] += config["nome"] == registro["vencedora"]
+                if config["status"] == "Optimal":
+                    estatistica["otimos"] += 1
+                    estatistica["tempos_otimo"].append(config["tempo"])
+    tabela = []
+    for estatistica in sorted(estatisticas.values(), key=lambda e: -e["vitorias"]):
+        tempos = estatistica.pop("tempos_otimo")
+        estatistica["tempo_medio_otimo_s"] = sum(tempos) / len(tempos) if tempos else None
+        tabela.append(estatistica)
+    print(tabulate(tabela, headers="keys", tablefmt="psql", floatfmt=".2f"))
+    return tabela
+
+def main():
+    parser = argparse.ArgumentParser(description="Corrida de configurações de solver (HiGHS e CBC) em paralelo.")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO, help="JSON de entrada")
+    parser.add_argument("--time-limit", type=float, default=60, help="limite de tempo de cada configuração (s)")
+    parser.add_argument("--configuracoes",
+                        help=f"nomes separados por vírgula (padrão: todas: {','.join(c['nome'] for c in CONFIGURACOES)})")
+    parser.add_argument("--threads", type=int, default=1, help="threads de cada configuração")
+    parser.add_argument("--simetria", choices=SIMETRIAS, default="nenhuma", help="ver model.py")
+    parser.add_argument("--mip-start", action="store_true", help="agenda da heurística como solução inicial de todas")
+    parser.add_argument("--historico", default="portfolio_historico.jsonl",
+                        help="arquivo JSON Lines onde cada corrida é acrescentada")
+    parser.add_argument("--resumo-historico", action="store_true",
+                        help="só imprime vitórias e tempos por configuração a partir do histórico")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="grava a agenda (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true", help="não imprime o cronograma no terminal")
+    args = parser.parse_args()
+
+    if args.resumo_historico:
+        resumir_historico(args.historico)
+        return
+
+    configuracoes = CONFIGURACOES
+    if args.configuracoes:
+        por_nome = {c["nome"]: c for c in CONFIGURACOES}
+        desconhecidas = [n for n in args.configuracoes.split(",") if n not in por_nome]
+        if desconhecidas:
+            print(f"Erro: configurações desconhecidas {desconhecidas}. Use nomes de {list(por_nome)}.")
+            exit()
+        configuracoes = [por_nome[n] for n in args.configuracoes.split(",")]
+
+    data = pp.carregar_dados(args.arquivo)
+    if data is None:
+        print("Erro fatal: Falha ao carregar ou processar os dados. Encerrando.")
+        exit()
+    param = preparar_parametros(data)
+    inicial = None
+    if args.mip_start:
+        import heuristica
+        inicial = heuristica.resolver_heuristica(param)["alocacoes"]
+
+    resultado = resolver_portfolio(param, configuracoes=configuracoes, time_limit=args.time_limit,
+                                   threads=args.threads, simetria=args.simetria, solucao_inicial=inicial)
+    registrar_historico(args.historico, resultado, arquivo=args.arquivo, alpha=param["alpha"],
+                        time_limit=args.time_limit, threads=args.threads, simetria=args.simetria,
+                        mip_start=args.mip_start)
+
+    print(f"Vencedora: {resultado['vencedora'] or '-'}")
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nNenhuma configuração encontrou solução viável.")
+        return
+    print(f"Valor da Função Objetivo: {resultado['objetivo']:.2f}")
+    if not args.sem_cronograma:
+        imprimir_cronograma(formatar_solucao(param, resultado["alocacoes"]))
+    if args.exportar:
+        exportar_solucao(param, resultado, args.exportar)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,7 @@
 import json
+import math
+
+import numpy as np
 
 # Dias da semana
 MAPA_DIAS = {
@@ -21,20 +24,26 @@ def _time_para_slot(hora_str, slots_por_dia, duracao_slot):
         print(f"Erro: Formato de hora inválido '{hora_str}'. Use 'HH:MM'.")
         return 0
 
-def _processar_disponibilidade(regras_disponibilidade, total_slots, slots_por_dia, duracao_slot):
+def _processar_disponibilidade(regras_disponibilidade, pessoas, total_slots, slots_por_dia, duracao_slot, total_dias):
     """
-    (Função interna) Converte regras de disponibilidade (pessoas) em vetores binários.
+    (Função interna) Converte regras de disponibilidade (pessoas) em uma matriz binária.
     Entrada:
       - regras_disponibilidade: dicionário com regras por pessoa (campo "disponibilidade_pessoas" do JSON)
+      - pessoas: ordem das linhas da matriz (campo "pessoas" do JSON)
       - total_slots: número total de slots no horizonte
       - slots_por_dia: número de slots por dia
       - duracao_slot: duração de cada slot em minutos
-    Retorna um dicionário { pessoa: [0/1, ...] } com comprimento total_slots.
+      - total_dias: número de dias do horizonte (regras semanais se repetem a cada 7 dias)
+    Retorna uma matriz numpy (pessoas x slots) de 0/1.
     """
-    disponibilidade_final = {}
+    matriz = np.zeros((len(pessoas), total_slots), dtype=np.int8)
+    linha_pessoa = {pessoa: idx for idx, pessoa in enumerate(pessoas)}
 
     for pessoa, regras in regras_disponibilidade.items():
-        vetor_pessoa = [0] * total_slots
+        if pessoa not in linha_pessoa:
+            print(f"Aviso: Disponibilidade definida para '{pessoa}', mas ela não existe em 'pessoas'.")
+            continue
+        vetor_pessoa = matriz[linha_pessoa[pessoa]]
 
         for regra in regras:
             dias_para_aplicar = []
@@ -51,31 +60,25 @@ def _processar_disponibilidade(regras_disponibilidade, total_slots, slots_por_di
                     print(f"Aviso: Dia '{nome_dia}' inválido para '{pessoa}'. Pulando regra.")
                     continue
 
-                indice_dia = MAPA_DIAS[nome_dia]
-                offset_dia = indice_dia * slots_por_dia
-
-                for i in range(slot_inicio_dia, slot_fim_dia):
-                    indice_global = offset_dia + i
-                    if indice_global < total_slots:
-                        vetor_pessoa[indice_global] = 1
-
-        disponibilidade_final[pessoa] = vetor_pessoa
+                # Aplica em todas as semanas do horizonte (dia, dia + 7, ...)
+                for dia in range(MAPA_DIAS[nome_dia], total_dias, len(DIAS_SEMANA)):
+                    offset_dia = dia * slots_por_dia
+                    vetor_pessoa[offset_dia + slot_inicio_dia : min(offset_dia + slot_fim_dia, total_slots)] = 1
 
-    return disponibilidade_final
+    return matriz
 
 def _processar_janelas_tarefas(janelas_tarefas, dados_tarefas, total_slots, slots_por_dia, duracao_slot, total_dias):
     """
-    Converte janelas de tempo das tarefas em vetores binários.
-    Retorna um dicionário: { "tarefa": [1, 1, 0, 0, ...], ... }
+    Converte janelas de tempo das tarefas em uma matriz binária de inícios permitidos.
+    Retorna uma matriz numpy (tarefas x slots), com linhas na ordem de `dados_tarefas`.
     Parâmetros:
       - janelas_tarefas: dicionário com janelas (campo "horario_tarefas" do JSON)
       - dados_tarefas: dicionário com informações das tarefas (campo "tarefas")
       - total_slots, slots_por_dia, duracao_slot, total_dias: parâmetros de horizonte
     """
-    # Inicializa todas as tarefas como 100% disponíveis (vetor de uns)
-    disponibilidade_tarefas = {}
-    for tarefa in dados_tarefas.keys():
-        disponibilidade_tarefas[tarefa] = [1] * total_slots
+    # Inicializa todas as tarefas como 100% disponíveis (matriz de uns)
+    matriz = np.ones((len(dados_tarefas), total_slots), dtype=np.int8)
+    linha_tarefa = {tarefa: idx for idx, tarefa in enumerate(dados_tarefas)}
 
     # Aplica as restrições definidas em janelas_tarefas
     for nome_tarefa, janelas in janelas_tarefas.items():
@@ -84,7 +87,8 @@ def _processar_janelas_tarefas(janelas_tarefas, dados_tarefas, total_slots, slot
             continue
 
         # Se tem janela definida, começamos zerando a disponibilidade e marcando apenas os inícios permitidos
-        disponibilidade_tarefas[nome_tarefa] = [0] * total_slots
+        vetor_tarefa = matriz[linha_tarefa[nome_tarefa]]
+        vetor_tarefa[:] = 0
 
         # Quantos slots a tarefa dura
         duracao_em_slots = dados_tarefas[nome_tarefa]["duracao"] // duracao_slot
@@ -100,15 +104,43 @@ def _processar_janelas_tarefas(janelas_tarefas, dados_tarefas, total_slots, slot
             for dia in range(total_dias):
                 offset = dia * slots_por_dia
 
-                s_min = offset + inicio_no_dia
-                s_max = offset + limite_inicio_valido
+                s_min = max(offset + inicio_no_dia, 0)
+                s_max = min(offset + limite_inicio_valido, total_slots)
 
                 # Marca como 1 os slots de início permitidos (s_max é exclusivo)
-                for t in range(s_min, s_max):
-                    if 0 <= t < total_slots:
-                        disponibilidade_tarefas[nome_tarefa][t] = 1
+                if s_min < s_max:
+                    vetor_tarefa[s_min:s_max] = 1
+
+    return matriz
+
+def _calcular_mascaras_inicio(matriz_pessoas, matriz_tarefas, duracoes_slots):
+    """
+    (Função interna) Calcula, para cada pessoa i, tarefa j e slot t, se i pode iniciar j em t
+    cumprindo toda a duração: a tarefa cabe no horizonte, o início respeita a janela da tarefa
+    e a pessoa está disponível em todos os slots [t, t + d_j).
+    Usa soma acumulada por pessoa, então cada duração distinta custa O(P·T).
+    Retorna uma matriz booleana (pessoas x tarefas x slots).
+    """
+    n_pessoas, total_slots = matriz_pessoas.shape
+    mascara = np.zeros((n_pessoas, len(duracoes_slots), total_slots), dtype=bool)
 
-    return disponibilidade_tarefas
+    # acumulada[:, t] = número de slots disponíveis em [0, t)
+    acumulada = np.zeros((n_pessoas, total_slots + 1), dtype=np.int32)
+    np.cumsum(matriz_pessoas, axis=1, out=acumulada[:, 1:])
+
+    disponivel_por_duracao = {}
+    for idx_tarefa, dur in enumerate(duracoes_slots):
+        ultimo_inicio = total_slots - dur
+        if ultimo_inicio < 0:
+            continue
+        if dur not in disponivel_por_duracao:
+            # Janela deslizante: slots disponíveis em [t, t + dur) == dur
+            disponivel_por_duracao[dur] = (acumulada[:, dur:] - acumulada[:, : ultimo_inicio + 1]) == dur
+        mascara[:, idx_tarefa, : ultimo_inicio + 1] = (
+            disponivel_por_duracao[dur] & (matriz_tarefas[idx_tarefa, : ultimo_inicio + 1] == 1)
+        )
+
+    return mascara
 
 def carregar_dados(caminho_arquivo):
     """
@@ -126,12 +158,20 @@ def carregar_dados(caminho_arquivo):
         print(f"Erro: Arquivo '{caminho_arquivo}' não é um JSON válido.")
         return None
 
+    return processar_dados(dados)
+
+def processar_dados(dados):
+    """
+    Processa Pessoas e Tarefas de um JSON já lido (dicionário), como `carregar_dados(...)`.
+    Útil quando a entrada é modificada em memória (ex.: replanejamento).
+    """
     # Lê parâmetros principais
     try:
         duracao_slot = dados['slot_duracao_min']
         total_dias = dados['dias']
         total_slots = total_dias * (24 * 60) // duracao_slot
 
+        pessoas = dados["pessoas"]
         regras_disponibilidade = dados["disponibilidade_pessoas"]
         dados_tarefas = dados["tarefas"]
         janelas_tarefas = dados.get("disponibilidade_tarefas", {})
@@ -148,17 +188,23 @@ def carregar_dados(caminho_arquivo):
     slots_por_dia = (24 * 60) // duracao_slot
 
     # Processa disponibilidade das pessoas
-    vetores_pessoas = _processar_disponibilidade(
+    matriz_pessoas = _processar_disponibilidade(
         regras_disponibilidade,
+        pessoas,
         total_slots,
         slots_por_dia,
         duracao_slot,
+        total_dias,
     )
-    dados["disponibilidade_pessoas_binaria"] = vetores_pessoas
+    # Matriz (pessoas x slots) e, por conveniência, as linhas por nome (views da matriz)
+    dados["matriz_disponibilidade_pessoas"] = matriz_pessoas
+    dados["disponibilidade_pessoas_binaria"] = {
+        pessoa: matriz_pessoas[idx] for idx, pessoa in enumerate(pessoas)
+    }
 
     # Processa janelas de tarefas
     print("Processando janelas de tarefas...")
-    vetores_tarefas = _processar_janelas_tarefas(
+    matriz_tarefas = _processar_janelas_tarefas(
         janelas_tarefas,
         dados_tarefas,
         total_slots,
@@ -166,8 +212,15 @@ def carregar_dados(caminho_arquivo):
         duracao_slot,
         total_dias,
     )
-    # Salva no dicionário principal
-    dados["disponibilidade_tarefas_binaria"] = vetores_tarefas
+    # Salva no dicionário principal (matriz tarefas x slots e linhas por nome)
+    dados["matriz_disponibilidade_tarefas"] = matriz_tarefas
+    dados["disponibilidade_tarefas_binaria"] = {
+        tarefa: matriz_tarefas[idx] for idx, tarefa in enumerate(dados_tarefas)
+    }
+
+    # Máscaras "pessoa i pode iniciar tarefa j no slot t com a duração completa"
+    duracoes_slots = [math.ceil(dados_tarefas[j]["duracao"] / duracao_slot) for j in dados_tarefas]
+    dados["mascara_inicio"] = _calcular_mascaras_inicio(matriz_pessoas, matriz_tarefas, duracoes_slots)
     
     print("Dados carregados e processados com sucesso!")
     return dados
\ No newline at end of file
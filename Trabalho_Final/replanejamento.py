@@ -0,0 +1,213 @@
+import argparse
+import copy
+import json
+import time
+import numpy as np
+
+import preprocessamento as pp
+from model import preparar_parametros, formatar_solucao, imprimir_cronograma, exportar_solucao
+import modelo_highs
+from heuristica import objetivo_alocacoes, verificar_alocacoes
+from horizonte_rolante import montar_subproblema
+
+
+# Replanejamento incremental: alguém desmarca no meio da semana e a agenda precisa ser refeita
+# só dali para frente. A partir de uma solução existente (o cronograma de `model.py --exportar`),
+# de um slot "agora" e de alterações em `disponibilidade_pessoas` ou `aptidao`:
+#   - tudo o que começou antes de "agora" fica fixado (inclusive o que ainda está em andamento);
+#   - o restante é resolvido como a última janela do horizonte rolante (`montar_subproblema`),
+#     que já leva periodicidade, precedência, ocupação e carga fixada através da fronteira;
+#   - o objetivo ganha um termo de estabilidade: cada alocação antiga (pessoa, tarefa, slot)
+#     depois de "agora" que se repete reduz o custo em `peso_estabilidade`;
+#   - as alocações antigas que continuam possíveis entram como solução inicial (parcial).
+# As alterações valem a partir de "agora": antes disso a disponibilidade antiga é mantida.
+
+PESO_ESTABILIDADE_PADRAO = 0.5
+CHAVES_ALTERACAO = ("disponibilidade_pessoas", "aptidao")
+
+def aplicar_alteracoes(dados, alteracoes):
+    """
+    Retorna uma cópia do JSON de entrada com as alterações aplicadas:
+      - "disponibilidade_pessoas": {pessoa: [regras]} substitui as regras de cada pessoa citada
+        (ex.: {"tio": []} para quem desmarcou o resto da semana);
+      - "aptidao": {pessoa: {tarefa: valor}} atualiza só os valores citados.
+    Retorna None se as alterações forem inválidas.
+    """
+    novos = copy.deepcopy(dados)
+    for chave in alteracoes:
+        if chave not in CHAVES_ALTERACAO:
+            print(f"Erro: alteração '{chave}' não suportada. Use uma de {CHAVES_ALTERACAO}.")
+            return None
+    for chave in CHAVES_ALTERACAO:
+        for pessoa, valor in alteracoes.get(chave, {}).items():
+            if pessoa not in novos["pessoas"]:
+                print(f"Erro: pessoa '{pessoa}' (em '{chave}') não existe na entrada.")
+                return None
+            if chave == "aptidao":
+                novos["aptidao"].setdefault(pessoa, {}).update(valor)
+            else:
+                novos["disponibilidade_pessoas"][pessoa] = valor
+    return novos
+
+def slot_do_horario(dados, dia, hora):
+    """
+    Slot global do início do `dia` (1 = primeiro dia) no horário 'HH:MM'.
+    """
+    duracao_slot = dados["slot_duracao_min"]
+    horas, minutos = (int(v) for v in hora.split(":"))
+    return (dia - 1) * ((24 * 60) // duracao_slot) + (horas * 60 + minutos) // duracao_slot
+
+def _alocacoes_da_solucao(param, solucao):
+    """
+    (Função interna) Linhas do cronograma (pessoa, tarefa, ocorrencia, inicio_slot) -> alocações
+    (idx_i, idx_j, o, t). Retorna None se a solução não corresponder à entrada.
+    """
+    alocacoes = []
+    for linha in solucao:
+        if linha["pessoa"] not in param["pessoas"] or linha["tarefa"] not in param["tarefas"]:
+            print(f"Erro: a solução cita '{linha['pessoa']}'/'{linha['tarefa']}', que não existe na entrada.")
+            return None
+        if linha["ocorrencia"] not in param["ocorrencias"][linha["tarefa"]]:
+            print(f"Erro: '{linha['tarefa']}' não tem a ocorrência {linha['ocorrencia']} na entrada.")
+            return None
+        alocacoes.append((param["pessoas"].index(linha["pessoa"]), param["tarefas"].index(linha["tarefa"]),
+                          int(linha["ocorrencia"]), int(linha["inicio_slot"])))
+    return alocacoes
+
+def replanejar(dados, solucao, agora, alteracoes=None, peso_estabilidade=PESO_ESTABILIDADE_PADRAO,
+               time_limit=30, msg=False):
+    """
+    Refaz a agenda a partir do slot `agora`.
+      - dados: JSON de entrada (dicionário, como lido do arquivo);
+      - solucao: cronograma atual (lista de linhas com pessoa, tarefa, ocorrencia e inicio_slot,
+        como `resultado["solucao"]` ou o "cronograma" de `model.py --exportar`);
+      - alteracoes: ver `aplicar_alteracoes`;
+      - peso_estabilidade: desconto no custo de cada alocação antiga mantida (0 = só o objetivo original).
+    Retorna o dicionário de resultado (status, objetivo original na semana inteira, alocações,
+    tempos) com "mudancas" (alocações antigas depois de "agora" que não se mantiveram),
+    "mantidas" e "fixadas", ou None se a entrada ou a solução forem inválidas.
+    """
+    dados_novos = aplicar_alteracoes(dados, alteracoes or {})
+    if dados_novos is None:
+        return None
+    inicio = time.perf_counter()
+    antigos = pp.processar_dados(copy.deepcopy(dados))
+    processados = pp.processar_dados(dados_novos)
+    if antigos is None or processados is None:
+        return None
+    # O que aconteceu antes de "agora" não muda: lá vale a disponibilidade antiga
+    processados["mascara_inicio"][:, :, :agora] = antigos["mascara_inicio"][:, :, :agora]
+    param = preparar_parametros(processados)
+
+    alocacoes = _alocacoes_da_solucao(param, solucao)
+    if alocacoes is None:
+        return None
+    tarefas = param["tarefas"]
+    total_slots = param["total_slots"]
+    fixadas = {(tarefas[idx_j], o): (idx_i, t) for idx_i, idx_j, o, t in alocacoes if t < agora}
+    futuras = [(idx_i, idx_j, o, t) for idx_i, idx_j, o, t in alocacoes if t >= agora]
+
+    resultado = {"status": "Not Solved", "objetivo": None, "alocacoes": [], "tempo_montagem": 0.0,
+                 "tempo_resolucao": 0.0, "fixadas": len(fixadas), "mantidas": 0, "mudancas": len(futuras)}
+    sub = montar_subproblema(param, fixadas, agora, total_slots, total_slots)
+    if sub is None:
+        resultado["status"] = "Infeasible"
+        return resultado
+    matrizes = modelo_highs.montar_matrizes(sub)
+
+    # Estabilidade: desconto em cada x (i, j, ·, t) que repete uma alocação antiga. A ocorrência
+    # não entra na comparação: ocorrências da mesma tarefa podem trocar de rótulo sem mudar a agenda.
+    variaveis = matrizes["variaveis"]
+    chave = (variaveis["pessoa"] * len(tarefas) + variaveis["tarefa"]) * total_slots + variaveis["slot"]
+    chaves_antigas = np.array([(idx_i * len(tarefas) + idx_j) * total_slots + t for idx_i, idx_j, _, t in futuras],
+                              dtype=np.int64)
+    repetem = np.isin(chave, chaves_antigas)
+    matrizes["custo"][np.flatnonzero(repetem)] -= peso_estabilidade
+
+    h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=msg)
+    # Na semana de exemplo o presolve do HiGHS levava ~20 s neste subproblema e a busca ~0,5 s:
+    # com a agenda antiga como ponto de partida o replanejamento sai mais rápido sem ele.
+    h.setOptionValue("presolve", "off")
+    # Solução inicial parcial: as alocações antigas que continuam no índice (o HiGHS completa o resto)
+    exatas = set(futuras)
+    colunas_iniciais = [k for k in np.flatnonzero(repetem).tolist()
+                        if (int(variaveis["pessoa"][k]), int(variaveis["tarefa"][k]),
+                            int(variaveis["ocorrencia"][k]), int(variaveis["slot"][k])) in exatas]
+    if colunas_iniciais:
+        modelo_highs.definir_solucao_parcial(h, colunas_iniciais, np.ones(len(colunas_iniciais)))
+    resultado["tempo_montagem"] = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    h.run()
+    resultado["tempo_resolucao"] = time.perf_counter() - inicio
+    status_string = modelo_highs.status_highs(h)
+    resultado["status"] = status_string
+    print(f"Replanejamento a partir do slot {agora}: {status_string}, {len(fixadas)} alocações fixadas, "
+          f"{matrizes['coluna_delta']} variáveis, {resultado['tempo_resolucao']:.2f}s")
+    if status_string != "Optimal" and status_string != "Feasible":
+        return resultado
+
+    novas = modelo_highs.extrair_alocacoes(h, matrizes)
+    resultado["alocacoes"] = [(idx_i, tarefas.index(j), o, t) for (j, o), (idx_i, t) in fixadas.items()] + novas
+    violacoes = verificar_alocacoes(param, resultado["alocacoes"])
+    if violacoes:
+        print(f"Replanejamento: {len(violacoes)} violações na agenda final: {violacoes[:5]}")
+        resultado["status"] = "Infeasible"
+        return resultado
+
+    chaves_novas = {(idx_i, idx_j, t) for idx_i, idx_j, _, t in novas}
+    resultado["mantidas"] = sum((idx_i, idx_j, t) in chaves_novas for idx_i, idx_j, _, t in futuras)
+    resultado["mudancas"] = len(futuras) - resultado["mantidas"]
+    resultado["objetivo"] = objetivo_alocacoes(param, resultado["alocacoes"])
+    resultado["solucao"] = formatar_solucao(param, resultado["alocacoes"])
+    resultado["param"] = param
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser(description="Replaneja a agenda a partir de um instante, com alterações.")
+    parser.add_argument("arquivo", help="JSON de entrada usado na solução original")
+    parser.add_argument("solucao", help="solução atual (JSON de `model.py --exportar`)")
+    parser.add_argument("--agora-dia", type=int, required=True, help="dia do replanejamento (1 = primeiro)")
+    parser.add_argument("--agora-hora", default="00:00", help="horário do replanejamento (HH:MM)")
+    parser.add_argument("--alteracoes", help="JSON com 'disponibilidade_pessoas' e/ou 'aptidao' alterados")
+    parser.add_argument("--peso-estabilidade", type=float, default=PESO_ESTABILIDADE_PADRAO,
+                        help="desconto por alocação antiga mantida (0 = ignora a agenda antiga)")
+    parser.add_argument("--time-limit", type=float, default=30, help="limite de tempo do solver (s)")
+    parser.add_argument("--exportar", metavar="ARQUIVO", help="grava a nova agenda (.json, .csv ou .parquet)")
+    parser.add_argument("--sem-cronograma", action="store_true", help="não imprime o cronograma no terminal")
+    args = parser.parse_args()
+
+    try:
+        with open(args.arquivo, "r", encoding="utf-8") as f:
+            dados = json.load(f)
+        with open(args.solucao, "r", encoding="utf-8") as f:
+            solucao = json.load(f)["cronograma"]
+        alteracoes = {}
+        if args.alteracoes:
+            with open(args.alteracoes, "r", encoding="utf-8") as f:
+                alteracoes = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError, KeyError) as e:
+        print(f"Erro fatal: não foi possível ler as entradas ({e}). Encerrando.")
+        exit()
+
+    agora = slot_do_horario(dados, args.agora_dia, args.agora_hora)
+    resultado = replanejar(dados, solucao, agora, alteracoes=alteracoes,
+                           peso_estabilidade=args.peso_estabilidade, time_limit=args.time_limit)
+    if resultado is None:
+        print("Erro fatal: entrada, solução ou alterações inválidas. Encerrando.")
+        exit()
+    print(f"Status do Modelo: {resultado['status']}")
+    if resultado["objetivo"] is None:
+        print("\nO replanejamento NÃO ENCONTROU uma solução viável.")
+        return
+    print(f"Valor da Função Objetivo (semana inteira): {resultado['objetivo']:.2f}")
+    print(f"Alocações depois de 'agora': {resultado['mantidas']} mantidas, {resultado['mudancas']} alteradas")
+    print(f"Tempo total: montagem {resultado['tempo_montagem']:.2f}s, resolução {resultado['tempo_resolucao']:.2f}s")
+    if not args.sem_cronograma:
+        imprimir_cronograma(resultado["solucao"])
+    if args.exportar:
+        exportar_solucao(resultado["param"], resultado, args.exportar)
+
+
+if __name__ == "__main__":
+    main()
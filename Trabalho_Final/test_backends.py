@@ -0,0 +1,39 @@
+import os
+
+import preprocessamento as pp
+from model import preparar_parametros, resolver_parametros
+from heuristica import verificar_alocacoes
+
+
+# Os dois backends ("pulp" e "highs") e a geração preguiçosa de 4.2/4.3 montam a mesma formulação
+# e devem chegar ao mesmo ótimo.
+
+ARQUIVO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input_semanal_1dia.json")
+OBJETIVO_1DIA = 6.68125
+
+def test_backends_mesmo_objetivo():
+    param = preparar_parametros(pp.carregar_dados(ARQUIVO))
+    objetivos = {}
+    for backend in ("pulp", "highs"):
+        resultado = resolver_parametros(param, backend=backend, time_limit=120, msg=False)
+        assert resultado["status"] == "Optimal"
+        objetivos[backend] = resultado["objetivo"]
+    assert abs(objetivos["pulp"] - OBJETIVO_1DIA) <= 1e-6
+    assert abs(objetivos["highs"] - OBJETIVO_1DIA) <= 1e-6
+
+def test_sobreposicao_preguicosa_mesmo_objetivo():
+    # Só as linhas violadas de 4.2/4.3 entram no modelo, rodada a rodada; a agenda final
+    # não pode ter sobreposição e o ótimo é o do modelo completo
+    param = preparar_parametros(pp.carregar_dados(ARQUIVO))
+    resultado = resolver_parametros(param, backend="highs", sobreposicao="preguicosa", time_limit=120, msg=False)
+    assert resultado["status"] == "Optimal"
+    assert abs(resultado["objetivo"] - OBJETIVO_1DIA) <= 1e-6
+    assert verificar_alocacoes(param, resultado["alocacoes"]) == []
+
+    rodadas = resultado["rodadas"]
+    linhas = resultado["linhas_sobreposicao"]
+    assert [r["rodada"] for r in rodadas] == list(range(1, len(rodadas) + 1))
+    assert rodadas[-1]["violacoes"] == 0
+    assert all(r["violacoes"] > 0 for r in rodadas[:-1])
+    assert (linhas["acrescentadas"] > 0) == (len(rodadas) > 1)
+    assert linhas["acrescentadas"] < linhas["total"]
@@ -0,0 +1,71 @@
+import json
+import os
+
+import numpy as np
+
+import preprocessamento as pp
+import cache_modelo
+from model import preparar_parametros, resolver_parametros
+from test_backends import ARQUIVO, OBJETIVO_1DIA
+
+
+# O cache reaproveita parâmetros e matrizes quando só α/aptidão mudam e monta de novo quando a
+# estrutura muda (ver `cache_modelo.carregar_modelo`).
+
+def _gravar(pasta, nome, alteracoes):
+    """
+    (Função interna) Grava uma cópia de `input_semanal_1dia.json` com `alteracoes` aplicada aos dados.
+    """
+    with open(ARQUIVO, "r", encoding="utf-8") as f:
+        dados = json.load(f)
+    alteracoes(dados)
+    caminho = os.path.join(pasta, nome)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False)
+    return caminho
+
+def _carregar(caminho, diretorio):
+    return cache_modelo.carregar_modelo(caminho, backend="highs", diretorio=str(diretorio))
+
+def _entradas(diretorio):
+    return sorted(nome for nome in os.listdir(diretorio) if nome.endswith(".pkl"))
+
+def test_cache_reaproveita_e_invalida(tmp_path, capsys):
+    diretorio = tmp_path / "cache"
+
+    # Primeira execução monta e grava; a segunda é acerto, com o mesmo ótimo
+    param, matrizes = _carregar(ARQUIVO, diretorio)
+    entradas = _entradas(diretorio)
+    assert len(entradas) == 1
+    capsys.readouterr()
+    param, matrizes = _carregar(ARQUIVO, diretorio)
+    assert "Cache: modelo reaproveitado" in capsys.readouterr().out
+    resultado = resolver_parametros(param, backend="highs", time_limit=120, msg=False, matrizes=matrizes)
+    assert resultado["status"] == "Optimal"
+    assert abs(resultado["objetivo"] - OBJETIVO_1DIA) <= 1e-6
+
+    # Só α mudou: mesma entrada do cache e mesma matriz de restrições, custos novos
+    caminho_alpha = _gravar(tmp_path, "alpha.json", lambda dados: dados.update(alpha=10))
+    capsys.readouterr()
+    param_alpha, matrizes_alpha = _carregar(caminho_alpha, diretorio)
+    assert "só α/aptidão mudaram" in capsys.readouterr().out
+    assert _entradas(diretorio) == entradas
+    for chave in ("inicio", "indice", "valor", "row_lower", "row_upper"):
+        assert np.array_equal(matrizes_alpha[chave], matrizes[chave])
+    assert not np.array_equal(matrizes_alpha["custo"], matrizes["custo"])
+    com_cache = resolver_parametros(param_alpha, backend="highs", time_limit=120, msg=False, matrizes=matrizes_alpha)
+    sem_cache = resolver_parametros(preparar_parametros(pp.carregar_dados(caminho_alpha)), backend="highs",
+                                    time_limit=120, msg=False)
+    assert abs(com_cache["objetivo"] - sem_cache["objetivo"]) <= 1e-6
+    assert abs(com_cache["objetivo"] - OBJETIVO_1DIA) > 1e-3
+
+    # Mudança estrutural (duração e janela de uma tarefa): nova entrada, montada do zero
+    def mudar_estrutura(dados):
+        dados["tarefas"]["banho"]["duracao"] = 60
+        dados["disponibilidade_tarefas"]["banho"] = [{"inicio": "08:00", "fim": "20:00"}]
+    caminho_estrutura = _gravar(tmp_path, "estrutura.json", mudar_estrutura)
+    capsys.readouterr()
+    param_estrutura, _ = _carregar(caminho_estrutura, diretorio)
+    assert "Cache:" not in capsys.readouterr().out
+    assert len(_entradas(diretorio)) == 2
+    assert param_estrutura["duracao_tarefas"]["banho"] == 60 // param["duracao_slot"]
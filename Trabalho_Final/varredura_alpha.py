@@ -0,0 +1,110 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from tabulate import tabulate
+
+import preprocessamento as pp
+from model import ARQUIVO_PADRAO, preparar_parametros, calcular_cargas, calcular_delta
+import modelo_highs
+
+
+# Varredura do peso de balanceamento α.
+# Antes cada valor de α exigia rodar o script inteiro (ver `saidas_alphas.txt`), remontando
+# a mesma matriz de restrições. Aqui o modelo é montado uma única vez (backend highs) e,
+# entre uma resolução e outra, só o custo da coluna Delta muda; cada resolução parte da
+# melhor solução da anterior, que continua viável porque as restrições não mudam.
+
+def _varrer_sequencial(param, alphas, time_limit=300, msg=False, threads=None):
+    """
+    (Função interna) Resolve os α em sequência sobre um único modelo HiGHS.
+    Retorna uma lista de dicionários (uma linha da tabela por α).
+    """
+    matrizes = modelo_highs.montar_matrizes(param, balanceamento=True)
+    h = modelo_highs.criar_highs(matrizes, time_limit=time_limit, msg=msg)
+    if threads is not None:
+        h.setOptionValue("threads", int(threads))
+
+    linhas = []
+    incumbente = None
+    for alpha in alphas:
+        # Só o objetivo muda: coeficiente de Delta
+        h.changeColCost(matrizes["coluna_delta"], float(alpha))
+        if incumbente is not None:
+            h.setSolution(incumbente)
+
+        inicio = time.perf_counter()
+        h.run()
+        tempo = time.perf_counter() - inicio
+
+        status_string = modelo_highs.status_highs(h)
+        linha = {"alpha": alpha, "status": status_string, "objetivo": None, "delta": None,
+                 "tempo_s": tempo, "gap": None}
+        if status_string == "Optimal" or status_string == "Feasible":
+            info = h.getInfo()
+            incumbente = h.getSolution()
+            alocacoes = modelo_highs.extrair_alocacoes(h, matrizes)
+            cargas = calcular_cargas(param, alocacoes)
+            linha["objetivo"] = info.objective_function_value
+            linha["delta"] = calcular_delta(param, cargas)
+            linha["gap"] = info.mip_gap
+            for i in param["pessoas"]:
+                linha[f"carga_{i}_h"] = cargas[i] * param["duracao_slot"] / 60
+        linhas.append(linha)
+        print(f"α = {alpha}: {status_string}, objetivo {linha['objetivo']}, {tempo:.2f}s")
+    return linhas
+
+def _varrer_bloco(caminho_arquivo, alphas, time_limit, threads):
+    """
+    (Função interna) Ponto de entrada dos processos: cada um carrega os dados, monta o modelo
+    uma vez e varre o seu bloco de α em sequência.
+    """
+    data = pp.carregar_dados(caminho_arquivo)
+    if data is None:
+        return []
+    return _varrer_sequencial(preparar_parametros(data), alphas, time_limit=time_limit, threads=threads)
+
+def varrer_alphas(caminho_arquivo, alphas, time_limit=300, processos=1, msg=False):
+    """
+    Resolve a instância para cada α da lista e consolida os resultados.
+    Com `processos` > 1 os α são divididos em blocos independentes, um por processo
+    (cada processo monta o modelo uma vez e usa 1 thread do solver).
+    Retorna um DataFrame com α, status, objetivo, Delta, carga por pessoa (h), tempo e gap.
+    """
+    alphas = list(alphas)
+    if processos <= 1:
+        data = pp.carregar_dados(caminho_arquivo)
+        if data is None:
+            return pd.DataFrame()
+        linhas = _varrer_sequencial(preparar_parametros(data), alphas, time_limit=time_limit, msg=msg)
+    else:
+        # Blocos contíguos: α vizinhos se aproveitam melhor da solução anterior
+        tamanho = -(-len(alphas) // processos)
+        blocos = [alphas[k : k + tamanho] for k in range(0, len(alphas), tamanho)]
+        linhas = []
+        with ProcessPoolExecutor(max_workers=len(blocos)) as executor:
+            futuros = [executor.submit(_varrer_bloco, caminho_arquivo, bloco, time_limit, 1) for bloco in blocos]
+            for futuro in futuros:
+                linhas.extend(futuro.result())
+
+    return pd.DataFrame(linhas).sort_values("alpha").reset_index(drop=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura do peso de balanceamento α.")
+    parser.add_argument("arquivo", nargs="?", default=ARQUIVO_PADRAO, help="JSON de entrada")
+    parser.add_argument("--alphas", type=float, nargs="+", required=True, help="valores de α")
+    parser.add_argument("--time-limit", type=float, default=300, help="limite de tempo por α (s)")
+    parser.add_argument("--processos", type=int, default=1, help="número de processos em paralelo")
+    parser.add_argument("--saida", help="arquivo CSV para salvar a tabela consolidada")
+    args = parser.parse_args()
+
+    tabela = varrer_alphas(args.arquivo, args.alphas, time_limit=args.time_limit, processos=args.processos)
+    print(tabulate(tabela, headers='keys', tablefmt='psql', showindex=False, floatfmt=".4f"))
+    if args.saida:
+        tabela.to_csv(args.saida, index=False)
+        print(f"Tabela salva em '{args.saida}'.")
+
+
+if __name__ == "__main__":
+    main()